@@ -0,0 +1,47 @@
+"""user prefix search indexes
+
+Revision ID: 8c1e5b7a2d90
+Revises: 3f6a2c1d9b84
+Create Date: 2026-10-19 14:35:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1e5b7a2d90'
+down_revision: Union[str, Sequence[str], None] = '3f6a2c1d9b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns searched by prefix in the admin user listing.
+COLUMNS = ('name', 'surname', 'email')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the table writable while the indexes are built; it cannot run in a transaction.
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            op.create_index(
+                f'ix_users_{column}_prefix',
+                'users',
+                [sa.text(f'lower({column}) text_pattern_ops')],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            op.drop_index(
+                f'ix_users_{column}_prefix',
+                table_name='users',
+                postgresql_concurrently=True,
+                if_exists=True
+            )
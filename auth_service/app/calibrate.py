@@ -0,0 +1,95 @@
+"""
+Argon2 cost calibration.
+
+Finds time/memory/parallelism parameters whose verify latency on this host is
+close to a target, and prints them as environment variables for Settings:
+
+    python -m app.calibrate --target-ms 250 --max-memory-mib 64
+"""
+import argparse
+import statistics
+import time
+from dataclasses import dataclass
+
+from .core.config import settings
+from .core.security import PasswordManager
+
+MIN_MEMORY_KIB = 8 * 1024
+MAX_TIME_COST = 16
+
+
+@dataclass
+class Candidate:
+    time_cost: int
+    memory_cost: int
+    parallelism: int
+    verify_ms: float
+
+
+def measure_verify_ms(time_cost: int, memory_cost: int, parallelism: int, samples: int) -> float:
+    """Returns the median verify latency in milliseconds for the given parameters."""
+    manager = PasswordManager(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    hashed = manager.hash("calibration-password")
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        manager.verify("calibration-password", hashed)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, max_memory_kib: int, parallelism: int, samples: int) -> Candidate:
+    """
+    Prefers the largest memory cost, then raises the time cost until the target is reached.
+    If a single pass is already too slow, the memory cost is halved and the search repeats.
+    """
+    best: Candidate | None = None
+    memory_cost = max_memory_kib
+
+    while memory_cost >= MIN_MEMORY_KIB:
+        for time_cost in range(1, MAX_TIME_COST + 1):
+            verify_ms = measure_verify_ms(time_cost, memory_cost, parallelism, samples)
+            candidate = Candidate(time_cost, memory_cost, parallelism, verify_ms)
+            print(f"t={time_cost:<3} m={memory_cost // 1024:>5} MiB p={parallelism:<3} {verify_ms:8.1f} ms")
+
+            if verify_ms <= target_ms:
+                best = candidate
+                continue
+            if best is None or abs(verify_ms - target_ms) < abs(best.verify_ms - target_ms):
+                best = candidate
+            break
+
+        if best is not None and best.memory_cost == memory_cost and best.verify_ms <= target_ms * 1.25:
+            return best
+        memory_cost //= 2
+
+    if best is None:
+        raise RuntimeError("No Argon2 parameters could be measured")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Calibrate Argon2 cost parameters for this host.")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Target verify latency in milliseconds")
+    parser.add_argument("--max-memory-mib", type=int, default=settings.ARGON2_MEMORY_COST // 1024,
+                        help="Upper bound for the memory cost in MiB")
+    parser.add_argument("--parallelism", type=int, default=settings.ARGON2_PARALLELISM,
+                        help="Number of parallel lanes")
+    parser.add_argument("--samples", type=int, default=5, help="Verifications measured per candidate")
+    args = parser.parse_args()
+
+    result = calibrate(
+        target_ms=args.target_ms,
+        max_memory_kib=args.max_memory_mib * 1024,
+        parallelism=args.parallelism,
+        samples=args.samples
+    )
+
+    print(f"\n# Median verify latency: {result.verify_ms:.1f} ms (target {args.target_ms:.0f} ms)")
+    print(f"ARGON2_TIME_COST={result.time_cost}")
+    print(f"ARGON2_MEMORY_COST={result.memory_cost}")
+    print(f"ARGON2_PARALLELISM={result.parallelism}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Protocol, Tuple
+
+from .config import settings
+
+
+class CacheBackend(Protocol):
+    """
+    Interface for the profile cache.
+    The in-memory implementation is per process, so a write only invalidates the entry
+    of the worker that handled it; implement this on top of a shared backend (e.g. Redis)
+    when running several auth_service workers.
+    """
+
+    async def get(self, key: str) -> Any | None: ...
+
+    async def set(self, key: str, value: Any) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+
+class InMemoryTTLCache:
+    """
+    Bounded in-process cache.
+
+    Entries expire `ttl` seconds after they were stored.
+    When the cache is full, the least recently used entries are dropped first.
+    """
+
+    def __init__(self, max_size: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: OrderedDict[str, Tuple[Any, float]] = OrderedDict()
+
+    @classmethod
+    def from_settings(cls) -> "InMemoryTTLCache":
+        """Builds a profile cache configured from application settings."""
+        return cls(max_size=settings.PROFILE_CACHE_MAX_SIZE, ttl=settings.PROFILE_CACHE_TTL_SECONDS)
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        self._entries[key] = (value, self.clock() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+profile_cache = InMemoryTTLCache.from_settings()
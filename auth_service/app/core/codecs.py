@@ -0,0 +1,180 @@
+# Shared core module: auth_service and pdf_service each carry an identical copy, since every service image
+# is built from its own directory only. Change both copies together; tests/test_shared_modules.py checks them.
+
+import base64
+import binascii
+import hashlib
+import hmac
+from calendar import timegm
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Mapping, Protocol
+
+import orjson
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError, JWTError
+
+TIME_CLAIMS = ("exp", "iat", "nbf")
+
+
+class TokenCodec(Protocol):
+    """
+    Interface of the JWT encoding backend used by JWTManager.
+    Implementations must raise python-jose exception types so callers
+    handle errors the same way whichever codec is configured.
+    """
+    name: str
+
+    def encode(self, claims: Dict[str, Any], key: Any, algorithm: str,
+               headers: Dict[str, Any] | None = None) -> str: ...
+
+    def decode(self, token: str, key: Any, algorithms: Iterable[str],
+               options: Mapping[str, Any] | None = None) -> Dict[str, Any]: ...
+
+    def get_unverified_header(self, token: str) -> Dict[str, Any]: ...
+
+
+class JoseCodec:
+    """
+    Reference implementation backed by python-jose. Supports every algorithm jose does.
+    """
+    name = "jose"
+
+    def encode(self, claims, key, algorithm, headers=None) -> str:
+        return jwt.encode(claims, key, algorithm=algorithm, headers=headers)
+
+    def decode(self, token, key, algorithms, options=None) -> Dict[str, Any]:
+        return jwt.decode(token, key, algorithms=list(algorithms), options=dict(options or {}))
+
+    def get_unverified_header(self, token) -> Dict[str, Any]:
+        return jwt.get_unverified_header(token)
+
+
+class HMACCodec:
+    """
+    Minimal HS256/HS384/HS512 implementation using `hmac` and `orjson`.
+
+    Produces the same header and claims as python-jose and performs the same
+    validation of time claims (exp, nbf, iat) and of sub/jti/aud claims,
+    but skips jose's generic key construction and multiple JSON round-trips.
+    """
+    name = "hmac"
+
+    DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+    def __init__(self):
+        self._key_bytes: Dict[str, bytes] = {}
+
+    def encode(self, claims, key, algorithm, headers=None) -> str:
+        digest = self._digest(algorithm)
+        header = {"typ": "JWT", "alg": algorithm}
+        if headers:
+            header.update(headers)
+
+        payload = dict(claims)
+        for claim in TIME_CLAIMS:
+            if isinstance(payload.get(claim), datetime):
+                payload[claim] = timegm(payload[claim].utctimetuple())
+
+        signing_input = b".".join((
+            _b64encode(orjson.dumps(header, option=orjson.OPT_SORT_KEYS)),
+            _b64encode(orjson.dumps(payload)),
+        ))
+        signature = hmac.new(self._key(key), signing_input, digest).digest()
+        return (signing_input + b"." + _b64encode(signature)).decode("ascii")
+
+    def decode(self, token, key, algorithms, options=None) -> Dict[str, Any]:
+        options = options or {}
+        try:
+            signing_input, signature_segment = token.encode("ascii").rsplit(b".", 1)
+            header_segment, claims_segment = signing_input.split(b".", 1)
+            header = orjson.loads(_b64decode(header_segment))
+            signature = _b64decode(signature_segment)
+        except (ValueError, UnicodeError, binascii.Error, orjson.JSONDecodeError):
+            raise JWTError("Error decoding token headers.")
+
+        algorithm = header.get("alg") if isinstance(header, dict) else None
+        if algorithm not in algorithms:
+            raise JWTError("The specified alg value is not allowed")
+
+        expected = hmac.new(self._key(key), signing_input, self._digest(algorithm)).digest()
+        if not hmac.compare_digest(expected, signature):
+            raise JWTError("Signature verification failed.")
+
+        try:
+            claims = orjson.loads(_b64decode(claims_segment))
+        except (ValueError, binascii.Error, orjson.JSONDecodeError) as e:
+            raise JWTError(f"Invalid payload string: {e}")
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload string: must be a json object")
+
+        _validate_claims(claims, options)
+        return claims
+
+    def get_unverified_header(self, token) -> Dict[str, Any]:
+        try:
+            return orjson.loads(_b64decode(token.encode("ascii").split(b".", 1)[0]))
+        except (ValueError, UnicodeError, binascii.Error, orjson.JSONDecodeError):
+            raise JWTError("Error decoding token headers.")
+
+    def _digest(self, algorithm: str):
+        try:
+            return self.DIGESTS[algorithm]
+        except KeyError:
+            raise JWTError(f"Algorithm {algorithm} is not supported by the hmac codec")
+
+    def _key(self, key: str | bytes) -> bytes:
+        if isinstance(key, bytes):
+            return key
+        cached = self._key_bytes.get(key)
+        if cached is None:
+            cached = self._key_bytes[key] = key.encode("utf-8")
+        return cached
+
+
+def get_codec(name: str, algorithm: str) -> TokenCodec:
+    """
+    Returns the codec for a JWT_CODEC setting value.
+    "auto" selects the hmac codec for HS* algorithms and jose for everything else.
+    """
+    if name == "auto":
+        name = "hmac" if algorithm in HMACCodec.DIGESTS else "jose"
+    if name == "hmac":
+        return HMACCodec()
+    if name == "jose":
+        return JoseCodec()
+    raise ValueError(f"Unknown JWT codec: {name}")
+
+
+def _validate_claims(claims: Dict[str, Any], options: Mapping[str, Any]) -> None:
+    """Mirrors python-jose claim validation for the claims this system uses."""
+    leeway = options.get("leeway", 0)
+    now = timegm(datetime.now(timezone.utc).utctimetuple())
+
+    for claim, message in (("iat", "Issued At"), ("nbf", "Not Before"), ("exp", "Expiration Time")):
+        if claim in claims and options.get(f"verify_{claim}", True):
+            try:
+                int(claims[claim])
+            except (TypeError, ValueError):
+                raise JWTClaimsError(f"{message} claim ({claim}) must be an integer.")
+
+    if "nbf" in claims and options.get("verify_nbf", True) and int(claims["nbf"]) > now + leeway:
+        raise JWTClaimsError("The token is not yet valid (nbf)")
+
+    if "exp" in claims and options.get("verify_exp", True) and int(claims["exp"]) < now - leeway:
+        raise ExpiredSignatureError("Signature has expired.")
+
+    # No audience is ever expected in this system, so any aud claim is rejected like jose does.
+    if "aud" in claims and options.get("verify_aud", True):
+        raise JWTClaimsError("Invalid audience")
+
+    for claim, message in (("sub", "Subject"), ("jti", "JWT ID")):
+        if claim in claims and options.get(f"verify_{claim}", True) and not isinstance(claims[claim], str):
+            raise JWTClaimsError(f"{message} must be a string.")
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
@@ -1,3 +1,5 @@
+from typing import Dict
+
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -30,6 +32,28 @@ class Settings(BaseSettings):
         description="Database port"
     )
 
+    # --- Password Hashing Settings ---
+    ARGON2_TIME_COST: int = Field(
+        default=3,
+        ge=1,
+        description="Argon2 number of iterations"
+    )
+    ARGON2_MEMORY_COST: int = Field(
+        default=65536,
+        ge=8,
+        description="Argon2 memory usage in KiB"
+    )
+    ARGON2_PARALLELISM: int = Field(
+        default=4,
+        ge=1,
+        description="Argon2 number of parallel lanes"
+    )
+    PASSWORD_HASHING_THREADS: int = Field(
+        default=0,
+        ge=0,
+        description="Threads hashing and verifying passwords off the event loop; 0 starts one per available CPU"
+    )
+
     # --- JWT Authentication Settings ---
     SECRET_KEY: str = Field(
         default="SECRET_KEY",
@@ -37,12 +61,164 @@ class Settings(BaseSettings):
 
     ALGORITHM: str = Field(
         default="HS256",
-        description="Algorithm used for JWT encryption"
+        description="Algorithm used for JWT encryption (HS256, or RS256/ES256 for JWKS based verification)"
+    )
+    JWT_CODEC: str = Field(
+        default="auto",
+        description="JWT backend: 'hmac' (fast HS* path), 'jose', or 'auto' to pick by algorithm"
+    )
+    JWT_KEYS_DIR: str = Field(
+        default="keys",
+        description="Directory with PEM private keys named <kid>.pem, used for asymmetric algorithms"
+    )
+    JWT_ACTIVE_KID: str | None = Field(
+        default=None,
+        description="Key id used to sign new tokens; defaults to the last key id in sort order"
     )
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(
         default=30,
         description="Token lifetime in minutes"
     )
+    REFRESH_TOKEN_EXPIRE_DAYS: int = Field(
+        default=14,
+        description="Refresh token lifetime in days"
+    )
+    REVOCATION_STORE_MAX_SIZE: int = Field(
+        default=1_000_000,
+        description="Maximum number of unexpired used refresh tokens remembered for reuse detection; "
+                    "refreshes are refused while it is reached"
+    )
+    PROFILE_CACHE_MAX_AGE_SECONDS: int = Field(
+        default=300,
+        description="Cache-Control max-age for the profile endpoint"
+    )
+    PROFILE_CACHE_TTL_SECONDS: float = Field(
+        default=60.0,
+        description="Seconds a profile read from the database is served from the in-process cache (0 disables it)"
+    )
+    PROFILE_CACHE_MAX_SIZE: int = Field(
+        default=100_000,
+        description="Maximum number of profiles kept in the in-process cache"
+    )
+
+    # --- Login Protection Settings ---
+    LOGIN_GUARD_ENABLED: bool = Field(
+        default=True,
+        description="Enable negative caching and rate limiting in front of login"
+    )
+    LOGIN_NEGATIVE_CACHE_SIZE: int = Field(
+        default=100_000,
+        description="Maximum number of unknown emails remembered per process"
+    )
+    LOGIN_NEGATIVE_CACHE_TTL_SECONDS: float = Field(
+        default=60.0,
+        description="How long an unknown email is remembered before the database is asked again"
+    )
+    LOGIN_IP_BURST: int = Field(
+        default=20,
+        gt=0,
+        description="Login attempts a single IP address may make in a burst"
+    )
+    LOGIN_IP_RATE_PER_MINUTE: float = Field(
+        default=60.0,
+        gt=0,
+        description="Sustained login attempts per minute allowed for a single IP address"
+    )
+    LOGIN_EMAIL_BURST: int = Field(
+        default=5,
+        gt=0,
+        description="Login attempts a single email may receive in a burst"
+    )
+    LOGIN_EMAIL_RATE_PER_MINUTE: float = Field(
+        default=10.0,
+        gt=0,
+        description="Sustained login attempts per minute allowed for a single email"
+    )
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = Field(
+        default=100_000,
+        description="Maximum number of tracked IPs/emails per rate limiter"
+    )
+
+    # --- Admin API ---
+    ADMIN_API_KEY: str | None = Field(
+        default=None,
+        description="Key expected in the X-Admin-Key header of /api/admin and /metrics requests; both are disabled if unset"
+    )
+    ADMIN_EXPORT_BATCH_SIZE: int = Field(
+        default=1_000,
+        gt=0,
+        description="Users fetched per server-side cursor round trip when exporting"
+    )
+
+    # --- Production Server (python -m app.server) ---
+    SERVER_HOST: str = Field(
+        default="0.0.0.0",
+        description="Address the production server binds to"
+    )
+    SERVER_PORT: int = Field(
+        default=8001,
+        description="Port the production server binds to"
+    )
+    SERVER_WORKERS: int = Field(
+        default=1,
+        ge=0,
+        description="Worker processes; 0 starts one per available CPU (affinity and cgroup quota aware). "
+                    "More than one is refused while login throttling and token revocation are per process"
+    )
+    SERVER_MAX_REQUESTS: int = Field(
+        default=0,
+        ge=0,
+        description="Requests after which a worker is replaced, capping memory growth; 0 disables recycling. "
+                    "Refused while login throttling and token revocation are per process"
+    )
+    SERVER_MAX_REQUESTS_JITTER: int = Field(
+        default=1_000,
+        ge=0,
+        description="Random extra requests per worker, so workers are not all recycled at once"
+    )
+    SERVER_TIMEOUT: int = Field(
+        default=60,
+        gt=0,
+        description="Seconds a worker may stay unresponsive before it is killed and replaced"
+    )
+    SERVER_GRACEFUL_TIMEOUT: int = Field(
+        default=30,
+        gt=0,
+        description="Seconds workers get to finish in-flight requests on shutdown or recycling"
+    )
+    SERVER_KEEPALIVE: int = Field(
+        default=5,
+        ge=0,
+        description="Seconds an idle keep-alive connection is held open"
+    )
+
+    # --- Tracing ---
+    TRACING_SERVICE_NAME: str = Field(
+        default="auth_service",
+        description="Service name recorded on every span"
+    )
+    TRACING_EXPORTER: str = Field(
+        default="off",
+        description="Where finished spans are written: 'off', 'console' (JSON lines on stderr) or 'file'"
+    )
+    TRACING_FILE: str = Field(
+        default="traces.jsonl",
+        description="JSON lines file receiving spans when TRACING_EXPORTER is 'file'"
+    )
+
+    # --- Logging ---
+    LOG_LEVEL: str = Field(
+        default="INFO",
+        description="Minimum level of records written by the service"
+    )
+    LOG_FORMAT: str = Field(
+        default="json",
+        description="Output format of log records: 'json' (one object per line) or 'text'"
+    )
+    LOG_SAMPLE_RATES: Dict[str, float] = Field(
+        default={},
+        description="Share of INFO and lower records kept per logger, e.g. {\"app.services\": 0.1}; warnings and errors are always kept"
+    )
 
     @property
     def get_database_url(self) -> str:
@@ -0,0 +1,144 @@
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+from jose import jwk, JWTError
+from jose.backends.base import Key
+
+from .config import settings
+
+ASYMMETRIC_PREFIXES = ("RS", "PS", "ES")
+
+
+def is_asymmetric(algorithm: str) -> bool:
+    """Tells whether the JWT algorithm uses a private/public key pair."""
+    return algorithm.startswith(ASYMMETRIC_PREFIXES)
+
+
+class KeyStore:
+    """
+    Holds the JWT signing and verification keys.
+
+    For asymmetric algorithms every PEM private key is parsed once at startup;
+    the active key signs new tokens while all keys stay valid for verification
+    and are published through JWKS. This allows zero-downtime rotation:
+    add a key, publish it, switch JWT_ACTIVE_KID, then remove the old one.
+
+    For HMAC algorithms the shared SECRET_KEY is used and nothing is published.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret_key: str,
+        private_keys: Dict[str, bytes] | None = None,
+        active_kid: str | None = None
+    ):
+        self.algorithm = algorithm
+        self.secret_key = secret_key
+        self._signing_keys: Dict[str, Key] = {}
+        self._verification_keys: Dict[str, Key] = {}
+        self.active_kid: str | None = None
+
+        if not is_asymmetric(algorithm):
+            return
+
+        if not private_keys:
+            raise RuntimeError(
+                f"Algorithm {algorithm} requires at least one private key in JWT_KEYS_DIR "
+                f"(generate one with: python -m app.core.keys --kid <kid>)"
+            )
+
+        for kid, pem in private_keys.items():
+            private_key = jwk.construct(pem, algorithm)
+            self._signing_keys[kid] = private_key
+            self._verification_keys[kid] = private_key.public_key()
+
+        self.active_kid = active_kid or max(private_keys)
+        if self.active_kid not in self._signing_keys:
+            raise RuntimeError(f"Active key '{self.active_kid}' was not found in JWT_KEYS_DIR")
+
+    @classmethod
+    def from_settings(cls) -> "KeyStore":
+        """Loads keys as configured in application settings."""
+        private_keys = {}
+        if is_asymmetric(settings.ALGORITHM):
+            keys_dir = Path(settings.JWT_KEYS_DIR)
+            if keys_dir.is_dir():
+                private_keys = {path.stem: path.read_bytes() for path in sorted(keys_dir.glob("*.pem"))}
+        return cls(
+            algorithm=settings.ALGORITHM,
+            secret_key=settings.SECRET_KEY,
+            private_keys=private_keys,
+            active_kid=settings.JWT_ACTIVE_KID
+        )
+
+    @property
+    def asymmetric(self) -> bool:
+        return is_asymmetric(self.algorithm)
+
+    def signing_key(self) -> Tuple[str | None, Key | str]:
+        """Returns the key id (None for HMAC) and the key used to sign new tokens."""
+        if not self.asymmetric:
+            return None, self.secret_key
+        return self.active_kid, self._signing_keys[self.active_kid]
+
+    def verification_key(self, kid: str | None) -> Key | str:
+        """Returns the key that verifies tokens signed with the given key id."""
+        if not self.asymmetric:
+            return self.secret_key
+        try:
+            return self._verification_keys[kid]
+        except KeyError:
+            raise JWTError(f"Unknown signing key: {kid}")
+
+    def jwks(self) -> Dict[str, Any]:
+        """Returns the public keys as a JSON Web Key Set."""
+        return {
+            "keys": [
+                {**key.to_dict(), "kid": kid, "use": "sig"}
+                for kid, key in self._verification_keys.items()
+            ]
+        }
+
+
+def generate_private_key(algorithm: str) -> bytes:
+    """Generates a PEM encoded private key suitable for the algorithm."""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+    if algorithm.startswith("ES"):
+        curve = {"ES256": ec.SECP256R1(), "ES384": ec.SECP384R1(), "ES512": ec.SECP521R1()}[algorithm]
+        private_key = ec.generate_private_key(curve)
+    else:
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a JWT signing key into JWT_KEYS_DIR.")
+    parser.add_argument("--kid", required=True, help="Key id, used as the file name")
+    parser.add_argument("--algorithm", default=settings.ALGORITHM, help="RS256, PS256, ES256, ...")
+    args = parser.parse_args()
+
+    if not is_asymmetric(args.algorithm):
+        parser.error(f"{args.algorithm} is not an asymmetric algorithm")
+
+    keys_dir = Path(settings.JWT_KEYS_DIR)
+    keys_dir.mkdir(parents=True, exist_ok=True)
+    path = keys_dir / f"{args.kid}.pem"
+    if path.exists():
+        parser.error(f"{path} already exists")
+
+    path.write_bytes(generate_private_key(args.algorithm))
+    path.chmod(0o600)
+    print(f"Written {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import heapq
+import time
+from typing import Callable, Dict, List, Protocol, Tuple
+
+from .config import settings
+
+
+class RevocationStoreFullError(Exception):
+    """
+    Raised when a refresh token cannot be marked as used because the store is full.
+    Rotation then fails closed: the session must log in again.
+    """
+
+
+class RevocationStore(Protocol):
+    """
+    Interface for tracking used refresh tokens and revoked token families.
+    The in-memory implementation is per process; implement this on top of a
+    shared backend when running several auth_service workers.
+    """
+
+    def tracks(self, issued_at: float) -> bool: ...
+
+    def consume(self, jti: str, expires_at: float) -> bool: ...
+
+    def revoke_family(self, family: str, expires_at: float) -> None: ...
+
+    def is_family_revoked(self, family: str) -> bool: ...
+
+
+class InMemoryRevocationStore:
+    """
+    Bounded in-process revocation store.
+
+    Entries are kept until the token they refer to would have expired anyway, never dropped
+    earlier: forgetting a used token would let it be refreshed again. When the store is full,
+    consume() raises RevocationStoreFullError instead. Tokens issued before the store was
+    created (i.e. before a restart) cannot be checked for reuse, which tracks() reports.
+    """
+
+    def __init__(self, max_size: int, clock: Callable[[], float] = time.time):
+        self.max_size = max_size
+        self.clock = clock
+        self.started_at = clock()
+        self._used: Dict[str, float] = {}
+        self._used_expiry: List[Tuple[float, str]] = []
+        self._revoked_families: Dict[str, float] = {}
+        self._revoked_expiry: List[Tuple[float, str]] = []
+
+    @classmethod
+    def from_settings(cls) -> "InMemoryRevocationStore":
+        """Builds a store configured from application settings."""
+        return cls(max_size=settings.REVOCATION_STORE_MAX_SIZE)
+
+    def tracks(self, issued_at: float) -> bool:
+        """Whether every use of a token issued at `issued_at` (whole seconds, as in `iat`) was recorded here."""
+        return issued_at >= int(self.started_at)
+
+    def consume(self, jti: str, expires_at: float) -> bool:
+        """
+        Marks a refresh token as used.
+        Returns False if it had already been used, which signals token reuse.
+
+        Raises:
+            RevocationStoreFullError: if the store holds max_size unexpired tokens.
+        """
+        self._purge(self._used, self._used_expiry)
+        if jti in self._used:
+            return False
+        if len(self._used) >= self.max_size:
+            raise RevocationStoreFullError("Too many refresh tokens in use to track another one")
+        self._add(self._used, self._used_expiry, jti, expires_at)
+        return True
+
+    def revoke_family(self, family: str, expires_at: float) -> None:
+        """Revokes every refresh token issued in the same login session. Always recorded, even when full."""
+        self._purge(self._revoked_families, self._revoked_expiry)
+        self._add(self._revoked_families, self._revoked_expiry, family, expires_at)
+
+    def is_family_revoked(self, family: str) -> bool:
+        self._purge(self._revoked_families, self._revoked_expiry)
+        return family in self._revoked_families
+
+    def __len__(self) -> int:
+        return len(self._used)
+
+    @staticmethod
+    def _add(entries: Dict[str, float], expiry: List[Tuple[float, str]], key: str, expires_at: float) -> None:
+        entries[key] = max(expires_at, entries.get(key, expires_at))
+        heapq.heappush(expiry, (entries[key], key))
+
+    def _purge(self, entries: Dict[str, float], expiry: List[Tuple[float, str]]) -> None:
+        """Drops entries whose token has expired, in expiry order."""
+        now = self.clock()
+        while expiry and expiry[0][0] <= now:
+            expires_at, key = heapq.heappop(expiry)
+            if entries.get(key) == expires_at:
+                del entries[key]
+
+
+revocation_store = InMemoryRevocationStore.from_settings()
@@ -1,26 +1,103 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any
+from functools import cache, partial
+from typing import TYPE_CHECKING, Callable, Dict, Any, Tuple, TypeVar
 
-from jose import jwt, JWTError
-from passlib.context import CryptContext
+from jose import JWTError
 
 from .config import settings
+from .codecs import TokenCodec, get_codec
+from .cpus import available_cpus
+from .keys import KeyStore
+from .tracing import tracer
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+# Keys are parsed once per process; see KeyStore for the rotation procedure.
+key_store = KeyStore.from_settings()
+
+T = TypeVar("T")
+
+
+@cache
+def _get_crypt_context(time_cost: int, memory_cost: int, parallelism: int) -> "CryptContext":
+    """
+    Builds the Argon2 context once per parameter set.
+    passlib and the argon2 backend are only imported when a password is first hashed or verified.
+    """
+    from passlib.context import CryptContext
+
+    # Argon2 is the winner of the Password Hashing Competition (PHC).
+    # Hashes created with other cost parameters are reported as needing an update.
+    return CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        argon2__time_cost=time_cost,
+        argon2__memory_cost=memory_cost,
+        argon2__parallelism=parallelism
+    )
+
+
+@cache
+def _get_hashing_executor() -> ThreadPoolExecutor:
+    """Thread pool for Argon2, created on first use with PASSWORD_HASHING_THREADS (0: one per available CPU)."""
+    return ThreadPoolExecutor(
+        max_workers=settings.PASSWORD_HASHING_THREADS or available_cpus(),
+        thread_name_prefix="argon2"
+    )
+
+
+async def run_password_hashing(func: Callable[..., T], *args: Any) -> T:
+    """
+    Runs a PasswordManager call on the hashing thread pool instead of the event loop.
+    argon2-cffi releases the GIL while hashing, so one process hashes on several cores
+    while it keeps serving other requests. The caller's trace context is carried along.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_hashing_executor(), partial(copy_context().run, func, *args))
+
 
 class PasswordManager:
     """
     Handles secure password hashing and verification using the Argon2 algorithm.
+    The methods are CPU-bound and blocking: call them through run_password_hashing() from async code.
     """
-    def __init__(self):
-        # Argon2 is the winner of the Password Hashing Competition (PHC)
-        self.pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+    def __init__(
+        self,
+        time_cost: int = settings.ARGON2_TIME_COST,
+        memory_cost: int = settings.ARGON2_MEMORY_COST,
+        parallelism: int = settings.ARGON2_PARALLELISM
+    ):
+        self.time_cost = time_cost
+        self.memory_cost = memory_cost
+        self.parallelism = parallelism
+
+    @property
+    def pwd_context(self) -> "CryptContext":
+        return _get_crypt_context(self.time_cost, self.memory_cost, self.parallelism)
 
     def hash(self, password: str) -> str:
         """Generates a secure hash from a plain-text password."""
-        return self.pwd_context.hash(password)
+        with tracer.span("argon2.hash", memory_cost=self.memory_cost, time_cost=self.time_cost):
+            return self.pwd_context.hash(password)
 
     def verify(self, password: str, hashed_password: str) -> bool:
         """Verifies a plain-text password against a stored hash."""
-        return self.pwd_context.verify(password, hashed_password)
+        with tracer.span("argon2.verify"):
+            return self.pwd_context.verify(password, hashed_password)
+
+    def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, str | None]:
+        """
+        Verifies a password and, if the stored hash uses outdated parameters,
+        returns a fresh hash to persist in its place (None otherwise).
+        """
+        with tracer.span("argon2.verify") as span:
+            verified, new_hash = self.pwd_context.verify_and_update(password, hashed_password)
+            span.set_attribute("rehashed", new_hash is not None)
+            return verified, new_hash
 
 
 class JWTManager:
@@ -30,22 +107,28 @@ class JWTManager:
     """
     def __init__(
         self,
-        secret_key: str = settings.SECRET_KEY,
-        algorithm: str = settings.ALGORITHM,
-        expire_minutes: int = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+        keys: KeyStore = key_store,
+        expire_minutes: int = settings.ACCESS_TOKEN_EXPIRE_MINUTES,
+        codec: TokenCodec | None = None
     ):
-        self.secret_key = secret_key
-        self.algorithm = algorithm
+        self.keys = keys
+        self.codec = codec or get_codec(settings.JWT_CODEC, keys.algorithm)
+        self.algorithm = keys.algorithm
         self.access_expire_minutes = expire_minutes
 
-    def create_token(self, data: Dict[str, Any]) -> str:
+    def create_token(self, data: Dict[str, Any], expires_delta: timedelta | None = None) -> str:
         """
-        Creates a signed JWT token containing user profile data.
+        Creates a signed JWT token with the given claims.
+        Expires after the access token lifetime unless `expires_delta` is given.
         """
         to_encode = data.copy()
-        expire = datetime.now(timezone.utc) + timedelta(minutes=self.access_expire_minutes)
-        to_encode.update({"exp": expire})
-        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        now = datetime.now(timezone.utc)
+        expire = now + (expires_delta or timedelta(minutes=self.access_expire_minutes))
+        to_encode.update({"iat": now, "exp": expire})
+        kid, key = self.keys.signing_key()
+        headers = {"kid": kid} if kid else None
+        with tracer.span("jwt.encode", algorithm=self.algorithm):
+            return self.codec.encode(to_encode, key, algorithm=self.algorithm, headers=headers)
 
     def decode_token(self, token: str) -> Dict[str, Any]:
         """
@@ -55,12 +138,14 @@ class JWTManager:
         try:
             # We ignore aud/iss checks to allow flexible communication between services
             options = {"verify_aud": False, "verify_iss": False}
-            payload = jwt.decode(
-                token,
-                self.secret_key,
-                algorithms=[self.algorithm],
-                options=options
-            )
+            with tracer.span("jwt.decode", algorithm=self.algorithm):
+                kid = self.codec.get_unverified_header(token).get("kid") if self.keys.asymmetric else None
+                payload = self.codec.decode(
+                    token,
+                    self.keys.verification_key(kid),
+                    algorithms=[self.algorithm],
+                    options=options
+                )
             return payload
         except JWTError as e:
             # Re-raising or handling the error is crucial for the security layer
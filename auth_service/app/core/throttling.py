@@ -0,0 +1,227 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Protocol
+
+from .config import settings
+from .metrics import metrics
+
+
+class LoginThrottledError(Exception):
+    """
+    Raised when a login attempt is rejected by the rate limiter
+    before any database or password hashing work is done.
+    """
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `capacity` tokens and refills
+    continuously at `refill_rate` tokens per second.
+    """
+    __slots__ = ("capacity", "refill_rate", "tokens", "updated_at")
+
+    def __init__(self, capacity: float, refill_rate: float, now: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.updated_at = now
+
+    def consume(self, now: float, amount: float = 1.0) -> float:
+        """
+        Takes `amount` tokens if available.
+        Returns 0 on success, otherwise the number of seconds until enough tokens are available.
+        """
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+        self.updated_at = now
+
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return 0.0
+        if self.refill_rate <= 0:
+            return float("inf")
+        return (amount - self.tokens) / self.refill_rate
+
+
+class RateLimiter:
+    """
+    Keeps one token bucket per key (email, IP address, ...).
+    The number of tracked keys is bounded; least recently used buckets are evicted first.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        per_minute: float,
+        max_keys: int,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.capacity = capacity
+        self.refill_rate = per_minute / 60.0
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    def hit(self, key: str) -> float:
+        """
+        Registers one attempt for the key.
+        Returns 0 if allowed, otherwise the suggested retry delay in seconds.
+        """
+        now = self.clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.capacity, self.refill_rate, now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.consume(now)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class NegativeCache(Protocol):
+    """
+    Interface for a store of emails known to have no account.
+    Implement it on top of a shared backend to share misses between processes.
+    """
+
+    def contains(self, email: str) -> bool: ...
+
+    def add(self, email: str) -> None: ...
+
+    def discard(self, email: str) -> None: ...
+
+    def __len__(self) -> int: ...
+
+
+class InMemoryNegativeCache:
+    """
+    Bounded LRU set of unknown emails with a per-entry TTL.
+    The TTL limits how long a fresh signup handled by another process can be shadowed.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: OrderedDict[str, float] = OrderedDict()
+
+    def contains(self, email: str) -> bool:
+        expires_at = self._entries.get(email)
+        if expires_at is None:
+            return False
+        if expires_at <= self.clock():
+            del self._entries[email]
+            return False
+        return True
+
+    def add(self, email: str) -> None:
+        self._entries[email] = self.clock() + self.ttl_seconds
+        self._entries.move_to_end(email)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, email: str) -> None:
+        self._entries.pop(email, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LoginGuard:
+    """
+    Cheap pre-checks placed in front of AuthService.authenticate.
+    Rejects abusive clients and known-unknown emails before any
+    database query or Argon2 verification is performed.
+
+    All state is in-process and is only touched from the event loop thread.
+    Outcomes are reported as login_guard_checks (per outcome) and login_unknown_emails on /metrics.
+    """
+
+    def __init__(
+        self,
+        negative_cache: NegativeCache,
+        ip_limiter: RateLimiter,
+        email_limiter: RateLimiter,
+        enabled: bool = True
+    ):
+        self.negative_cache = negative_cache
+        self.ip_limiter = ip_limiter
+        self.email_limiter = email_limiter
+        self.enabled = enabled
+
+    @classmethod
+    def from_settings(cls) -> "LoginGuard":
+        """Builds a guard configured from application settings."""
+        return cls(
+            negative_cache=InMemoryNegativeCache(
+                max_size=settings.LOGIN_NEGATIVE_CACHE_SIZE,
+                ttl_seconds=settings.LOGIN_NEGATIVE_CACHE_TTL_SECONDS
+            ),
+            ip_limiter=RateLimiter(
+                capacity=settings.LOGIN_IP_BURST,
+                per_minute=settings.LOGIN_IP_RATE_PER_MINUTE,
+                max_keys=settings.LOGIN_RATE_LIMIT_MAX_KEYS
+            ),
+            email_limiter=RateLimiter(
+                capacity=settings.LOGIN_EMAIL_BURST,
+                per_minute=settings.LOGIN_EMAIL_RATE_PER_MINUTE,
+                max_keys=settings.LOGIN_RATE_LIMIT_MAX_KEYS
+            ),
+            enabled=settings.LOGIN_GUARD_ENABLED
+        )
+
+    def check(self, email: str, client_ip: str | None = None) -> bool:
+        """
+        Runs the pre-checks for a login attempt.
+
+        Returns:
+            False if the email is a cached miss and the attempt can be failed immediately.
+
+        Raises:
+            LoginThrottledError: if the client IP or the email is over its rate limit.
+        """
+        if not self.enabled:
+            return True
+
+        if client_ip is not None:
+            retry_after = self.ip_limiter.hit(client_ip)
+            if retry_after:
+                metrics.observe("login_guard_checks", 1, outcome="rejected_ip")
+                raise LoginThrottledError("Too many login attempts from this address", retry_after)
+
+        retry_after = self.email_limiter.hit(email)
+        if retry_after:
+            metrics.observe("login_guard_checks", 1, outcome="rejected_email")
+            raise LoginThrottledError("Too many login attempts for this account", retry_after)
+
+        if self.negative_cache.contains(email):
+            metrics.observe("login_guard_checks", 1, outcome="negative_hit")
+            return False
+
+        metrics.observe("login_guard_checks", 1, outcome="passed")
+        return True
+
+    def record_unknown_email(self, email: str) -> None:
+        """Remembers that no account exists for the email."""
+        if self.enabled:
+            metrics.observe("login_unknown_emails", 1)
+            self.negative_cache.add(email)
+
+    def forget(self, email: str) -> None:
+        """Drops the email from the negative cache (e.g. right after signup)."""
+        self.negative_cache.discard(email)
+
+
+login_guard = LoginGuard.from_settings()
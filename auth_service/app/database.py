@@ -1,5 +1,7 @@
+import time
 from typing import AsyncGenerator
 
+from sqlalchemy import Engine, event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -8,6 +10,7 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import DeclarativeBase
 from .core.config import settings
+from .core.tracing import tracer
 
 engine: AsyncEngine = create_async_engine(
     url=settings.get_database_url,
@@ -18,6 +21,30 @@ engine: AsyncEngine = create_async_engine(
     pool_pre_ping=True
 )
 
+
+def trace_queries(sync_engine: Engine) -> None:
+    """
+    Reports every statement run on the engine as a db.query span of the current trace.
+    Statements are recorded without their parameters.
+    """
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context.trace_started_ns = time.time_ns()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        tracer.record(
+            "db.query",
+            context.trace_started_ns,
+            time.time_ns(),
+            **{"db.system": sync_engine.dialect.name, "db.statement": statement}
+        )
+
+
+if tracer.enabled:
+    trace_queries(engine.sync_engine)
+
+
 async_session_local = async_sessionmaker(
     bind=engine,
     expire_on_commit=False,
@@ -1,12 +1,19 @@
+import hmac
+import uuid
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Header, HTTPException, Request, status
+from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .database import get_session
+from .core.cache import CacheBackend, profile_cache
+from .core.config import settings
 from .core.security import PasswordManager, JWTManager
+from .core.revocation import RevocationStore, revocation_store
+from .core.throttling import LoginGuard, login_guard
 from .repository import UserRepository
-from .services import AuthService
+from .services import AdminService, AuthService, ACCESS_TOKEN_TYPE
 
 SessionDepends = Annotated[AsyncSession, Depends(get_session)]
 
@@ -32,15 +39,42 @@ def get_jwt_manager() -> JWTManager:
     return JWTManager()
 
 
+def get_login_guard() -> LoginGuard:
+    """
+    Returns the process-wide LoginGuard (negative cache and rate limiters).
+    """
+    return login_guard
+
+
+def get_revocation_store() -> RevocationStore:
+    """
+    Returns the process-wide store of used refresh tokens and revoked sessions.
+    """
+    return revocation_store
+
+
+def get_profile_cache() -> CacheBackend:
+    """
+    Returns the process-wide profile cache.
+    """
+    return profile_cache
+
+
 RepositoryDepends = Annotated[UserRepository, Depends(get_repository)]
 PasswordManagerDepends = Annotated[PasswordManager, Depends(get_password_manager)]
 JWTManagerDepends = Annotated[JWTManager, Depends(get_jwt_manager)]
+LoginGuardDepends = Annotated[LoginGuard, Depends(get_login_guard)]
+RevocationStoreDepends = Annotated[RevocationStore, Depends(get_revocation_store)]
+ProfileCacheDepends = Annotated[CacheBackend, Depends(get_profile_cache)]
 
 
 def get_auth_service(
     repository: RepositoryDepends,
     password_manager: PasswordManagerDepends,
-    jwt_manager: JWTManagerDepends
+    jwt_manager: JWTManagerDepends,
+    guard: LoginGuardDepends,
+    store: RevocationStoreDepends,
+    cache: ProfileCacheDepends
 ) -> AuthService:
     """
     Returns an AuthService instance with injected repository and security managers.
@@ -48,8 +82,69 @@ def get_auth_service(
     return AuthService(
         repository=repository,
         password_manager=password_manager,
-        jwt_manager=jwt_manager
+        jwt_manager=jwt_manager,
+        login_guard=guard,
+        revocation_store=store,
+        profile_cache=cache
     )
 
 
-AuthServiceDepends = Annotated[AuthService, Depends(get_auth_service)]
\ No newline at end of file
+AuthServiceDepends = Annotated[AuthService, Depends(get_auth_service)]
+
+
+def get_admin_service(repository: RepositoryDepends) -> AdminService:
+    """
+    Returns an AdminService instance with an injected repository.
+    """
+    return AdminService(repository=repository)
+
+
+AdminServiceDepends = Annotated[AdminService, Depends(get_admin_service)]
+
+
+def require_admin(x_admin_key: Annotated[str | None, Header()] = None) -> None:
+    """
+    Admits requests carrying the configured ADMIN_API_KEY in the X-Admin-Key header.
+    """
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin API is disabled"
+        )
+    if x_admin_key is None or not hmac.compare_digest(x_admin_key.encode(), settings.ADMIN_API_KEY.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin key"
+        )
+
+
+def get_current_user_id(request: Request, jwt_manager: JWTManagerDepends) -> uuid.UUID:
+    """
+    Extracts the Bearer access token from the Authorization header and returns its subject.
+    """
+    auth_header = request.headers.get("Authorization")
+
+    if not auth_header or not auth_header.startswith("Bearer "):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing or invalid Authorization header"
+        )
+
+    try:
+        payload = jwt_manager.decode_token(auth_header.split(" ")[1])
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token"
+        )
+
+    if payload.get("type") != ACCESS_TOKEN_TYPE:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Access token required"
+        )
+
+    return uuid.UUID(payload["sub"])
+
+
+CurrentUserIdDepends = Annotated[uuid.UUID, Depends(get_current_user_id)]
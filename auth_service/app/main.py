@@ -1,10 +1,33 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from .router import auth_router
+from fastapi.responses import ORJSONResponse
+from .core.logs import configure_logging, shutdown_logging
+from .core.tracing import TracingMiddleware
+from .router import auth_router, well_known_router, admin_router, ops_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Starts the background log writer and flushes it on shutdown.
+    """
+    configure_logging("auth_service")
+    yield
+    shutdown_logging()
+
 
 app = FastAPI(
     title="Auth Service",
     description="Service for user registration, authentication.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+app.add_middleware(TracingMiddleware)
+
 app.include_router(auth_router)
+app.include_router(well_known_router)
+app.include_router(admin_router)
+app.include_router(ops_router)
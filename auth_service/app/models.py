@@ -1,6 +1,6 @@
 import uuid
 from datetime import date
-from sqlalchemy import String, Date
+from sqlalchemy import String, Date, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.ext.asyncio import AsyncAttrs
@@ -22,4 +22,14 @@ class User(AsyncAttrs, Base):
     surname: Mapped[str] = mapped_column(String(64), nullable=False)
     email: Mapped[str] = mapped_column(String(128), unique=True, index=True, nullable=False)
     date_of_birth: Mapped[date] = mapped_column(Date, nullable=False)
-    password: Mapped[str] = mapped_column(String(128), nullable=False)
\ No newline at end of file
+    password: Mapped[str] = mapped_column(String(128), nullable=False)
+
+
+# Case-insensitive prefix search for the admin listing (see UserRepository.search_condition).
+# text_pattern_ops compares bytes, so prefix ranges can use the index under any collation.
+for column in (User.name, User.surname, User.email):
+    Index(
+        f"ix_users_{column.key}_prefix",
+        func.lower(column).label(f"{column.key}_lower"),
+        postgresql_ops={f"{column.key}_lower": "text_pattern_ops"}
+    )
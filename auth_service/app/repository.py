@@ -1,7 +1,14 @@
-from sqlalchemy import select
+import sys
+import uuid
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import ColumnElement, Row, and_, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from .models import User
 
+# Columns returned by listings: everything but the password hash.
+LISTED_COLUMNS = (User.id, User.name, User.surname, User.email, User.date_of_birth)
+
 
 class UserRepository:
     """
@@ -27,4 +34,75 @@ class UserRepository:
         result = await self.session.execute(
             select(User).where(User.email == email)
         )
-        return result.scalars().first()
\ No newline at end of file
+        return result.scalars().first()
+
+    async def get_by_id(self, user_id: uuid.UUID) -> User | None:
+        """
+        Retrieves a user from the database by their primary key.
+        """
+        return await self.session.get(User, user_id)
+
+    async def update_password(self, user_id: uuid.UUID, hashed_password: str) -> None:
+        """
+        Replaces the stored password hash of a user.
+        """
+        await self.session.execute(
+            update(User).where(User.id == user_id).values(password=hashed_password)
+        )
+        await self.session.commit()
+
+    async def list_users(
+        self,
+        limit: int,
+        after: uuid.UUID | None = None,
+        prefix: str | None = None
+    ) -> Sequence[Row]:
+        """
+        Returns up to `limit` users ordered by id, starting after the `after` id.
+        Keyset pagination: every page is an index range scan, however deep, unlike OFFSET.
+        """
+        query = self._listing(prefix)
+        if after is not None:
+            query = query.where(User.id > after)
+        result = await self.session.execute(query.limit(limit))
+        return result.all()
+
+    async def stream_users(self, prefix: str | None = None, batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        """
+        Yields every matching user, ordered by id, in batches read from a server-side cursor,
+        so an export holds one batch in memory whatever the table size.
+        """
+        result = await self.session.stream(self._listing(prefix).execution_options(yield_per=batch_size))
+        async for batch in result.partitions():
+            yield batch
+
+    @classmethod
+    def _listing(cls, prefix: str | None):
+        query = select(*LISTED_COLUMNS).order_by(User.id)
+        if prefix:
+            query = query.where(cls.search_condition(prefix))
+        return query
+
+    @staticmethod
+    def search_condition(prefix: str) -> ColumnElement[bool]:
+        """
+        Case-insensitive prefix match on name, surname or email, served by the ix_users_*_prefix indexes.
+        Written as a range with the text_pattern_ops operators rather than LIKE: the planner only
+        turns LIKE into an index range for a literal pattern, not for the bound parameters of
+        prepared statements.
+        """
+        lower = prefix.lower()
+        # U+10FFFF has no successor: bump the last character before it, or leave the range open
+        stem = lower.rstrip(chr(sys.maxunicode))
+        upper = None
+        if stem:
+            # The successor of U+D7FF is U+E000: surrogates cannot be encoded for PostgreSQL
+            successor = ord(stem[-1]) + 1
+            upper = stem[:-1] + chr(0xE000 if successor == 0xD800 else successor)
+        conditions = []
+        for column in (User.name, User.surname, User.email):
+            condition = func.lower(column).op("~>=~")(lower)
+            if upper is not None:
+                condition = and_(condition, func.lower(column).op("~<~")(upper))
+            conditions.append(condition)
+        return or_(*conditions)
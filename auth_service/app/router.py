@@ -1,8 +1,30 @@
-from fastapi import APIRouter, HTTPException, status
-from .schemas import UserCreate, UserResponse, UserAuth, TokenResponse
-from .dependencies import AuthServiceDepends
+import math
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from .schemas import UserCreate, UserResponse, UserAuth, TokenResponse, RefreshRequest, UserPage
+from .core.config import settings
+from .core.metrics import metrics
+from .core.throttling import LoginThrottledError
+from .dependencies import (
+    AdminServiceDepends,
+    AuthServiceDepends,
+    JWTManagerDepends,
+    CurrentUserIdDepends,
+    require_admin
+)
 
 auth_router = APIRouter(prefix="/api/auth", tags=["auth"])
+well_known_router = APIRouter(prefix="/.well-known", tags=["jwks"])
+admin_router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+ops_router = APIRouter(tags=["ops"], dependencies=[Depends(require_admin)])
+
+JWKS_CACHE_SECONDS = 300
+ADMIN_PAGE_SIZE_MAX = 500
+SEARCH_PREFIX_MAX_LENGTH = 128
+# PostgreSQL text cannot hold NUL characters
+SEARCH_PREFIX_PATTERN = r"^[^\x00]*$"
 
 @auth_router.post(
     "/signup",
@@ -36,14 +58,47 @@ async def signup(
 )
 async def login(
     auth_data: UserAuth,
+    request: Request,
+    service: AuthServiceDepends
+):
+    """
+    Authenticates a user and returns an access token and a refresh token.
+    """
+    client_ip = request.client.host if request.client else None
+    try:
+        return await service.authenticate(auth_data=auth_data, client_ip=client_ip)
+    except LoginThrottledError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={"error": "Rate Limit", "message": str(e)},
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={"error": "Auth Error", "message": str(e)}
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "Server Error", "message": "Internal server error"}
+        )
+
+
+@auth_router.post(
+    "/refresh",
+    response_model=TokenResponse,
+    status_code=status.HTTP_200_OK
+)
+async def refresh(
+    refresh_data: RefreshRequest,
     service: AuthServiceDepends
 ):
     """
-    Authenticates a user and returns a profile-encoded JWT access token.
+    Exchanges a refresh token for a new token pair (the old refresh token becomes invalid).
     """
     try:
-        access_token = await service.authenticate(auth_data=auth_data)
-        return {"access_token": access_token, "token_type": "Bearer"}
+        return await service.refresh(refresh_token=refresh_data.refresh_token)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -53,4 +108,102 @@ async def login(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={"error": "Server Error", "message": "Internal server error"}
-        )
\ No newline at end of file
+        )
+
+
+@auth_router.get(
+    "/me",
+    response_model=UserResponse,
+    status_code=status.HTTP_200_OK
+)
+async def me(
+    user_id: CurrentUserIdDepends,
+    response: Response,
+    service: AuthServiceDepends
+):
+    """
+    Returns the profile of the user identified by the access token.
+    """
+    try:
+        profile = await service.get_profile(user_id=user_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": "Not Found", "message": str(e)}
+        )
+    response.headers["Cache-Control"] = f"private, max-age={settings.PROFILE_CACHE_MAX_AGE_SECONDS}"
+    return profile
+
+
+@well_known_router.get(
+    "/jwks.json",
+    status_code=status.HTTP_200_OK
+)
+async def jwks(
+    response: Response,
+    jwt_manager: JWTManagerDepends
+):
+    """
+    Publishes the public keys used to verify access tokens (empty for HMAC algorithms).
+    """
+    response.headers["Cache-Control"] = f"public, max-age={JWKS_CACHE_SECONDS}"
+    return jwt_manager.keys.jwks()
+
+
+@admin_router.get(
+    "/users",
+    response_model=UserPage,
+    status_code=status.HTTP_200_OK
+)
+async def list_users(
+    service: AdminServiceDepends,
+    after: uuid.UUID | None = Query(None, description="`next_cursor` of the previous page"),
+    limit: int = Query(50, ge=1, le=ADMIN_PAGE_SIZE_MAX),
+    q: str | None = Query(
+        None,
+        min_length=1,
+        max_length=SEARCH_PREFIX_MAX_LENGTH,
+        pattern=SEARCH_PREFIX_PATTERN,
+        description="Case-insensitive prefix of the name, surname or email"
+    )
+):
+    """
+    Lists users ordered by id, one page at a time.
+    """
+    return await service.list_users(limit=limit, after=after, prefix=q)
+
+
+@admin_router.get(
+    "/users/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK
+)
+async def export_users(
+    service: AdminServiceDepends,
+    q: str | None = Query(
+        None,
+        min_length=1,
+        max_length=SEARCH_PREFIX_MAX_LENGTH,
+        pattern=SEARCH_PREFIX_PATTERN,
+        description="Case-insensitive prefix of the name, surname or email"
+    )
+):
+    """
+    Streams every (matching) user as newline-delimited JSON, read through a server-side cursor.
+    """
+    return StreamingResponse(
+        service.export_users(prefix=q),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="users.ndjson"'}
+    )
+
+
+@ops_router.get(
+    "/metrics",
+    status_code=status.HTTP_200_OK
+)
+async def get_metrics():
+    """
+    Reports this process's metrics, such as the profile cache hit ratio.
+    """
+    return {"metrics": metrics.snapshot()}
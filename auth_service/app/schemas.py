@@ -1,4 +1,5 @@
 import uuid
+from typing import List
 from pydantic import BaseModel, EmailStr, Field
 from datetime import date
 
@@ -23,6 +24,22 @@ class UserResponse(UserBase):
     """
     id: uuid.UUID = Field(..., title="User ID")
 
+    @classmethod
+    def from_user(cls, user) -> "UserResponse":
+        """
+        Builds the response from a stored user without re-validating it: rows were
+        validated on the way in, and their column types already match the fields.
+        """
+        return cls.model_construct(**{field: getattr(user, field) for field in cls.model_fields})
+
+
+class UserPage(BaseModel):
+    """
+    One page of the admin user listing, ordered by user id.
+    """
+    items: List[UserResponse] = Field(..., description="Users of this page")
+    next_cursor: uuid.UUID | None = Field(None, description="Pass as `after` for the next page; null on the last page")
+
 class UserCreate(UserBase):
     """
     Schema for user registration, including password.
@@ -44,4 +61,12 @@ class TokenResponse(BaseModel):
     Schema for successful authentication response containing JWT.
     """
     access_token: str = Field(..., description="JWT access token")
+    refresh_token: str = Field(..., description="Single-use token for obtaining a new token pair")
     token_type: str = Field("Bearer", description="Token type, always 'bearer'")
+
+
+class RefreshRequest(BaseModel):
+    """
+    Schema for exchanging a refresh token for a new token pair.
+    """
+    refresh_token: str = Field(..., description="Refresh token received from login or a previous refresh")
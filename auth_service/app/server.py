@@ -0,0 +1,103 @@
+"""
+Production launcher: gunicorn managing uvicorn workers with uvloop and httptools.
+
+    python -m app.server
+
+The application and the password hashing backend are imported once in the master
+process; workers are forked from it and share that memory copy-on-write. Worker
+count, recycling and timeouts come from the SERVER_* settings.
+
+Login throttling and refresh token revocation keep their state in process memory (see
+RevocationStore and LoginGuard). Several workers would each enforce their own rate
+limits and miss reuse and revocations seen by the others, and recycling a worker would
+forget them, so the launcher refuses both until a shared backend is configured.
+The single worker still uses every CPU for the CPU-bound work: Argon2 runs on a thread
+pool (PASSWORD_HASHING_THREADS, see run_password_hashing) that releases the GIL.
+"""
+from typing import Any, Dict, List
+
+from gunicorn.app.base import BaseApplication
+from uvicorn_worker import UvicornWorker as BaseUvicornWorker
+
+from .core.config import settings
+from .core.cpus import available_cpus
+
+# Extra seconds the master waits after the workers' own graceful timeout,
+# so application shutdown can complete before workers are killed.
+SHUTDOWN_MARGIN_SECONDS = 5
+
+
+class UvicornWorker(BaseUvicornWorker):
+    """
+    Uvicorn worker pinned to uvloop and httptools (fails at boot if they are missing,
+    instead of silently falling back to asyncio and h11).
+    """
+    CONFIG_KWARGS = {
+        "loop": "uvloop",
+        "http": "httptools",
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT,
+    }
+
+
+def process_local_security_state() -> List[str]:
+    """Security stores keeping their state in process memory, which workers would not share."""
+    from .core.revocation import InMemoryRevocationStore, revocation_store
+
+    # LoginGuard has no shared backend yet
+    stores = ["login throttling"]
+    if isinstance(revocation_store, InMemoryRevocationStore):
+        stores.append("refresh token revocation")
+    return stores
+
+
+def server_options() -> Dict[str, Any]:
+    """
+    Gunicorn configuration derived from application settings.
+    Raises ValueError for several workers or worker recycling while security state is per process.
+    """
+    workers = settings.SERVER_WORKERS or available_cpus()
+    if workers > 1 or settings.SERVER_MAX_REQUESTS:
+        stores = process_local_security_state()
+        if stores:
+            raise ValueError(
+                f"{' and '.join(stores).capitalize()} state is per process: run a single worker "
+                f"(SERVER_WORKERS=1) without recycling (SERVER_MAX_REQUESTS=0), "
+                f"got {workers} worker(s) and SERVER_MAX_REQUESTS={settings.SERVER_MAX_REQUESTS}"
+            )
+    return {
+        "bind": f"{settings.SERVER_HOST}:{settings.SERVER_PORT}",
+        "workers": workers,
+        "worker_class": UvicornWorker,
+        "preload_app": True,
+        "max_requests": settings.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVER_MAX_REQUESTS_JITTER,
+        "timeout": settings.SERVER_TIMEOUT,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT + SHUTDOWN_MARGIN_SECONDS,
+        "keepalive": settings.SERVER_KEEPALIVE,
+    }
+
+
+class Server(BaseApplication):
+    """
+    Embedded gunicorn application serving app.main:app.
+    """
+
+    def __init__(self, options: Dict[str, Any]):
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from .main import app
+        from .core.security import PasswordManager
+
+        # passlib and argon2 are otherwise imported on the first login of every worker
+        PasswordManager().pwd_context
+        return app
+
+
+if __name__ == "__main__":
+    Server(server_options()).run()
@@ -1,10 +1,41 @@
+import asyncio
 import logging
+import time
+import uuid
+from datetime import timedelta
+from typing import AsyncIterator
+import orjson
+from jose import JWTError
+from .database import async_session_local
 from .repository import UserRepository
-from .schemas import UserCreate, UserResponse, UserAuth
-from .core.security import PasswordManager, JWTManager
+from .schemas import UserCreate, UserResponse, UserAuth, TokenResponse, UserPage
+from .core.cache import CacheBackend, profile_cache as default_profile_cache
+from .core.config import settings
+from .core.metrics import metrics
+from .core.revocation import RevocationStore, RevocationStoreFullError, revocation_store as default_revocation_store
+from .core.security import PasswordManager, JWTManager, run_password_hashing
+from .core.throttling import LoginGuard
 
 logger = logging.getLogger(__name__)
 
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+
+# Strong references to fire-and-forget tasks so they are not garbage collected mid-flight
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def store_upgraded_hash(user_id: uuid.UUID, hashed_password: str) -> None:
+    """
+    Persists a rehashed password using its own session, independent of the request lifecycle.
+    """
+    try:
+        async with async_session_local() as session:
+            await UserRepository(session).update_password(user_id, hashed_password)
+        logger.info("Password hash upgraded for user: %s", user_id)
+    except Exception as e:
+        logger.warning("Password hash upgrade failed for user %s: %s", user_id, e)
+
 
 class AuthService:
     """
@@ -15,11 +46,17 @@ class AuthService:
             self,
             repository: UserRepository,
             password_manager: PasswordManager,
-            jwt_manager: JWTManager
+            jwt_manager: JWTManager,
+            login_guard: LoginGuard | None = None,
+            revocation_store: RevocationStore = default_revocation_store,
+            profile_cache: CacheBackend = default_profile_cache
     ):
         self.repository = repository
         self.password_manager = password_manager
         self.jwt_manager = jwt_manager
+        self.login_guard = login_guard
+        self.revocation_store = revocation_store
+        self.profile_cache = profile_cache
 
     async def create_account(self, user_data: UserCreate) -> UserResponse:
         """
@@ -30,28 +67,148 @@ class AuthService:
         if existing_user:
             raise ValueError("Email must be unique")
 
-        hashed_password = self.password_manager.hash(user_data.password)
+        hashed_password = await run_password_hashing(self.password_manager.hash, user_data.password)
 
         user_dict = user_data.model_dump(exclude={"id"})
         user_dict["password"] = hashed_password
 
         user = await self.repository.create(**user_dict)
-        logger.info(f"User registered: {user.email}")
-        return UserResponse.from_orm(user)
+        if self.login_guard:
+            self.login_guard.forget(user.email)
+        logger.info("User registered: %s", user.email)
+        return UserResponse.from_user(user)
 
-    async def authenticate(self, auth_data: UserAuth) -> str:
+    async def authenticate(self, auth_data: UserAuth, client_ip: str | None = None) -> TokenResponse:
         """
-        Validates user credentials and returns a JWT token containing profile data.
+        Validates user credentials and returns a new access/refresh token pair.
+        Rate-limited and known-unknown attempts are rejected before any DB or hashing work.
         """
+        if self.login_guard and not self.login_guard.check(auth_data.email, client_ip):
+            raise ValueError("Incorrect email or password")
+
         user = await self.repository.get_by_email(email=auth_data.email)
 
-        if not user or not self.password_manager.verify(
-                password=auth_data.password,
-                hashed_password=user.password
-        ):
+        if not user:
+            if self.login_guard:
+                self.login_guard.record_unknown_email(auth_data.email)
             raise ValueError("Incorrect email or password")
 
-        user_payload = UserResponse.from_orm(user).model_dump(mode='json')
+        is_valid, new_hash = await run_password_hashing(
+            self.password_manager.verify_and_update, auth_data.password, user.password
+        )
+        if not is_valid:
+            raise ValueError("Incorrect email or password")
+
+        if new_hash:
+            self._schedule_hash_upgrade(user.id, new_hash)
+
+        return self._issue_tokens(user_id=str(user.id), family=uuid.uuid4().hex)
+
+    async def refresh(self, refresh_token: str) -> TokenResponse:
+        """
+        Exchanges a refresh token for a new token pair without touching the database.
+        Each refresh token is single-use: presenting one twice revokes the whole
+        session (token family), since it means the token has leaked.
+        Tokens the revocation store cannot check for reuse (issued before it started, or
+        while it is full) are rejected, so the session has to log in again.
+        """
+        try:
+            payload = self.jwt_manager.decode_token(refresh_token)
+        except JWTError:
+            raise ValueError("Invalid refresh token")
+
+        if payload.get("type") != REFRESH_TOKEN_TYPE:
+            raise ValueError("Invalid refresh token")
+
+        family = payload["fam"]
+        if self.revocation_store.is_family_revoked(family):
+            raise ValueError("Refresh token has been revoked")
+        if not self.revocation_store.tracks(payload["iat"]):
+            raise ValueError("Refresh token predates the revocation store, log in again")
+
+        try:
+            first_use = self.revocation_store.consume(payload["jti"], expires_at=payload["exp"])
+        except RevocationStoreFullError as e:
+            logger.error("Refusing refresh for user %s: %s", payload['sub'], e)
+            raise ValueError("Refresh token cannot be rotated now, log in again")
+        if not first_use:
+            self.revocation_store.revoke_family(family, expires_at=time.time() + self._refresh_lifetime_seconds())
+            logger.warning("Refresh token reuse detected for user: %s", payload['sub'])
+            raise ValueError("Refresh token has been revoked")
+
+        return self._issue_tokens(user_id=payload["sub"], family=family)
+
+    async def get_profile(self, user_id: uuid.UUID) -> UserResponse:
+        """
+        Returns the profile of an existing user, from the profile cache when possible.
+        Cache hits and misses are reported as profile_cache_hit (its mean is the hit ratio).
+        """
+        profile = await self.profile_cache.get(str(user_id))
+        metrics.observe("profile_cache_hit", int(profile is not None))
+        if profile is not None:
+            return profile
+
+        user = await self.repository.get_by_id(user_id=user_id)
+        if not user:
+            raise ValueError("User not found")
+        profile = UserResponse.from_user(user)
+        await self.profile_cache.set(str(user_id), profile)
+        return profile
 
-        access_token = self.jwt_manager.create_token(data=user_payload)
-        return access_token
\ No newline at end of file
+    async def invalidate_profile(self, user_id: uuid.UUID) -> None:
+        """
+        Drops the cached profile of a user. Every write that changes profile fields must call it;
+        signup does not need to (a new id is never cached), and password updates leave the profile unchanged.
+        """
+        await self.profile_cache.delete(str(user_id))
+
+    def _issue_tokens(self, user_id: str, family: str) -> TokenResponse:
+        """
+        Signs a compact access token and a refresh token belonging to the given family.
+        """
+        access_token = self.jwt_manager.create_token(data={"sub": user_id, "type": ACCESS_TOKEN_TYPE})
+        refresh_token = self.jwt_manager.create_token(
+            data={"sub": user_id, "type": REFRESH_TOKEN_TYPE, "jti": uuid.uuid4().hex, "fam": family},
+            expires_delta=timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        )
+        return TokenResponse(access_token=access_token, refresh_token=refresh_token)
+
+    @staticmethod
+    def _refresh_lifetime_seconds() -> int:
+        return settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+
+    @staticmethod
+    def _schedule_hash_upgrade(user_id: uuid.UUID, new_hash: str) -> None:
+        """
+        Writes an upgraded password hash in the background so login latency is unaffected.
+        """
+        task = asyncio.create_task(store_upgraded_hash(user_id, new_hash))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+
+class AdminService:
+    """
+    Read-only user listing and export for operators.
+    """
+
+    def __init__(self, repository: UserRepository):
+        self.repository = repository
+
+    async def list_users(self, limit: int, after: uuid.UUID | None = None, prefix: str | None = None) -> UserPage:
+        """
+        Returns one page of users, optionally those whose name, surname or email starts with `prefix`.
+        """
+        rows = await self.repository.list_users(limit=limit + 1, after=after, prefix=prefix)
+        items = [UserResponse.from_user(row) for row in rows[:limit]]
+        return UserPage(items=items, next_cursor=items[-1].id if len(rows) > limit else None)
+
+    async def export_users(self, prefix: str | None = None) -> AsyncIterator[bytes]:
+        """
+        Streams every matching user as NDJSON, one chunk per cursor batch.
+        """
+        exported = 0
+        async for batch in self.repository.stream_users(prefix, batch_size=settings.ADMIN_EXPORT_BATCH_SIZE):
+            exported += len(batch)
+            yield b"".join(orjson.dumps(row._asdict(), option=orjson.OPT_APPEND_NEWLINE) for row in batch)
+        logger.info("Exported %s users", exported)
@@ -0,0 +1,66 @@
+"""
+JWT codec microbenchmark.
+
+Checks that every codec produces and accepts the same claims, then reports
+encode/decode throughput for a typical access token:
+
+    python -m benchmarks.bench_jwt --iterations 20000
+"""
+import argparse
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from app.core.codecs import HMACCodec, JoseCodec
+
+SECRET = "benchmark-secret-key"
+ALGORITHM = "HS256"
+CLAIMS = {
+    "id": "550e8400-e29b-41d4-a716-446655440000",
+    "name": "Ivan",
+    "surname": "Ivanov",
+    "email": "ivan@example.com",
+    "date_of_birth": "2000-01-01",
+    "exp": datetime.now(timezone.utc) + timedelta(days=1),
+}
+# Options used by auth_service; pdf_service decodes with jose defaults (None).
+DECODE_OPTIONS = [None, {"verify_aud": False, "verify_iss": False}]
+
+
+def check_compatibility(codecs) -> None:
+    """Fails loudly if any codec disagrees with another on tokens or claims."""
+    tokens = {codec.name: codec.encode(CLAIMS, SECRET, ALGORITHM) for codec in codecs}
+    if len(set(tokens.values())) != 1:
+        raise SystemExit(f"Codecs produced different tokens: {tokens}")
+
+    for token in tokens.values():
+        for options in DECODE_OPTIONS:
+            results = {codec.name: codec.decode(token, SECRET, [ALGORITHM], options) for codec in codecs}
+            if len({repr(sorted(claims.items())) for claims in results.values()}) != 1:
+                raise SystemExit(f"Codecs decoded different claims: {results}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare JWT codec throughput.")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    codecs = [JoseCodec(), HMACCodec()]
+    check_compatibility(codecs)
+    print("Compatibility: OK (identical tokens and claims)\n")
+
+    print(f"{'codec':<8}{'encode ops/s':>16}{'decode ops/s':>16}")
+    baseline = None
+    for codec in codecs:
+        token = codec.encode(CLAIMS, SECRET, ALGORITHM)
+        encode = timeit.timeit(lambda: codec.encode(CLAIMS, SECRET, ALGORITHM), number=args.iterations)
+        decode = timeit.timeit(lambda: codec.decode(token, SECRET, [ALGORITHM]), number=args.iterations)
+        rates = (args.iterations / encode, args.iterations / decode)
+        baseline = baseline or rates
+        print(
+            f"{codec.name:<8}{rates[0]:>16,.0f}{rates[1]:>16,.0f}"
+            f"   (x{rates[0] / baseline[0]:.1f} / x{rates[1] / baseline[1]:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Profile endpoint cache benchmark.
+
+Drives GET /api/auth/me in-process with a repository that simulates a database
+round trip, once with the profile cache disabled (every read queries the
+database) and once with the in-process TTL cache, for a population of users
+whose reads are skewed towards a hot subset:
+
+    python -m benchmarks.bench_profile_cache --requests 5000 --users 500 --db-ms 1
+
+Reports requests per second, database reads and the cache hit ratio.
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+from httpx import ASGITransport, AsyncClient
+
+from app.core.cache import InMemoryTTLCache
+from app.core.metrics import metrics
+from app.dependencies import get_current_user_id, get_profile_cache, get_repository
+from app.main import app
+
+
+class SlowRepository:
+    """Answers get_by_id after a fixed delay standing in for a Postgres round trip."""
+
+    def __init__(self, users: dict, delay: float):
+        self.users = users
+        self.delay = delay
+        self.reads = 0
+
+    async def get_by_id(self, user_id: uuid.UUID):
+        self.reads += 1
+        await asyncio.sleep(self.delay)
+        return self.users.get(user_id)
+
+
+def make_users(count: int) -> dict:
+    return {
+        user_id: SimpleNamespace(
+            id=user_id, name="Ivan", surname=f"Ivanov{index}", email=f"ivan{index}@example.com",
+            date_of_birth=date(2000, 1, 1), password="hash"
+        )
+        for index, user_id in enumerate(uuid.uuid4() for _ in range(count))
+    }
+
+
+async def run_case(ttl: float, users: dict, args) -> tuple[float, int, float]:
+    metrics.reset()
+    rng = random.Random(args.seed)
+    ids = list(users)
+    # Pareto-like skew: a few users account for most reads
+    sequence = [ids[min(int(rng.paretovariate(1.2)) - 1, len(ids) - 1)] for _ in range(args.requests)]
+    repository = SlowRepository(users, args.db_ms / 1000)
+    cache = InMemoryTTLCache(max_size=args.users, ttl=ttl)
+    current = {"id": ids[0]}
+    app.dependency_overrides[get_current_user_id] = lambda: current["id"]
+    app.dependency_overrides[get_repository] = lambda: repository
+    app.dependency_overrides[get_profile_cache] = lambda: cache
+
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            started = time.perf_counter()
+            for user_id in sequence:
+                current["id"] = user_id
+                (await client.get("/api/auth/me")).raise_for_status()
+            elapsed = time.perf_counter() - started
+    finally:
+        app.dependency_overrides.clear()
+
+    [hits] = [m for m in metrics.snapshot() if m["name"] == "profile_cache_hit"]
+    return args.requests / elapsed, repository.reads, hits["mean"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare /api/auth/me with and without the profile cache.")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--db-ms", type=float, default=1.0, help="simulated database round trip")
+    parser.add_argument("--ttl", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    users = make_users(args.users)
+    print(f"{'profile cache':<16}{'req/s':>10}{'db reads':>10}{'hit ratio':>11}")
+    for name, ttl in (("off", 0.0), (f"ttl {args.ttl:g}s", args.ttl)):
+        throughput, reads, hit_ratio = asyncio.run(run_case(ttl, users, args))
+        print(f"{name:<16}{throughput:>10.0f}{reads:>10}{hit_ratio:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
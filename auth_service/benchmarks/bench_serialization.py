@@ -0,0 +1,74 @@
+"""
+Response serialization microbenchmark.
+
+Measures the per-request CPU spent turning service results into response bodies,
+through FastAPI's own response validation and serialization for each route, with
+the previous path (from_orm + stdlib JSONResponse) and the current one
+(UserResponse.from_user + ORJSONResponse):
+
+    python -m benchmarks.bench_serialization --iterations 20000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+import warnings
+from datetime import date
+from types import SimpleNamespace
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+
+from app.main import app
+from app.schemas import TokenResponse, UserResponse
+
+USER = SimpleNamespace(
+    id=uuid.UUID("550e8400-e29b-41d4-a716-446655440000"),
+    name="Ivan",
+    surname="Ivanov",
+    email="ivan@example.com",
+    date_of_birth=date(2000, 1, 1),
+    password="$argon2id$v=19$m=65536,t=3,p=4$c29tZXNhbHQ$aGFzaA",
+)
+TOKENS = TokenResponse(access_token="a" * 180, refresh_token="r" * 240)
+
+
+def response_field(path: str):
+    return next(route.response_field for route in app.routes if getattr(route, "path", None) == path)
+
+
+async def per_request_us(build, field, response_class, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        content = await serialize_response(field=field, response_content=build())
+        response_class(content).body
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare response serialization paths.")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    cases = [
+        ("me", "/api/auth/me", [
+            ("from_orm + json", lambda: UserResponse.from_orm(USER), JSONResponse),
+            ("from_user + orjson", lambda: UserResponse.from_user(USER), ORJSONResponse),
+        ]),
+        ("login", "/api/auth/login", [
+            ("json", lambda: TOKENS, JSONResponse),
+            ("orjson", lambda: TOKENS, ORJSONResponse),
+        ]),
+    ]
+    print(f"{'route':<8}{'path':<22}{'us/request':>12}")
+    for route, path, variants in cases:
+        baseline = None
+        for name, build, response_class in variants:
+            us = await per_request_us(build, response_field(path), response_class, args.iterations)
+            baseline = baseline or us
+            print(f"{route:<8}{name:<22}{us:>12.2f}   (x{baseline / us:.1f})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+"""
+Server launch throughput comparison.
+
+Starts the service the way the previous Dockerfile did (a single uvicorn process
+with the asyncio loop and the h11 parser) and with the production launcher
+(python -m app.server: preloaded gunicorn master, uvicorn workers on uvloop and
+httptools; a single worker, since login throttling and token revocation are per
+process). Each server is then loaded with concurrent keep-alive clients rotating
+refresh tokens (JWT decode, revocation check, two JWT signatures; no database)
+for a fixed time:
+
+    python -m benchmarks.bench_server --seconds 10 --concurrency 16
+
+The load generator runs on the same host, so leave CPUs free for the server
+(e.g. pin it with taskset).
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from datetime import timedelta
+
+import httpx
+
+from app.core.security import JWTManager
+from app.services import REFRESH_TOKEN_TYPE
+
+
+def make_refresh_token() -> str:
+    """Starts a new session; every client then rotates its own token chain."""
+    return JWTManager().create_token(
+        data={"sub": str(uuid.uuid4()), "type": REFRESH_TOKEN_TYPE, "jti": uuid.uuid4().hex, "fam": uuid.uuid4().hex},
+        expires_delta=timedelta(hours=1)
+    )
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start(command: list[str], env: dict) -> subprocess.Popen:
+    return subprocess.Popen(command, env={**os.environ, **env}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_ready(client: httpx.AsyncClient, url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get(url)).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+async def load(base_url: str, seconds: float, concurrency: int) -> list[float]:
+    """Runs `concurrency` clients in closed loops; returns per-request latencies in seconds."""
+    latencies: list[float] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        await wait_ready(client, "/.well-known/jwks.json")
+        deadline = time.monotonic() + seconds
+
+        async def user() -> None:
+            token = make_refresh_token()
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                response = await client.post("/api/auth/refresh", json={"refresh_token": token})
+                response.raise_for_status()
+                token = response.json()["refresh_token"]
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+    return latencies
+
+
+def run_case(command: list[str], env: dict, args) -> tuple[float, float, float]:
+    port = free_port()
+    process = start([arg.replace("{port}", str(port)) for arg in command], {**env, "SERVER_PORT": str(port)})
+    try:
+        latencies = asyncio.run(load(f"http://127.0.0.1:{port}", args.seconds, args.concurrency))
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=60)
+    latencies.sort()
+    return (
+        len(latencies) / args.seconds,
+        statistics.median(latencies) * 1000,
+        latencies[int(len(latencies) * 0.99)] * 1000,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the single-process and production launches.")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    env = {"TRACING_EXPORTER": "off"}
+    uvicorn = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", "{port}", "--loop", "asyncio", "--http", "h11"]
+    server = [sys.executable, "-m", "app.server"]
+    cases = [
+        ("uvicorn, asyncio/h11", uvicorn, env),
+        ("app.server, 1 worker", server, {**env, "SERVER_WORKERS": "1"}),
+    ]
+
+    print(f"{'launch':<28}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    baseline = None
+    for name, command, case_env in cases:
+        throughput, p50, p99 = run_case(command, case_env, args)
+        baseline = baseline or throughput
+        print(f"{name:<28}{throughput:>10.1f}{p50:>10.1f}{p99:>10.1f}   (x{throughput / baseline:.2f})")
+
+
+if __name__ == "__main__":
+    main()
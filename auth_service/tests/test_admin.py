@@ -0,0 +1,168 @@
+import json
+import sys
+import uuid
+import pytest
+from collections import namedtuple
+from datetime import date
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+from auth_service.app.main import app
+from auth_service.app.core.config import settings
+from auth_service.app.dependencies import get_repository
+from auth_service.app.models import User
+from auth_service.app.repository import UserRepository
+
+ADMIN_KEY = "admin-secret"
+Row = namedtuple("Row", "id name surname email date_of_birth")
+
+
+def make_rows(count: int) -> list:
+    return [
+        Row(uuid.UUID(int=index + 1), "Ivan", f"Ivanov{index}", f"ivan{index}@example.com", date(2000, 1, 1))
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+def repository(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", ADMIN_KEY)
+    repository = MagicMock()
+    app.dependency_overrides[get_repository] = lambda: repository
+    yield repository
+    app.dependency_overrides.clear()
+
+
+async def admin_get(path: str, **kwargs):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        return await ac.get(path, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_admin_api_requires_the_configured_key(repository):
+    assert (await admin_get("/api/admin/users")).status_code == 401
+    assert (await admin_get("/api/admin/users", headers={"X-Admin-Key": "wrong"})).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_admin_api_is_disabled_without_a_key(repository, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", None)
+
+    response = await admin_get("/api/admin/users", headers={"X-Admin-Key": ""})
+
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_metrics_require_the_admin_key(repository):
+    assert (await admin_get("/metrics")).status_code == 401
+
+    response = await admin_get("/metrics", headers={"X-Admin-Key": ADMIN_KEY})
+
+    assert response.status_code == 200
+    assert "metrics" in response.json()
+
+
+@pytest.mark.asyncio
+async def test_listing_returns_a_keyset_cursor(repository):
+    repository.list_users = AsyncMock(return_value=make_rows(3))
+    after = uuid.uuid4()
+
+    response = await admin_get(
+        "/api/admin/users",
+        params={"limit": 2, "after": str(after), "q": "Iv"},
+        headers={"X-Admin-Key": ADMIN_KEY}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["surname"] for item in body["items"]] == ["Ivanov0", "Ivanov1"]
+    assert "password" not in body["items"][0]
+    assert body["next_cursor"] == str(uuid.UUID(int=2))
+    repository.list_users.assert_awaited_once_with(limit=3, after=after, prefix="Iv")
+
+
+@pytest.mark.asyncio
+async def test_last_page_has_no_cursor(repository):
+    repository.list_users = AsyncMock(return_value=make_rows(1))
+
+    response = await admin_get("/api/admin/users", params={"limit": 2}, headers={"X-Admin-Key": ADMIN_KEY})
+
+    assert response.json()["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_export_streams_ndjson_in_batches(repository):
+    rows = make_rows(3)
+
+    async def stream_users(prefix, batch_size):
+        yield rows[:2]
+        yield rows[2:]
+
+    repository.stream_users = stream_users
+
+    response = await admin_get("/api/admin/users/export", headers={"X-Admin-Key": ADMIN_KEY})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[2] == {
+        "id": str(uuid.UUID(int=3)),
+        "name": "Ivan",
+        "surname": "Ivanov2",
+        "email": "ivan2@example.com",
+        "date_of_birth": "2000-01-01"
+    }
+
+
+def test_prefix_search_is_an_index_range_on_lowercased_columns():
+    condition = UserRepository.search_condition("IvA")
+
+    sql = str(condition.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    for column in ("name", "surname", "email"):
+        assert f"lower(users.{column}) ~>=~ 'iva'" in sql
+        assert f"lower(users.{column}) ~<~ 'ivb'" in sql
+
+
+def test_prefix_ending_in_the_last_code_point_bumps_the_previous_character():
+    top = chr(sys.maxunicode)
+
+    bumped = str(UserRepository.search_condition(f"iv{top}{top}").compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+    open_ended = str(UserRepository.search_condition(top).compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+
+    assert "lower(users.name) ~<~ 'iw'" in bumped
+    assert f"lower(users.name) ~>=~ '{top}'" in open_ended
+    assert "~<~" not in open_ended
+
+
+def test_prefix_ending_before_the_surrogates_bumps_past_them():
+    sql = str(UserRepository.search_condition("iv\ud7ff").compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+
+    assert "lower(users.name) ~<~ 'iv\ue000'" in sql
+
+
+@pytest.mark.asyncio
+async def test_search_rejects_nul_characters(repository):
+    for path in ("/api/admin/users", "/api/admin/users/export"):
+        response = await admin_get(path, params={"q": "iv\x00"}, headers={"X-Admin-Key": ADMIN_KEY})
+
+        assert response.status_code == 422
+
+
+def test_prefix_indexes_use_pattern_operator_class():
+    ddl = {
+        index.name: str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        for index in User.__table__.indexes
+    }
+
+    for column in ("name", "surname", "email"):
+        assert f"(lower({column}) text_pattern_ops)" in ddl[f"ix_users_{column}_prefix"]
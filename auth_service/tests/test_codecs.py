@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError, JWTError
+from auth_service.app.core.codecs import HMACCodec, JoseCodec
+
+SECRET = "test-secret"
+CODECS = [JoseCodec(), HMACCodec()]
+PAYLOADS = [
+    {
+        "id": "550e8400-e29b-41d4-a716-446655440000",
+        "name": "Ivan",
+        "surname": "Ivanov",
+        "email": "ivan@example.com",
+        "date_of_birth": "2000-01-01",
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=30),
+    },
+    {"sub": "user", "name": "Іван Петренко", "iat": 1700000000, "nested": {"roles": ["a", "b"]}},
+]
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+@pytest.mark.parametrize("headers", [None, {"kid": "2026-10"}])
+def test_codecs_are_interchangeable(payload, headers):
+    jose_token = JoseCodec().encode(payload, SECRET, "HS256", headers=headers)
+    hmac_token = HMACCodec().encode(payload, SECRET, "HS256", headers=headers)
+
+    for encoded in (jose_token, hmac_token):
+        decoded = [codec.decode(encoded, SECRET, ["HS256"]) for codec in CODECS]
+        headers_seen = [codec.get_unverified_header(encoded) for codec in CODECS]
+        assert decoded[0] == decoded[1]
+        assert headers_seen[0] == headers_seen[1]
+
+    if payload["name"].isascii():
+        assert hmac_token == jose_token
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: codec.name)
+def test_codecs_reject_the_same_tokens(codec):
+    expired = codec.encode({"exp": datetime.now(timezone.utc) - timedelta(seconds=5)}, SECRET, "HS256")
+    with pytest.raises(ExpiredSignatureError):
+        codec.decode(expired, SECRET, ["HS256"])
+
+    with_audience = codec.encode({"aud": "other-service"}, SECRET, "HS256")
+    with pytest.raises(JWTClaimsError):
+        codec.decode(with_audience, SECRET, ["HS256"])
+    assert codec.decode(with_audience, SECRET, ["HS256"], options={"verify_aud": False})
+
+    valid = codec.encode({"sub": "user"}, SECRET, "HS256")
+    with pytest.raises(JWTError):
+        codec.decode(valid, "other-secret", ["HS256"])
+    with pytest.raises(JWTError):
+        codec.decode(valid, SECRET, ["HS512"])
+    with pytest.raises(JWTError):
+        codec.decode("not-a-token", SECRET, ["HS256"])
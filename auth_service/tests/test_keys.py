@@ -0,0 +1,52 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+from jose import JWTError, jwt
+from auth_service.app.main import app
+from auth_service.app.core.keys import KeyStore, generate_private_key
+from auth_service.app.core.security import JWTManager
+from auth_service.app.dependencies import get_jwt_manager
+
+OLD_KEY = generate_private_key("RS256")
+NEW_KEY = generate_private_key("RS256")
+
+
+def test_rotation_keeps_old_tokens_valid():
+    old_store = KeyStore("RS256", "unused", {"2026-01": OLD_KEY})
+    rotated_store = KeyStore("RS256", "unused", {"2026-01": OLD_KEY, "2026-10": NEW_KEY}, active_kid="2026-10")
+    old_token = JWTManager(keys=old_store).create_token({"sub": "user"})
+    new_token = JWTManager(keys=rotated_store).create_token({"sub": "user"})
+
+    assert jwt.get_unverified_header(new_token)["kid"] == "2026-10"
+    assert JWTManager(keys=rotated_store).decode_token(old_token)["sub"] == "user"
+    with pytest.raises(JWTError):
+        JWTManager(keys=old_store).decode_token(new_token)
+
+
+def test_hmac_store_publishes_nothing():
+    store = KeyStore("HS256", "secret")
+
+    assert store.jwks() == {"keys": []}
+    assert store.signing_key() == (None, "secret")
+
+
+def test_asymmetric_store_requires_keys():
+    with pytest.raises(RuntimeError):
+        KeyStore("RS256", "unused", {})
+
+
+@pytest.mark.asyncio
+async def test_jwks_endpoint_publishes_public_keys():
+    store = KeyStore("RS256", "unused", {"2026-01": OLD_KEY})
+    app.dependency_overrides[get_jwt_manager] = lambda: JWTManager(keys=store)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/.well-known/jwks.json")
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    [key] = response.json()["keys"]
+    assert key["kid"] == "2026-01"
+    assert key["kty"] == "RSA"
+    assert "d" not in key
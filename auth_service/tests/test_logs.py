@@ -0,0 +1,36 @@
+import io
+import json
+import logging
+from auth_service.app.core.logs import JSONFormatter, queue_pipeline
+from auth_service.app.core.tracing import tracer
+
+
+class MemoryExporter:
+    def export(self, record):
+        pass
+
+
+def test_records_are_written_off_thread_as_json_with_trace_ids(monkeypatch):
+    monkeypatch.setattr(tracer, "exporter", MemoryExporter())
+    stream = io.StringIO()
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JSONFormatter("auth_service"))
+    handler, listener = queue_pipeline(output, {})
+    logger = logging.getLogger("auth_service.app.services")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener.start()
+    try:
+        with tracer.span("POST /api/auth/register") as span:
+            logger.info("User registered: %s", "ivan@example.com")
+    finally:
+        listener.stop()
+        logger.removeHandler(handler)
+        logger.setLevel(logging.NOTSET)
+        logger.propagate = True
+
+    [record] = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert record["message"] == "User registered: ivan@example.com"
+    assert record["service"] == "auth_service"
+    assert (record["trace_id"], record["span_id"]) == (span.trace_id, span.span_id)
@@ -0,0 +1,133 @@
+import uuid
+from datetime import date
+from types import SimpleNamespace
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import AsyncMock, MagicMock
+from auth_service.app.main import app
+from auth_service.app.core.cache import InMemoryTTLCache
+from auth_service.app.core.metrics import metrics
+from auth_service.app.dependencies import get_current_user_id, get_profile_cache, get_repository, require_admin
+from auth_service.app.services import AuthService
+
+USER = SimpleNamespace(
+    id=uuid.uuid4(),
+    name="Ivan",
+    surname="Ivanov",
+    email="ivan@example.com",
+    date_of_birth=date(2000, 1, 1),
+    password="hash"
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_service(repository, cache) -> AuthService:
+    password_manager = MagicMock()
+    password_manager.hash.return_value = "hash"
+    return AuthService(repository, password_manager, MagicMock(), profile_cache=cache)
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_the_ttl():
+    clock = FakeClock()
+    cache = InMemoryTTLCache(max_size=10, ttl=60, clock=clock)
+    await cache.set("a", "profile")
+
+    clock.now = 59
+    assert await cache.get("a") == "profile"
+    clock.now = 60
+    assert await cache.get("a") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entries_are_dropped_when_full():
+    cache = InMemoryTTLCache(max_size=2, ttl=60)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.get("a")
+    await cache.set("c", 3)
+
+    assert [await cache.get(key) for key in "abc"] == [1, None, 3]
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_disables_the_cache():
+    cache = InMemoryTTLCache(max_size=10, ttl=0)
+    await cache.set("a", 1)
+
+    assert await cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_repeated_reads_are_served_from_the_cache():
+    metrics.reset()
+    repository = AsyncMock()
+    repository.get_by_id.return_value = USER
+    service = make_service(repository, InMemoryTTLCache(max_size=10, ttl=60))
+
+    first = await service.get_profile(USER.id)
+    second = await service.get_profile(USER.id)
+
+    assert first == second
+    repository.get_by_id.assert_awaited_once_with(user_id=USER.id)
+    [hits] = [m for m in metrics.snapshot() if m["name"] == "profile_cache_hit"]
+    assert (hits["count"], hits["mean"]) == (2, 0.5)
+
+
+@pytest.mark.asyncio
+async def test_missing_users_are_not_cached():
+    repository = AsyncMock()
+    repository.get_by_id.return_value = None
+    cache = InMemoryTTLCache(max_size=10, ttl=60)
+    service = make_service(repository, cache)
+
+    with pytest.raises(ValueError):
+        await service.get_profile(USER.id)
+
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_invalidated_profiles_are_read_again():
+    repository = AsyncMock()
+    repository.get_by_id.return_value = USER
+    service = make_service(repository, InMemoryTTLCache(max_size=10, ttl=60))
+    await service.get_profile(USER.id)
+
+    await service.invalidate_profile(USER.id)
+    await service.get_profile(USER.id)
+
+    assert repository.get_by_id.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_me_reports_the_hit_ratio_on_metrics():
+    metrics.reset()
+    repository = AsyncMock()
+    repository.get_by_id.return_value = USER
+    cache = InMemoryTTLCache(max_size=10, ttl=60)
+    app.dependency_overrides[get_current_user_id] = lambda: USER.id
+    app.dependency_overrides[get_repository] = lambda: repository
+    app.dependency_overrides[get_profile_cache] = lambda: cache
+    app.dependency_overrides[require_admin] = lambda: None
+
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            responses = [await ac.get("api/auth/me") for _ in range(4)]
+            snapshot = (await ac.get("/metrics")).json()["metrics"]
+    finally:
+        app.dependency_overrides.clear()
+
+    assert {response.json()["email"] for response in responses} == {"ivan@example.com"}
+    repository.get_by_id.assert_awaited_once()
+    [hits] = [m for m in snapshot if m["name"] == "profile_cache_hit"]
+    assert (hits["count"], hits["mean"]) == (4, 0.75)
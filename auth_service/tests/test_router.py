@@ -1,7 +1,13 @@
+import uuid
+from datetime import date
+from types import SimpleNamespace
 import pytest
 from httpx import AsyncClient, ASGITransport
 from unittest.mock import patch, AsyncMock
 from auth_service.app.main import app
+from auth_service.app.core.throttling import LoginThrottledError
+from auth_service.app.dependencies import get_current_user_id, get_repository
+from auth_service.app.schemas import TokenResponse, UserResponse
 
 
 @pytest.mark.asyncio
@@ -9,7 +15,7 @@ async def test_login_success():
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         with patch("auth_service.app.services.AuthService.authenticate", new_callable=AsyncMock) as mocked_auth:
-            mocked_auth.return_value = "fake-token"
+            mocked_auth.return_value = TokenResponse(access_token="fake-token", refresh_token="fake-refresh")
 
             response = await ac.post("api/auth/login", json={
                 "email": "test@example.com",
@@ -18,6 +24,7 @@ async def test_login_success():
 
             assert response.status_code == 200
             assert response.json()["access_token"] == "fake-token"
+            assert response.json()["refresh_token"] == "fake-refresh"
 
 
 @pytest.mark.asyncio
@@ -134,3 +141,53 @@ async def test_signup_invalid_date_format():
         })
 
         assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_login_rate_limited():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        path = "auth_service.app.services.AuthService.authenticate"
+        with patch(path, new_callable=AsyncMock) as mocked_auth:
+            mocked_auth.side_effect = LoginThrottledError("Too many login attempts for this account", 2.5)
+
+            response = await ac.post("api/auth/login", json={
+                "email": "test@example.com",
+                "password": "password123"
+            })
+
+            assert response.status_code == 429
+            assert response.headers["retry-after"] == "3"
+            assert response.json()["detail"]["error"] == "Rate Limit"
+
+
+@pytest.mark.asyncio
+async def test_me_returns_stored_profile():
+    user = SimpleNamespace(
+        id=uuid.UUID("550e8400-e29b-41d4-a716-446655440000"),
+        name="Ivan",
+        surname="Ivanov",
+        email="ivan@example.com",
+        date_of_birth=date(2000, 1, 1),
+        password="hash"
+    )
+    repository = AsyncMock()
+    repository.get_by_id.return_value = user
+    app.dependency_overrides[get_current_user_id] = lambda: user.id
+    app.dependency_overrides[get_repository] = lambda: repository
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("api/auth/me")
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": "550e8400-e29b-41d4-a716-446655440000",
+        "name": "Ivan",
+        "surname": "Ivanov",
+        "email": "ivan@example.com",
+        "date_of_birth": "2000-01-01"
+    }
+    assert UserResponse.from_user(user) == UserResponse.model_validate(user)
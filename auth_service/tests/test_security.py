@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import uuid
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from auth_service.app.core.security import PasswordManager, run_password_hashing
+from auth_service.app.schemas import UserAuth
+from auth_service.app.services import AuthService
+
+FAST_PARAMS = {"time_cost": 1, "memory_cost": 1024, "parallelism": 1}
+
+
+def test_verify_and_update_rehashes_outdated_parameters():
+    old_hash = PasswordManager(**FAST_PARAMS).hash("password123")
+    upgraded = PasswordManager(**{**FAST_PARAMS, "time_cost": 2})
+
+    is_valid, new_hash = upgraded.verify_and_update("password123", old_hash)
+
+    assert is_valid
+    assert "t=2" in new_hash
+    assert upgraded.verify_and_update("password123", new_hash) == (True, None)
+
+
+@pytest.mark.asyncio
+async def test_hashes_run_concurrently_off_the_event_loop():
+    manager = PasswordManager(**FAST_PARAMS)
+    threads = set()
+
+    def verify(password, hashed_password):
+        threads.add(threading.current_thread().name)
+        return manager.verify(password, hashed_password)
+
+    stored = await run_password_hashing(manager.hash, "password123")
+    results = await asyncio.gather(*(run_password_hashing(verify, "password123", stored) for _ in range(4)))
+
+    assert results == [True] * 4
+    assert threads and all(name.startswith("argon2") for name in threads)
+    assert threading.main_thread().name not in threads
+
+
+@pytest.mark.asyncio
+async def test_authenticate_upgrades_hash_in_background():
+    user = MagicMock(
+        id=uuid.uuid4(),
+        email="ivan@example.com",
+        password=PasswordManager(**FAST_PARAMS).hash("password123"),
+    )
+    user.name, user.surname = "Ivan", "Ivanov"
+    user.date_of_birth = "2000-01-01"
+    repository = MagicMock()
+    repository.get_by_email = AsyncMock(return_value=user)
+    jwt_manager = MagicMock()
+    jwt_manager.create_token.return_value = "token"
+    service = AuthService(repository, PasswordManager(**{**FAST_PARAMS, "time_cost": 2}), jwt_manager)
+
+    with patch("auth_service.app.services.store_upgraded_hash", new_callable=AsyncMock) as mocked_store:
+        tokens = await service.authenticate(UserAuth(email=user.email, password="password123"))
+        await asyncio.sleep(0)
+
+    assert tokens.access_token == "token"
+    mocked_store.assert_awaited_once()
+    assert mocked_store.await_args.args[0] == user.id
+    assert "t=2" in mocked_store.await_args.args[1]
@@ -0,0 +1,36 @@
+import pytest
+from auth_service.app.core.config import settings
+from auth_service.app.server import UvicornWorker, server_options
+
+
+def test_options_run_a_single_preloaded_worker_by_default():
+    options = server_options()
+
+    assert options["workers"] == 1
+    assert options["max_requests"] == 0
+    assert options["bind"] == f"{settings.SERVER_HOST}:8001"
+    assert options["preload_app"] is True
+    assert options["worker_class"] is UvicornWorker
+    assert UvicornWorker.CONFIG_KWARGS["loop"] == "uvloop"
+    assert UvicornWorker.CONFIG_KWARGS["http"] == "httptools"
+
+
+@pytest.mark.parametrize("workers, max_requests", [(3, 0), (1, 500)])
+def test_several_workers_or_recycling_are_refused_with_per_process_security_state(monkeypatch, workers, max_requests):
+    monkeypatch.setattr(settings, "SERVER_WORKERS", workers)
+    monkeypatch.setattr(settings, "SERVER_MAX_REQUESTS", max_requests)
+
+    with pytest.raises(ValueError, match="per process"):
+        server_options()
+
+
+def test_several_workers_are_allowed_once_security_state_is_shared(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 3)
+    monkeypatch.setattr(settings, "SERVER_MAX_REQUESTS", 500)
+    monkeypatch.setattr("auth_service.app.server.process_local_security_state", lambda: [])
+
+    options = server_options()
+
+    assert options["workers"] == 3
+    assert options["max_requests"] == 500
+    assert options["max_requests_jitter"] == settings.SERVER_MAX_REQUESTS_JITTER
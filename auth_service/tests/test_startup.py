@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+
+# Cumulative `import app.main` time as reported by `python -X importtime` (best of RUNS).
+# Wall-clock budgets are flaky on shared CI machines, so the check is opt-in: set IMPORT_TIME_BUDGET_MS
+# (about 1300 ms on a developer machine) to run it.
+IMPORT_TIME_BUDGET_MS = os.getenv("IMPORT_TIME_BUDGET_MS")
+RUNS = 3
+
+# Heavy packages that must only be loaded on first use (password hashing).
+DEFERRED_MODULES = ("passlib", "argon2")
+
+
+def import_profile() -> dict[str, tuple[int, int]]:
+    """Imports the app in a fresh interpreter and returns {module: (self_us, cumulative_us)}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=SERVICE_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PATH": ""},
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        profile[module.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def test_heavy_dependencies_are_not_imported_at_startup():
+    loaded = import_profile()
+
+    assert [name for name in loaded if name.split(".")[0] in DEFERRED_MODULES] == []
+
+
+@pytest.mark.skipif(IMPORT_TIME_BUDGET_MS is None, reason="set IMPORT_TIME_BUDGET_MS to check the import time")
+def test_import_time_within_budget():
+    budget_ms = float(IMPORT_TIME_BUDGET_MS)
+    profiles = [import_profile() for _ in range(RUNS)]
+    best = min(profiles, key=lambda profile: profile["app.main"][1])
+    total_ms = best["app.main"][1] / 1000
+    slowest = sorted(best.items(), key=lambda item: item[1][0], reverse=True)[:10]
+    report = "\n".join(f"{self_us / 1000:8.1f} ms  {name}" for name, (self_us, _) in slowest)
+    print(f"\nimport app.main: {total_ms:.1f} ms (budget {budget_ms:.0f} ms)\n{report}")
+
+    assert total_ms <= budget_ms, f"Import time over budget, slowest modules:\n{report}"
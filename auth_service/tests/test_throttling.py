@@ -0,0 +1,99 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from auth_service.app.core.metrics import metrics
+from auth_service.app.core.throttling import (
+    InMemoryNegativeCache,
+    LoginGuard,
+    LoginThrottledError,
+    RateLimiter,
+)
+from auth_service.app.schemas import UserAuth
+from auth_service.app.services import AuthService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_guard(clock: FakeClock) -> LoginGuard:
+    return LoginGuard(
+        negative_cache=InMemoryNegativeCache(max_size=2, ttl_seconds=10, clock=clock),
+        ip_limiter=RateLimiter(capacity=3, per_minute=60, max_keys=10, clock=clock),
+        email_limiter=RateLimiter(capacity=2, per_minute=6, max_keys=10, clock=clock),
+    )
+
+
+def test_rate_limiter_refills_over_time():
+    clock = FakeClock()
+    limiter = RateLimiter(capacity=2, per_minute=60, max_keys=10, clock=clock)
+
+    assert limiter.hit("1.2.3.4") == 0
+    assert limiter.hit("1.2.3.4") == 0
+    assert limiter.hit("1.2.3.4") == pytest.approx(1.0)
+
+    clock.now = 1.0
+    assert limiter.hit("1.2.3.4") == 0
+
+
+def test_rate_limiter_is_bounded():
+    limiter = RateLimiter(capacity=1, per_minute=60, max_keys=2, clock=FakeClock())
+    for key in ("a", "b", "c"):
+        limiter.hit(key)
+
+    assert len(limiter) == 2
+
+
+def test_negative_cache_expires_and_evicts():
+    clock = FakeClock()
+    cache = InMemoryNegativeCache(max_size=2, ttl_seconds=10, clock=clock)
+    cache.add("a@example.com")
+    cache.add("b@example.com")
+    cache.add("c@example.com")
+
+    assert not cache.contains("a@example.com")
+    assert cache.contains("c@example.com")
+
+    clock.now = 10
+    assert not cache.contains("c@example.com")
+
+
+def guard_checks() -> dict:
+    return {m["labels"]["outcome"]: m["count"] for m in metrics.snapshot() if m["name"] == "login_guard_checks"}
+
+
+def test_guard_rejects_email_over_limit():
+    metrics.reset()
+    guard = make_guard(FakeClock())
+    guard.check("user@example.com", "10.0.0.1")
+    guard.check("user@example.com", "10.0.0.2")
+
+    with pytest.raises(LoginThrottledError) as exc_info:
+        guard.check("user@example.com", "10.0.0.3")
+
+    assert exc_info.value.retry_after > 0
+    assert guard_checks() == {"passed": 2, "rejected_email": 1}
+
+
+@pytest.mark.asyncio
+async def test_authenticate_skips_db_for_cached_miss():
+    metrics.reset()
+    guard = make_guard(FakeClock())
+    repository = MagicMock()
+    repository.get_by_email = AsyncMock(return_value=None)
+    password_manager = MagicMock()
+    service = AuthService(repository, password_manager, MagicMock(), login_guard=guard)
+    auth_data = UserAuth(email="ghost@example.com", password="password123")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await service.authenticate(auth_data, client_ip="10.0.0.1")
+
+    assert repository.get_by_email.await_count == 1
+    password_manager.verify_and_update.assert_not_called()
+    assert guard_checks() == {"passed": 1, "negative_hit": 1}
+    [unknown] = [m for m in metrics.snapshot() if m["name"] == "login_unknown_emails"]
+    assert unknown["count"] == 1
@@ -0,0 +1,132 @@
+import time
+import uuid
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import AsyncMock, MagicMock, patch
+from auth_service.app.main import app
+from auth_service.app.core.keys import KeyStore
+from auth_service.app.core.revocation import InMemoryRevocationStore, RevocationStoreFullError
+from auth_service.app.core.security import JWTManager
+from auth_service.app.dependencies import get_current_user_id
+from auth_service.app.services import AuthService
+
+USER_ID = "550e8400-e29b-41d4-a716-446655440000"
+
+
+def make_service() -> AuthService:
+    jwt_manager = JWTManager(keys=KeyStore("HS256", "test-secret"))
+    return AuthService(
+        repository=MagicMock(),
+        password_manager=MagicMock(),
+        jwt_manager=jwt_manager,
+        revocation_store=InMemoryRevocationStore(max_size=100)
+    )
+
+
+def test_access_token_is_compact():
+    service = make_service()
+    tokens = service._issue_tokens(user_id=USER_ID, family="f1")
+
+    claims = service.jwt_manager.decode_token(tokens.access_token)
+
+    assert set(claims) == {"sub", "type", "iat", "exp"}
+    assert claims["sub"] == USER_ID
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_and_detects_reuse():
+    service = make_service()
+    first = service._issue_tokens(user_id=USER_ID, family="f1")
+
+    second = await service.refresh(first.refresh_token)
+    assert service.jwt_manager.decode_token(second.access_token)["sub"] == USER_ID
+
+    with pytest.raises(ValueError, match="revoked"):
+        await service.refresh(first.refresh_token)
+
+    # Reuse revokes the whole session, including the legitimately rotated token
+    with pytest.raises(ValueError, match="revoked"):
+        await service.refresh(second.refresh_token)
+
+
+@pytest.mark.asyncio
+async def test_refresh_fails_closed_when_the_revocation_store_is_full():
+    service = make_service()
+    service.revocation_store.max_size = 1
+    await service.refresh(service._issue_tokens(user_id=USER_ID, family="f1").refresh_token)
+    other = service._issue_tokens(user_id=USER_ID, family="f2")
+
+    with pytest.raises(ValueError, match="log in again"):
+        await service.refresh(other.refresh_token)
+    assert not service.revocation_store.is_family_revoked("f2")
+
+
+@pytest.mark.asyncio
+async def test_refresh_rejects_tokens_issued_before_the_store_started():
+    service = make_service()
+    tokens = service._issue_tokens(user_id=USER_ID, family="f1")
+    service.revocation_store = InMemoryRevocationStore(max_size=100, clock=lambda: time.time() + 5)
+
+    with pytest.raises(ValueError, match="predates"):
+        await service.refresh(tokens.refresh_token)
+
+
+def test_used_tokens_are_kept_until_they_expire():
+    now = [1000.0]
+    store = InMemoryRevocationStore(max_size=2, clock=lambda: now[0])
+    assert store.consume("late", expires_at=2000)
+    assert store.consume("early", expires_at=1500)
+
+    with pytest.raises(RevocationStoreFullError):
+        store.consume("third", expires_at=3000)
+    assert not store.consume("late", expires_at=2000)
+
+    now[0] = 1500
+    assert store.consume("third", expires_at=3000)
+    assert not store.consume("late", expires_at=2000)
+    assert len(store) == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_rejects_access_tokens():
+    service = make_service()
+    tokens = service._issue_tokens(user_id=USER_ID, family="f1")
+
+    with pytest.raises(ValueError, match="Invalid refresh token"):
+        await service.refresh(tokens.access_token)
+    with pytest.raises(ValueError, match="Invalid refresh token"):
+        await service.refresh("garbage")
+
+
+@pytest.mark.asyncio
+async def test_me_returns_profile_with_cache_headers():
+    app.dependency_overrides[get_current_user_id] = lambda: uuid.UUID(USER_ID)
+    profile = {
+        "id": USER_ID,
+        "name": "Ivan",
+        "surname": "Ivanov",
+        "email": "ivan@example.com",
+        "date_of_birth": "2000-01-01"
+    }
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        path = "auth_service.app.services.AuthService.get_profile"
+        with patch(path, new_callable=AsyncMock) as mocked_profile:
+            mocked_profile.return_value = profile
+            response = await ac.get("api/auth/me")
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.json()["email"] == "ivan@example.com"
+    assert response.headers["cache-control"].startswith("private, max-age=")
+
+
+@pytest.mark.asyncio
+async def test_me_requires_token():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("api/auth/me")
+
+    assert response.status_code == 401
@@ -0,0 +1,89 @@
+import uuid
+import pytest
+from httpx import AsyncClient, ASGITransport
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy import create_engine, text
+from auth_service.app.main import app
+from auth_service.app.core.security import PasswordManager
+from auth_service.app.core.tracing import tracer
+from auth_service.app.database import trace_queries
+from auth_service.app.dependencies import get_password_manager, get_repository
+
+FAST_PARAMS = {"time_cost": 1, "memory_cost": 1024, "parallelism": 1}
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+class MemoryExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, record):
+        self.spans.append(record)
+
+    def named(self, name):
+        return [span for span in self.spans if span["name"] == name]
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = MemoryExporter()
+    monkeypatch.setattr(tracer, "exporter", exporter)
+    return exporter
+
+
+@pytest.mark.asyncio
+async def test_login_spans_continue_the_callers_trace(exporter):
+    password_manager = PasswordManager(**FAST_PARAMS)
+    user = SimpleNamespace(id=uuid.uuid4(), password=password_manager.hash("password123"))
+    repository = MagicMock()
+    repository.get_by_email = AsyncMock(return_value=user)
+    app.dependency_overrides[get_repository] = lambda: repository
+    app.dependency_overrides[get_password_manager] = lambda: password_manager
+    exporter.spans.clear()
+
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.post(
+                "api/auth/login",
+                json={"email": "ivan@example.com", "password": "password123"},
+                headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"}
+            )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    [request] = exporter.named("POST /api/auth/login")
+    assert (request["trace_id"], request["parent_span_id"]) == (TRACE_ID, PARENT_ID)
+    assert request["attributes"]["http.status_code"] == 200
+
+    [verify] = exporter.named("argon2.verify")
+    encodes = exporter.named("jwt.encode")
+    assert len(encodes) == 2
+    for span in [verify, *encodes]:
+        assert span["trace_id"] == TRACE_ID
+        assert span["parent_span_id"] == request["span_id"]
+
+
+def test_queries_are_recorded_as_child_spans(exporter):
+    engine = create_engine("sqlite://")
+    trace_queries(engine)
+
+    with tracer.span("GET /api/auth/me") as parent:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    [query] = exporter.named("db.query")
+    assert query["parent_span_id"] == parent.span_id
+    assert query["attributes"] == {"db.system": "sqlite", "db.statement": "SELECT 1"}
+    assert query["end_time_unix_nano"] >= query["start_time_unix_nano"]
+
+
+def test_disabled_tracer_exports_nothing():
+    with tracer.span("argon2.hash") as span:
+        span.set_attribute("ignored", True)
+
+    assert span.traceparent is None
+    assert tracer.current_traceparent() is None
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+
+from .config import settings
+from .metrics import metrics
+
+if TYPE_CHECKING:
+    import aioboto3
+    from aiobotocore.config import AioConfig
+    from aiohttp import TraceConfig
+
+logger = logging.getLogger(__name__)
+
+
+def _trace_config(service: str) -> "TraceConfig":
+    """
+    aiohttp hooks reporting, per AWS service:
+    - aws_pool_wait_seconds: time a request waited for a free pooled connection (only when the pool was exhausted);
+    - aws_connect_seconds: time to open a new connection (TCP and TLS);
+    - aws_connection_reused: 1 for a reused keep-alive connection, 0 for a new one (the mean is the reuse ratio).
+    """
+    from aiohttp import TraceConfig
+
+    trace = TraceConfig()
+
+    async def on_queued_start(session, context, params):
+        context.queued_at = time.perf_counter()
+
+    async def on_queued_end(session, context, params):
+        metrics.observe("aws_pool_wait_seconds", time.perf_counter() - context.queued_at, service=service)
+
+    async def on_create_start(session, context, params):
+        context.connect_at = time.perf_counter()
+
+    async def on_create_end(session, context, params):
+        metrics.observe("aws_connect_seconds", time.perf_counter() - context.connect_at, service=service)
+        metrics.observe("aws_connection_reused", 0, service=service)
+
+    async def on_reuse(session, context, params):
+        metrics.observe("aws_connection_reused", 1, service=service)
+
+    trace.on_connection_queued_start.append(on_queued_start)
+    trace.on_connection_queued_end.append(on_queued_end)
+    trace.on_connection_create_start.append(on_create_start)
+    trace.on_connection_create_end.append(on_create_end)
+    trace.on_connection_reuseconn.append(on_reuse)
+    return trace
+
+
+def _traced_http_session(service: str, **kwargs):
+    """
+    aiobotocore's HTTP session with connection metrics. Mirrors AIOHTTPSession._get_session
+    (aiobotocore is pinned through aioboto3), adding the trace config to the aiohttp session.
+    """
+    import aiohttp
+    from aiobotocore.httpsession import AIOHTTPSession
+
+    class TracedHTTPSession(AIOHTTPSession):
+        async def _get_session(self, proxy_url):
+            if not (session := self._sessions.get(proxy_url)):
+                session = self._sessions[proxy_url] = await self._exit_stack.enter_async_context(
+                    aiohttp.ClientSession(
+                        connector=self._create_connector(proxy_url),
+                        timeout=self._timeout,
+                        skip_auto_headers={"CONTENT-TYPE"},
+                        auto_decompress=False,
+                        trace_configs=[_trace_config(service)],
+                    )
+                )
+            return session
+
+    return TracedHTTPSession(**kwargs)
+
+
+class AWSClients:
+    """
+    Process-wide aioboto3 session and long-lived service clients.
+
+    Creating a client resolves endpoints and credentials and opens a new connection
+    pool, so clients are created once per service and endpoint and reused by every
+    request (API) or message (worker) until close(). Pools are sized by
+    AWS_MAX_POOL_CONNECTIONS, keep connections alive between calls and retry
+    throttled or failed calls in botocore's adaptive mode, which also rate-limits
+    the client when AWS throttles.
+
+    Clients belong to the event loop they were created on: close() them when the
+    loop ends (application lifespan, worker shutdown).
+    """
+
+    def __init__(self):
+        self._session: "aioboto3.Session | None" = None
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        self._stack = AsyncExitStack()
+        self._lock = asyncio.Lock()
+
+    @property
+    def session(self) -> "aioboto3.Session":
+        """The shared session; the SDK is imported on first use."""
+        if self._session is None:
+            import aioboto3
+
+            self._session = aioboto3.Session()
+        return self._session
+
+    @staticmethod
+    def config(service: str) -> "AioConfig":
+        """Client configuration with tuned pool, timeouts and retries."""
+        from aiobotocore.config import AioConfig
+
+        return AioConfig(
+            max_pool_connections=settings.AWS_MAX_POOL_CONNECTIONS,
+            connect_timeout=settings.AWS_CONNECT_TIMEOUT,
+            read_timeout=settings.AWS_READ_TIMEOUT,
+            retries={"mode": "adaptive", "max_attempts": settings.AWS_MAX_ATTEMPTS},
+            connector_args={"keepalive_timeout": settings.AWS_KEEPALIVE_TIMEOUT},
+            http_session_cls=partial(_traced_http_session, service),
+        )
+
+    async def client(self, service: str, endpoint_url: str | None = None):
+        """Returns the shared client for a service, creating it on first use."""
+        key = (service, endpoint_url or settings.AWS_ENDPOINT_URL)
+        client = self._clients.get(key)
+        if client is None:
+            async with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = await self._stack.enter_async_context(self.session.client(
+                        service,
+                        endpoint_url=key[1],
+                        region_name=settings.AWS_DEFAULT_REGION,
+                        config=self.config(service)
+                    ))
+                    self._clients[key] = client
+                    logger.info("AWS %s client created for %s", service, key[1])
+        return client
+
+    async def close(self) -> None:
+        """Closes every client and its connection pool; later calls create new clients."""
+        self._clients.clear()
+        stack, self._stack = self._stack, AsyncExitStack()
+        await stack.aclose()
+
+
+aws_clients = AWSClients()
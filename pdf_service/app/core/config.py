@@ -1,3 +1,5 @@
+from typing import Dict
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -26,6 +28,23 @@ class Settings(BaseSettings):
         description="Default AWS region for SQS and S3 services."
     )
 
+    # --- AWS Clients ---
+    AWS_MAX_POOL_CONNECTIONS: int = Field(
+        default=50,
+        description="Connection pool size per AWS client (botocore's default is 10).")
+    AWS_KEEPALIVE_TIMEOUT: float = Field(
+        default=30.0,
+        description="Seconds idle pooled connections are kept open for reuse.")
+    AWS_CONNECT_TIMEOUT: float = Field(
+        default=5.0,
+        description="Seconds to establish a connection to AWS.")
+    AWS_READ_TIMEOUT: float = Field(
+        default=30.0,
+        description="Seconds to wait for an AWS response; must exceed the SQS long-poll wait (10s).")
+    AWS_MAX_ATTEMPTS: int = Field(
+        default=5,
+        description="Attempts per AWS call, retried in botocore's adaptive mode (client-side rate limiting).")
+
     SQS_QUEUE_NAME: str = Field(
         default="pdf-tasks",
         description="Name of the SQS queue for PDF generation tasks."
@@ -35,6 +54,110 @@ class Settings(BaseSettings):
         description="Name of the S3 bucket where generated PDFs are stored."
     )
 
+    # --- Async Jobs ---
+    JOB_STORE_BACKEND: str = Field(
+        default="s3",
+        description="Where job state is kept: 's3' (shared by API and worker) or 'memory' (single process only).")
+    JOB_STATUS_PREFIX: str = Field(
+        default="jobs/",
+        description="S3 key prefix for job status objects.")
+    PRESIGNED_URL_EXPIRE_SECONDS: int = Field(
+        default=900,
+        description="Lifetime of presigned download URLs for completed jobs.")
+    S3_PUBLIC_ENDPOINT_URL: str | None = Field(
+        default=None,
+        description="Endpoint used in presigned URLs when clients reach S3 via another host, e.g. http://localhost:4566.")
+
+    # --- Worker Scheduling ---
+    WORKER_RENDER_CONCURRENCY: int = Field(
+        default=2,
+        gt=0,
+        description="Jobs the worker renders and uploads at the same time.")
+    WORKER_BUFFER_SIZE: int = Field(
+        default=20,
+        gt=0,
+        description="Received messages the worker buffers for scheduling. Their visibility timeout is "
+                    "extended while they wait, so a large buffer only delays other workers.")
+    WORKER_INTERACTIVE_BURST: int = Field(
+        default=4,
+        description="Interactive jobs dispatched in a row before a waiting bulk job gets a turn.")
+    WORKER_SHUTDOWN_TIMEOUT: float = Field(
+        default=20.0,
+        description="Seconds the worker may take to shut down after SIGTERM: in-flight jobs finish or are "
+                    "released back to the queue and acks are flushed. Keep below the container stop grace period.")
+    WORKER_ACK_INTERVAL: float = Field(
+        default=1.0,
+        description="Seconds between batched deletes of processed messages.")
+    WORKER_VISIBILITY_TIMEOUT: int = Field(
+        default=30,
+        ge=1,
+        le=43200,
+        description="Seconds a received message stays hidden from other consumers (requested on every receive). "
+                    "Buffered and in-flight messages are extended every third of it; background upload "
+                    "retries must end within it.")
+    WORKER_MAX_RECEIVES: int = Field(
+        default=5,
+        description="Deliveries of a failing message before its job is marked failed and the message deleted; "
+                    "earlier failures keep the job queued for redelivery.")
+
+    # --- Render Spool ---
+    SPOOL_DIR: str | None = Field(
+        default=None,
+        description="Directory where the worker keeps rendered PDFs until they are uploaded, so failed "
+                    "uploads and redelivered messages reuse them instead of rendering again. Unset disables the spool.")
+    SPOOL_MAX_BYTES: int = Field(
+        default=512 * 1024 * 1024,
+        description="Disk space of the spool; least recently used documents are evicted beyond it.")
+    SPOOL_MAX_AGE_SECONDS: float = Field(
+        default=3600.0,
+        description="Spooled documents unused for longer are evicted. Keep above the queue's visibility timeout.")
+    SPOOL_UPLOAD_ATTEMPTS: int = Field(
+        default=5,
+        description="Background upload retries of a spooled document before the message is left for "
+                    "redelivery. Retries also stop when they would outlast WORKER_VISIBILITY_TIMEOUT.")
+    SPOOL_RETRY_BACKOFF_SECONDS: float = Field(
+        default=1.0,
+        description="Delay before the first background upload retry; doubled after every failure.")
+    SPOOL_RETRY_BACKOFF_MAX_SECONDS: float = Field(
+        default=8.0,
+        description="Upper bound of the delay between background upload retries.")
+
+    # --- PDF Rendering ---
+    PDF_WARMUP: str = Field(
+        default="lifespan",
+        description="When to warm up the renderer: 'lifespan' (app/worker startup), "
+                    "'import' (at module import, before a preloading server forks) or 'off'.")
+    PDF_TEMPLATES_DIR: str | None = Field(
+        default=None,
+        description="Directory with JSON document templates; the templates bundled with the service if unset.")
+    PDF_RENDERER: str = Field(
+        default="canvas",
+        description="'canvas' replays recorded fixed layouts directly on a canvas (falls back to Platypus "
+                    "when a value does not fit); 'platypus' always uses flow layout.")
+    PDF_DEFAULT_TEMPLATE: str = Field(
+        default="profile",
+        description="Template used when a request does not name one.")
+
+    # --- PDF Output Profile ---
+    PDF_PAGE_COMPRESSION: bool = Field(
+        default=True,
+        description="Flate-compress page content streams (smaller files, more CPU).")
+    PDF_STREAM_ENCODING: str = Field(
+        default="binary",
+        description="'binary' or 'ascii85' (7-bit safe, about 25% larger compressed streams).")
+    PDF_FONTS: str = Field(
+        default="standard",
+        description="'standard' PDF fonts (not embedded, Latin-1 only) or 'embedded' TrueType fonts (subset).")
+    PDF_EMBEDDED_FONTS: str = Field(
+        default="Vera.ttf,VeraBd.ttf,VeraIt.ttf,VeraBI.ttf",
+        description="Regular, bold, italic and bold-italic TrueType files used when PDF_FONTS=embedded.")
+
+    # --- PDF Delivery ---
+    PDF_STREAM_CHUNK_SIZE: int = Field(
+        default=64 * 1024,
+        gt=0,
+        description="Size in bytes of the chunks used to stream PDF downloads.")
+
     # --- JWT Authentication Settings ---
     SECRET_KEY: str = Field(
         default="SECRET_KEY",
@@ -42,6 +165,94 @@ class Settings(BaseSettings):
     ALGORITHM: str = Field(
         default="HS256",
         description="Algorithm used for JWT encryption")
+    JWT_CODEC: str = Field(
+        default="auto",
+        description="JWT backend: 'hmac' (fast HS* path), 'jose', or 'auto' to pick by algorithm")
+    JWKS_URL: str = Field(
+        default="http://auth_service:8001/.well-known/jwks.json",
+        description="Auth service JWKS endpoint, used for asymmetric algorithms (RS256, ES256, ...)")
+    JWKS_CACHE_TTL_SECONDS: float = Field(
+        default=300.0,
+        description="How long fetched JWKS keys are trusted before being refreshed")
+    JWKS_MIN_REFRESH_INTERVAL_SECONDS: float = Field(
+        default=30.0,
+        description="Minimum delay between JWKS fetches triggered by unknown key ids")
+    JWKS_FETCH_TIMEOUT_SECONDS: float = Field(
+        default=3.0,
+        description="Timeout for fetching the JWKS document")
+
+    # --- Auth Service Profile Lookup ---
+    AUTH_SERVICE_URL: str = Field(
+        default="http://auth_service:8001",
+        description="Base URL of the auth service, used to fetch profiles for compact access tokens")
+    PROFILE_CACHE_TTL_SECONDS: float = Field(
+        default=300.0,
+        description="How long a fetched user profile is reused")
+    PROFILE_CACHE_MAX_SIZE: int = Field(
+        default=10_000,
+        description="Maximum number of cached user profiles per process")
+    PROFILE_FETCH_TIMEOUT_SECONDS: float = Field(
+        default=3.0,
+        description="Timeout for fetching a user profile")
+
+    # --- Ops ---
+    ADMIN_API_KEY: str | None = Field(
+        default=None,
+        description="Key expected in the X-Admin-Key header of /metrics requests; /metrics is disabled if unset.")
+
+    # --- Production Server (python -m app.server) ---
+    SERVER_HOST: str = Field(
+        default="0.0.0.0",
+        description="Address the production server binds to.")
+    SERVER_PORT: int = Field(
+        default=8002,
+        description="Port the production server binds to.")
+    SERVER_WORKERS: int = Field(
+        default=0,
+        ge=0,
+        description="Worker processes; 0 starts one per available CPU (affinity and cgroup quota aware).")
+    SERVER_MAX_REQUESTS: int = Field(
+        default=10_000,
+        ge=0,
+        description="Requests after which a worker is replaced, capping memory growth; 0 disables recycling.")
+    SERVER_MAX_REQUESTS_JITTER: int = Field(
+        default=1_000,
+        ge=0,
+        description="Random extra requests per worker, so workers are not all recycled at once.")
+    SERVER_TIMEOUT: int = Field(
+        default=60,
+        gt=0,
+        description="Seconds a worker may stay unresponsive before it is killed and replaced.")
+    SERVER_GRACEFUL_TIMEOUT: int = Field(
+        default=30,
+        gt=0,
+        description="Seconds workers get to finish in-flight requests on shutdown or recycling.")
+    SERVER_KEEPALIVE: int = Field(
+        default=5,
+        ge=0,
+        description="Seconds an idle keep-alive connection is held open.")
+
+    # --- Tracing ---
+    TRACING_SERVICE_NAME: str = Field(
+        default="pdf_service",
+        description="Service name recorded on every span.")
+    TRACING_EXPORTER: str = Field(
+        default="off",
+        description="Where finished spans are written: 'off', 'console' (JSON lines on stderr) or 'file'.")
+    TRACING_FILE: str = Field(
+        default="traces.jsonl",
+        description="JSON lines file receiving spans when TRACING_EXPORTER is 'file'.")
+
+    # --- Logging ---
+    LOG_LEVEL: str = Field(
+        default="INFO",
+        description="Minimum level of records written by the service.")
+    LOG_FORMAT: str = Field(
+        default="json",
+        description="Output format of log records: 'json' (one object per line) or 'text'.")
+    LOG_SAMPLE_RATES: Dict[str, float] = Field(
+        default={},
+        description="Share of INFO and lower records kept per logger, e.g. {\"app.worker\": 0.1}; warnings and errors are always kept.")
 
     class Config:
         """
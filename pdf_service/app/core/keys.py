@@ -0,0 +1,123 @@
+import json
+import logging
+import threading
+import time
+import urllib.request
+from typing import Any, Callable, Dict
+
+from jose import jwk
+from jose.backends.base import Key
+from jose.exceptions import JWTError
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_PREFIXES = ("RS", "PS", "ES")
+
+
+def is_asymmetric(algorithm: str) -> bool:
+    """Tells whether the JWT algorithm uses a private/public key pair."""
+    return algorithm.startswith(ASYMMETRIC_PREFIXES)
+
+
+class JWKSUnavailableError(Exception):
+    """
+    Raised when no verification keys are cached and the JWKS endpoint cannot be reached.
+    """
+
+
+class JWKSKeyResolver:
+    """
+    Resolves token verification keys by `kid` from the auth service JWKS endpoint.
+
+    Keys are parsed once per fetch and cached for a TTL. An unknown `kid`
+    (e.g. right after a key rotation) triggers an early refresh, rate-limited by
+    `min_refresh_interval`. If the endpoint is down, previously fetched keys keep working.
+    Safe to call from FastAPI's threadpool.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        algorithm: str,
+        ttl_seconds: float,
+        min_refresh_interval: float,
+        timeout: float,
+        fetcher: Callable[[], Dict[str, Any]] | None = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.jwks_url = jwks_url
+        self.algorithm = algorithm
+        self.ttl_seconds = ttl_seconds
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self.fetcher = fetcher or self._fetch
+        self.clock = clock
+
+        self._keys: Dict[str, Key] = {}
+        self._expires_at = 0.0
+        self._last_fetch: float | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "JWKSKeyResolver":
+        """Builds a resolver configured from application settings."""
+        return cls(
+            jwks_url=settings.JWKS_URL,
+            algorithm=settings.ALGORITHM,
+            ttl_seconds=settings.JWKS_CACHE_TTL_SECONDS,
+            min_refresh_interval=settings.JWKS_MIN_REFRESH_INTERVAL_SECONDS,
+            timeout=settings.JWKS_FETCH_TIMEOUT_SECONDS
+        )
+
+    def get_key(self, kid: str | None) -> Key:
+        """
+        Returns the verification key for the key id.
+
+        Raises:
+            JWTError: if the key id is not published by the auth service.
+            JWKSUnavailableError: if keys could not be fetched at all.
+        """
+        key = self._keys.get(kid)
+        if key is not None and self.clock() < self._expires_at:
+            return key
+
+        with self._lock:
+            now = self.clock()
+            key = self._keys.get(kid)
+            expired = now >= self._expires_at
+            if key is None or expired:
+                may_refresh = self._last_fetch is None or now - self._last_fetch >= self.min_refresh_interval
+                if expired or may_refresh:
+                    self._refresh(now)
+                    key = self._keys.get(kid)
+
+        if key is None:
+            raise JWTError(f"Unknown signing key: {kid}")
+        return key
+
+    def _refresh(self, now: float) -> None:
+        self._last_fetch = now
+        try:
+            document = self.fetcher()
+        except Exception as e:
+            if self._keys:
+                logger.warning("JWKS refresh failed, using cached keys: %s", e)
+                self._expires_at = now + self.min_refresh_interval
+                return
+            raise JWKSUnavailableError(f"Could not fetch JWKS from {self.jwks_url}") from e
+
+        keys = {}
+        for key_data in document.get("keys", []):
+            if key_data.get("alg", self.algorithm) != self.algorithm or "kid" not in key_data:
+                continue
+            keys[key_data["kid"]] = jwk.construct(key_data, self.algorithm)
+
+        self._keys = keys
+        self._expires_at = now + self.ttl_seconds
+        logger.info("JWKS refreshed: %s key(s)", len(keys))
+
+    def _fetch(self) -> Dict[str, Any]:
+        with urllib.request.urlopen(self.jwks_url, timeout=self.timeout) as response:
+            return json.load(response)
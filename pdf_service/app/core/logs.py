@@ -0,0 +1,164 @@
+# Shared core module: auth_service and pdf_service each carry an identical copy, since every service image
+# is built from its own directory only. Change both copies together; tests/test_shared_modules.py checks them.
+
+import atexit
+import logging
+import os
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Dict, Tuple
+
+import orjson
+
+from .config import settings
+from .tracing import current_span
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a share of INFO and lower records per logger; warnings and errors always pass.
+    A logger without its own rate uses the nearest configured parent ('app' covers 'app.worker').
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: Dict[str, float] = {}
+
+    def rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            probe = name
+            while probe not in self.rates and "." in probe:
+                probe = probe.rpartition(".")[0]
+            rate = self._resolved[name] = self.rates.get(probe, 1.0)
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class TraceContextFilter(logging.Filter):
+    """
+    Stamps records with the current trace and span ids. Runs in the calling thread,
+    before the record is queued, while the span context variable is still visible.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        span = current_span()
+        record.trace_id, record.span_id = (span.trace_id, span.span_id) if span is not None else (None, None)
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Interpolates the message in the calling thread and leaves formatting (JSON, timestamps,
+    tracebacks) to the listener thread. Arguments are rendered before the call returns, so
+    later mutations or non-thread-safe objects never reach the writer; records dropped by the
+    sampling filter never get here and are not interpolated at all.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object per line, with trace correlation when present.
+    """
+
+    def __init__(self, service: str):
+        super().__init__()
+        self.service = service
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "service": self.service,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "trace_id", None):
+            entry["trace_id"] = record.trace_id
+            entry["span_id"] = record.span_id
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode()
+
+
+def create_formatter(service: str, log_format: str) -> logging.Formatter:
+    """Builds the formatter selected by LOG_FORMAT ('json' or 'text')."""
+    if log_format == "json":
+        return JSONFormatter(service)
+    if log_format == "text":
+        return logging.Formatter(TEXT_FORMAT)
+    raise ValueError(f"Unknown log format: {log_format}")
+
+
+def queue_pipeline(output: logging.Handler, sample_rates: Dict[str, float]) -> Tuple[QueueHandler, QueueListener]:
+    """
+    A handler that only filters and enqueues records, and the listener writing them to `output`
+    from a background thread. Start the listener before logging through the handler.
+    """
+    queue = SimpleQueue()
+    handler = DeferredQueueHandler(queue)
+    handler.addFilter(SamplingFilter(sample_rates))
+    handler.addFilter(TraceContextFilter())
+    return handler, QueueListener(queue, output, respect_handler_level=True)
+
+
+_listener: QueueListener | None = None
+_listener_pid: int | None = None
+
+
+def configure_logging(service: str, background: bool = True) -> None:
+    """
+    Routes all records through the background writer configured by the LOG_* settings.
+    With background=False records are written synchronously instead, for a process that forks
+    afterwards (a gunicorn master): its writer thread would not exist in the children, which
+    would queue records nobody writes until they configure their own.
+    Idempotent per process; a forked child inherits no listener thread and gets its own.
+    """
+    global _listener, _listener_pid
+    if _listener is not None and _listener_pid == os.getpid():
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(create_formatter(service, settings.LOG_FORMAT))
+    root = logging.getLogger()
+    root.setLevel(settings.LOG_LEVEL.upper())
+    if not background:
+        output.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES))
+        output.addFilter(TraceContextFilter())
+        root.handlers = [output]
+        return
+
+    handler, listener = queue_pipeline(output, settings.LOG_SAMPLE_RATES)
+    root.handlers = [handler]
+    listener.start()
+    if _listener is None:
+        atexit.register(shutdown_logging)
+    _listener, _listener_pid = listener, os.getpid()
+
+
+def shutdown_logging() -> None:
+    """Writes out queued records and stops the writer; later records are written synchronously."""
+    global _listener, _listener_pid
+    if _listener is None or _listener_pid != os.getpid():
+        return
+    _listener.stop()
+    logging.getLogger().handlers = list(_listener.handlers)
+    _listener, _listener_pid = None, None
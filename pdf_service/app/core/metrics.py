@@ -0,0 +1,70 @@
+# Shared core module: auth_service and pdf_service each carry an identical copy, since every service image
+# is built from its own directory only. Change both copies together; tests/test_shared_modules.py checks them.
+
+import threading
+from typing import Any, Dict, List, Tuple
+
+
+class Summary:
+    """
+    Running count, sum, min and max of an observed value.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> Dict[str, float]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "max": self.max,
+        }
+
+
+class MetricsRegistry:
+    """
+    Process-local metrics, keyed by name and labels. Thread-safe.
+    Each API or worker process reports its own numbers; aggregate them in the log/metrics pipeline.
+    """
+
+    def __init__(self):
+        self._summaries: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Summary] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Records one observation of the named value."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                summary = self._summaries[key] = Summary()
+            summary.observe(value)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Returns every metric with its labels and current values."""
+        with self._lock:
+            return [
+                {"name": name, "labels": dict(labels), **summary.snapshot()}
+                for (name, labels), summary in sorted(self._summaries.items())
+            ]
+
+    def reset(self) -> None:
+        """Drops every metric (benchmarks, tests)."""
+        with self._lock:
+            self._summaries.clear()
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,117 @@
+import logging
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+from pydantic import ValidationError
+
+from .config import settings
+from .tracing import TRACEPARENT, tracer
+from ..schemas import UserFromToken
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileRejectedError(Exception):
+    """
+    Raised when the auth service refuses the token or does not know the user.
+    """
+
+
+class ProfileUnavailableError(Exception):
+    """
+    Raised when the auth service profile endpoint cannot be reached.
+    """
+
+
+class ProfileClient:
+    """
+    Fetches user profiles from the auth service `/api/auth/me` endpoint.
+
+    Access tokens only carry the user id, so profile data is looked up here and
+    kept in a bounded TTL cache keyed by user id. Profiles are validated once, when
+    fetched; cache hits return the validated model as is. Safe to call from FastAPI's threadpool.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        ttl_seconds: float,
+        max_size: int,
+        timeout: float,
+        fetcher: Callable[[str], bytes] | None = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.profile_url = f"{base_url.rstrip('/')}/api/auth/me"
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.timeout = timeout
+        self.fetcher = fetcher or self._fetch
+        self.clock = clock
+
+        self._cache: OrderedDict[str, Tuple[float, UserFromToken]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "ProfileClient":
+        """Builds a client configured from application settings."""
+        return cls(
+            base_url=settings.AUTH_SERVICE_URL,
+            ttl_seconds=settings.PROFILE_CACHE_TTL_SECONDS,
+            max_size=settings.PROFILE_CACHE_MAX_SIZE,
+            timeout=settings.PROFILE_FETCH_TIMEOUT_SECONDS
+        )
+
+    def get(self, user_id: str, token: str) -> UserFromToken:
+        """
+        Returns the profile for the user, fetching it with the caller's token on a cache miss.
+
+        Raises:
+            ProfileRejectedError: if the auth service rejects the token or the user is gone.
+            ProfileUnavailableError: if the auth service cannot be reached.
+        """
+        with self._lock:
+            entry = self._cache.get(user_id)
+            if entry is not None and entry[0] > self.clock():
+                self._cache.move_to_end(user_id)
+                return entry[1]
+
+        try:
+            profile = UserFromToken.model_validate_json(self.fetcher(token))
+        except ValidationError as e:
+            logger.error("Auth service returned an invalid profile: %s", e)
+            raise ProfileUnavailableError("Auth service returned an invalid profile") from e
+
+        with self._lock:
+            self._cache[user_id] = (self.clock() + self.ttl_seconds, profile)
+            self._cache.move_to_end(user_id)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return profile
+
+    def _fetch(self, token: str) -> bytes:
+        """Returns the raw JSON profile document; the auth service continues the current trace."""
+        with tracer.span("auth.profile", url=self.profile_url) as span:
+            headers = {"Authorization": f"Bearer {token}"}
+            if span.traceparent:
+                headers[TRACEPARENT] = span.traceparent
+            return self._request(urllib.request.Request(self.profile_url, headers=headers))
+
+    def _request(self, request: urllib.request.Request) -> bytes:
+        """Performs the profile request, mapping HTTP and network failures to profile errors."""
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.read()
+        except urllib.error.HTTPError as e:
+            if e.code in (401, 404):
+                raise ProfileRejectedError(f"Profile request rejected with status {e.code}") from e
+            raise ProfileUnavailableError(f"Profile request failed with status {e.code}") from e
+        except (urllib.error.URLError, TimeoutError) as e:
+            logger.error("Profile request to %s failed: %s", self.profile_url, e)
+            raise ProfileUnavailableError("Auth service is unavailable") from e
+
+
+profile_client = ProfileClient.from_settings()
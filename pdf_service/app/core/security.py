@@ -1,17 +1,32 @@
 from fastapi import HTTPException, status
-from jose import jwt
 from jose.exceptions import JWTClaimsError, ExpiredSignatureError, JWTError
+from .codecs import TokenCodec, get_codec
 from .config import settings
+from .keys import JWKSKeyResolver, JWKSUnavailableError, is_asymmetric
+from .tracing import tracer
+
+# Shared by all requests so fetched keys are cached for the process lifetime.
+jwks_resolver = JWKSKeyResolver.from_settings()
 
 
 class JWTManager:
     """
     Manager for handling JWT decoding and validation.
+    HMAC tokens are checked with the shared secret; asymmetric tokens
+    with the auth service public key selected by the `kid` header.
     """
 
-    def __init__(self, secret_key: str = settings.SECRET_KEY, algorithm: str = settings.ALGORITHM):
+    def __init__(
+        self,
+        secret_key: str = settings.SECRET_KEY,
+        algorithm: str = settings.ALGORITHM,
+        key_resolver: JWKSKeyResolver = jwks_resolver,
+        codec: TokenCodec | None = None
+    ):
         self.secret_key = secret_key
         self.algorithm = algorithm
+        self.key_resolver = key_resolver
+        self.codec = codec or get_codec(settings.JWT_CODEC, algorithm)
 
     def decode_token(self, token: str) -> dict:
         """
@@ -19,9 +34,11 @@ class JWTManager:
 
         Raises:
             HTTPException: 401 if token is expired, has invalid claims, or is malformed.
+            HTTPException: 503 if verification keys cannot be fetched.
         """
         try:
-            return jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            with tracer.span("jwt.decode", algorithm=self.algorithm):
+                return self.codec.decode(token, self._verification_key(token), algorithms=[self.algorithm])
         except ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -36,4 +53,16 @@ class JWTManager:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token"
-            )
\ No newline at end of file
+            )
+        except JWKSUnavailableError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Token verification keys are unavailable"
+            )
+
+    def _verification_key(self, token: str):
+        """Selects the secret or the published public key matching the token."""
+        if not is_asymmetric(self.algorithm):
+            return self.secret_key
+        kid = self.codec.get_unverified_header(token).get("kid")
+        return self.key_resolver.get_key(kid)
\ No newline at end of file
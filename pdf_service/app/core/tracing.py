@@ -0,0 +1,224 @@
+# Shared core module: auth_service and pdf_service each carry an identical copy, since every service image
+# is built from its own directory only. Change both copies together; tests/test_shared_modules.py checks them.
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Protocol, TextIO, Tuple
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# W3C Trace Context header (and SQS message attribute) carrying the parent span.
+TRACEPARENT = "traceparent"
+
+
+@dataclass
+class Span:
+    """
+    One timed operation of a trace, in the shape of an OpenTelemetry span.
+    """
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self, service: str) -> Dict[str, Any]:
+        return {
+            "service": service,
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stand-in yielded while tracing is off, so instrumented code needs no checks."""
+    traceparent = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def parse_traceparent(value: str | None) -> Tuple[str, str] | None:
+    """Returns (trace_id, parent span_id) from a traceparent value, or None if it is malformed."""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        if not int(parts[1], 16) or not int(parts[2], 16):
+            return None
+    except ValueError:
+        return None
+    return parts[1], parts[2]
+
+
+def current_span() -> Span | None:
+    """The span the calling code runs in, if any (e.g. to correlate log records)."""
+    return _current_span.get()
+
+
+class SpanExporter(Protocol):
+    """
+    Destination of finished spans.
+    """
+
+    def export(self, record: Dict[str, Any]) -> None: ...
+
+
+class StreamExporter:
+    """
+    Writes finished spans as JSON lines to a text stream (console or file).
+    """
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    @classmethod
+    def to_file(cls, path: str) -> "StreamExporter":
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return cls(open(path, "a", buffering=1, encoding="utf-8"))
+
+    def export(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+
+
+class Tracer:
+    """
+    Minimal tracer following OpenTelemetry conventions: spans nest through a context
+    variable (so they follow asyncio tasks and threadpool calls) and continue traces
+    from W3C traceparent values received over HTTP or SQS.
+    With no exporter configured, span() costs one attribute check.
+    """
+
+    def __init__(self, service_name: str, exporter: SpanExporter | None = None):
+        self.service_name = service_name
+        self.exporter = exporter
+
+    @classmethod
+    def from_settings(cls) -> "Tracer":
+        """Builds the tracer selected by TRACING_EXPORTER ('off', 'console' or 'file')."""
+        service_name = settings.TRACING_SERVICE_NAME
+        if settings.TRACING_EXPORTER == "off":
+            return cls(service_name)
+        if settings.TRACING_EXPORTER == "console":
+            return cls(service_name, StreamExporter(sys.stderr))
+        if settings.TRACING_EXPORTER == "file":
+            return cls(service_name, StreamExporter.to_file(settings.TRACING_FILE))
+        raise ValueError(f"Unknown tracing exporter: {settings.TRACING_EXPORTER}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @contextmanager
+    def span(self, name: str, parent: str | None = None, **attributes: Any) -> Iterator[Span | _NoopSpan]:
+        """
+        Times the block as a child of the current span, or of `parent` (a traceparent
+        value) when given; starts a new trace otherwise.
+        """
+        if self.exporter is None:
+            yield NOOP_SPAN
+            return
+
+        span = self._start(name, parse_traceparent(parent), attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.attributes["exception"] = repr(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self._finish(span)
+
+    def record(self, name: str, start_ns: int, end_ns: int, **attributes: Any) -> None:
+        """Exports an already finished operation as a child of the current span (e.g. from event hooks)."""
+        if self.exporter is None:
+            return
+        span = self._start(name, None, attributes)
+        span.start_ns = start_ns
+        self._finish(span, end_ns)
+
+    def current_traceparent(self) -> str | None:
+        """The traceparent to propagate to downstream calls and messages, if tracing."""
+        span = _current_span.get()
+        return span.traceparent if span is not None and self.exporter is not None else None
+
+    def _start(self, name: str, parent: Tuple[str, str] | None, attributes: Dict[str, Any]) -> Span:
+        if parent is None and (current := _current_span.get()) is not None:
+            parent = current.trace_id, current.span_id
+        trace_id, parent_id = parent if parent else (os.urandom(16).hex(), None)
+        return Span(name, trace_id, os.urandom(8).hex(), parent_id, time.time_ns(), attributes=attributes)
+
+    def _finish(self, span: Span, end_ns: int | None = None) -> None:
+        span.end_ns = end_ns or time.time_ns()
+        try:
+            self.exporter.export(span.to_dict(self.service_name))
+        except Exception as e:
+            logger.warning("Could not export span %s: %s", span.name, e)
+
+
+tracer = Tracer.from_settings()
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening a server span per HTTP request, continuing the caller's
+    trace when the request carries a traceparent header.
+    """
+
+    def __init__(self, app, tracer: Tracer = tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.tracer.enabled:
+            return await self.app(scope, receive, send)
+
+        parent = next((value.decode("latin-1") for key, value in scope["headers"] if key == TRACEPARENT.encode()), None)
+        attributes = {"http.method": scope["method"], "http.target": scope["path"]}
+        with self.tracer.span(f"{scope['method']} {scope['path']}", parent=parent, **attributes) as span:
+            async def send_with_status(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            await self.app(scope, receive, send_with_status)
@@ -1,11 +1,16 @@
+import hmac
 from typing import Annotated
 
-import aioboto3
-from fastapi import Depends, Request, HTTPException, status
+from fastapi import Depends, Header, Query, Request, HTTPException, status
 
+from .core.aws import AWSClients, aws_clients
+from .core.config import settings
+from .core.profiles import ProfileClient, ProfileRejectedError, ProfileUnavailableError, profile_client
 from .core.security import JWTManager
 from .schemas import UserFromToken
-from .services import PDFService, QueueService
+from .jobs import get_job_store
+from .templating import DocumentTemplate, TemplateNotFoundError, TemplateRegistry, template_registry
+from .services import PDFService, QueueService, JobService
 
 
 def get_jwt_manager() -> JWTManager:
@@ -24,9 +29,56 @@ def get_pdf_service() -> PDFService:
 PDFServiceDepends = Annotated[PDFService, Depends(get_pdf_service)]
 
 
-def get_current_user(request: Request, jwt_manager: JWTManagerDepends) -> UserFromToken:
+def get_template_registry() -> TemplateRegistry:
+    """Dependency provider for the process-wide TemplateRegistry."""
+    return template_registry
+
+
+TemplateRegistryDepends = Annotated[TemplateRegistry, Depends(get_template_registry)]
+
+
+def get_template(
+        registry: TemplateRegistryDepends,
+        template: Annotated[str | None, Query(description="Template name; the default template if omitted")] = None,
+        version: Annotated[int | None, Query(ge=1, description="Template version; the latest if omitted")] = None
+) -> DocumentTemplate:
+    """
+    Resolves the document template selected by the `template` and `version` query parameters.
+    """
+    try:
+        return registry.get(template, version)
+    except TemplateNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "Not Found",
+                "message": str(e),
+                "code": "TEMPLATE_NOT_FOUND"
+            }
+        )
+
+
+TemplateDepends = Annotated[DocumentTemplate, Depends(get_template)]
+
+
+def get_profile_client() -> ProfileClient:
+    """Dependency provider for the shared, caching ProfileClient."""
+    return profile_client
+
+
+ProfileClientDepends = Annotated[ProfileClient, Depends(get_profile_client)]
+
+
+def get_current_user(
+        request: Request,
+        jwt_manager: JWTManagerDepends,
+        profiles: ProfileClientDepends
+) -> UserFromToken:
     """
     Extracts and validates the Bearer token from the Authorization header.
+    Compact access tokens only carry the user id, so the profile is resolved
+    through the auth service (cached, validated once per fetch); tokens with
+    embedded profile data are validated from the payload.
     Returns a validated UserFromToken schema.
     """
     auth_header = request.headers.get("Authorization")
@@ -40,16 +92,71 @@ def get_current_user(request: Request, jwt_manager: JWTManagerDepends) -> UserFr
     token = auth_header.split(" ")[1]
     payload = jwt_manager.decode_token(token)
 
-    return UserFromToken(**payload)
+    if "email" in payload:
+        return UserFromToken.model_validate(payload)
+
+    if payload.get("type") != "access" or "sub" not in payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Access token required"
+        )
+
+    try:
+        return profiles.get(payload["sub"], token)
+    except ProfileRejectedError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User profile is not available for this token"
+        )
+    except ProfileUnavailableError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Auth service is unavailable"
+        )
 
 
 CurrentUserDepends = Annotated[UserFromToken, Depends(get_current_user)]
 
 
-def get_queue_service() -> QueueService:
+def get_aws_clients() -> AWSClients:
+    """
+    Dependency provider for the process-wide AWS clients.
+    The SDK is imported on first use, so processes that only render PDFs never load botocore.
+    """
+    return aws_clients
+
+
+AWSClientsDepends = Annotated[AWSClients, Depends(get_aws_clients)]
+
+
+def get_queue_service(clients: AWSClientsDepends) -> QueueService:
     return QueueService(
-        session=aioboto3.Session()
+        clients=clients
     )
 
 
 QueueServiceDepends = Annotated[QueueService, Depends(get_queue_service)]
+
+
+def get_job_service(clients: AWSClientsDepends) -> JobService:
+    return JobService(
+        store=get_job_store(clients),
+        clients=clients
+    )
+
+
+JobServiceDepends = Annotated[JobService, Depends(get_job_service)]
+
+
+def require_admin(x_admin_key: Annotated[str | None, Header()] = None) -> None:
+    """Admits requests carrying the configured ADMIN_API_KEY in the X-Admin-Key header."""
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Ops endpoints are disabled"
+        )
+    if x_admin_key is None or not hmac.compare_digest(x_admin_key.encode(), settings.ADMIN_API_KEY.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin key"
+        )
@@ -0,0 +1,81 @@
+import logging
+import uuid
+from typing import Dict, Protocol
+
+from .core.aws import AWSClients
+from .core.config import settings
+from .core.tracing import tracer
+from .schemas import Job
+
+logger = logging.getLogger(__name__)
+
+
+class JobStore(Protocol):
+    """
+    Persistence for job state shared by the API and the worker.
+    """
+
+    async def get(self, job_id: uuid.UUID) -> Job | None: ...
+
+    async def put(self, job: Job) -> None: ...
+
+
+class InMemoryJobStore:
+    """
+    Process-local job store. Only suitable when the API and the worker share a process (tests, local runs).
+    """
+
+    def __init__(self):
+        self._jobs: Dict[uuid.UUID, Job] = {}
+
+    async def get(self, job_id: uuid.UUID) -> Job | None:
+        return self._jobs.get(job_id)
+
+    async def put(self, job: Job) -> None:
+        self._jobs[job.id] = job.model_copy()
+
+
+class S3JobStore:
+    """
+    Stores every job as a small JSON object next to the generated PDFs,
+    so the API and the worker need no extra infrastructure to share job state.
+    """
+
+    def __init__(self, clients: AWSClients, bucket_name: str, prefix: str):
+        self.clients = clients
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+
+    def _key(self, job_id: uuid.UUID) -> str:
+        return f"{self.prefix}{job_id}.json"
+
+    async def get(self, job_id: uuid.UUID) -> Job | None:
+        s3 = await self.clients.client("s3")
+        try:
+            response = await s3.get_object(Bucket=self.bucket_name, Key=self._key(job_id))
+        except s3.exceptions.NoSuchKey:
+            return None
+        async with response["Body"] as stream:
+            return Job.model_validate_json(await stream.read())
+
+    async def put(self, job: Job) -> None:
+        s3 = await self.clients.client("s3")
+        with tracer.span("s3.put", bucket=self.bucket_name, key=self._key(job.id)):
+            await s3.put_object(
+                Bucket=self.bucket_name,
+                Key=self._key(job.id),
+                Body=job.model_dump_json(),
+                ContentType="application/json"
+            )
+
+
+_memory_store = InMemoryJobStore()
+
+
+def get_job_store(clients: AWSClients) -> JobStore:
+    """Returns the job store selected by JOB_STORE_BACKEND."""
+    if settings.JOB_STORE_BACKEND == "memory":
+        return _memory_store
+    if settings.JOB_STORE_BACKEND == "s3":
+        return S3JobStore(clients, bucket_name=settings.S3_BUCKET_NAME, prefix=settings.JOB_STATUS_PREFIX)
+    raise ValueError(f"Unknown job store backend: {settings.JOB_STORE_BACKEND}")
@@ -1,10 +1,42 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from .router import pdf_router
+from fastapi.responses import ORJSONResponse
+from .core.aws import aws_clients
+from .core.config import settings
+from .core.logs import configure_logging, shutdown_logging
+from .core.tracing import TracingMiddleware
+from .router import pdf_router, ops_router
+from .services import PDFService
+
+if settings.PDF_WARMUP == "import":
+    # Runs in the master process of a preloading server, before workers are forked
+    PDFService.warm_up(freeze_gc=True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Starts the log writer, warms up the PDF renderer before the first request is served
+    and closes the shared AWS clients on shutdown.
+    """
+    configure_logging("pdf_service")
+    if settings.PDF_WARMUP != "off":
+        PDFService.warm_up()
+    yield
+    await aws_clients.close()
+    shutdown_logging()
+
 
 app = FastAPI(
     title="PDF Generation Service",
     description="Independent service for generating profile PDFs via JWT",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+app.add_middleware(TracingMiddleware)
+
 app.include_router(pdf_router)
+app.include_router(ops_router)
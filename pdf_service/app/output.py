@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import Dict, Tuple
+
+from .core.config import settings
+
+STREAM_ENCODINGS = ("binary", "ascii85")
+FONT_MODES = ("standard", "embedded")
+
+# Roles of the embedded font files, in the order PDF_EMBEDDED_FONTS lists them,
+# and the standard fonts of the sample stylesheet they replace.
+FONT_ROLES = ("normal", "bold", "italic", "boldItalic")
+STANDARD_FONTS = ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Helvetica-BoldOblique")
+
+
+@cache
+def register_font_family(files: Tuple[str, ...]) -> Dict[str, str]:
+    """
+    Registers TrueType fonts as one family (once per process) and returns the
+    mapping from the standard Helvetica fonts to them. Files are looked up on
+    ReportLab's font search path, which includes the bundled Vera fonts.
+    """
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    names = tuple(Path(file).stem for file in files)
+    for name, file in zip(names, files):
+        pdfmetrics.registerFont(TTFont(name, file))
+    pdfmetrics.registerFontFamily(names[0], **dict(zip(FONT_ROLES, names)))
+    return dict(zip(STANDARD_FONTS, names))
+
+
+@dataclass(frozen=True)
+class OutputProfile:
+    """
+    How rendered documents are encoded; trades CPU time for bytes per deployment.
+
+    - page_compression: Flate-compress page content streams.
+    - stream_encoding: 'binary' keeps compressed streams binary, 'ascii85' additionally
+      encodes them as ASCII (about 25% larger, only needed for 7-bit transports).
+    - fonts: 'standard' references the 14 standard PDF fonts (nothing embedded, Latin-1 text only);
+      'embedded' embeds the configured TrueType fonts. ReportLab always embeds TrueType fonts as
+      subsets of the glyphs actually used, so there is no full-embedding mode.
+    """
+    page_compression: bool = True
+    stream_encoding: str = "binary"
+    fonts: str = "standard"
+    embedded_fonts: Tuple[str, str, str, str] = ("Vera.ttf", "VeraBd.ttf", "VeraIt.ttf", "VeraBI.ttf")
+
+    def __post_init__(self):
+        if self.stream_encoding not in STREAM_ENCODINGS:
+            raise ValueError(f"Unknown stream encoding: {self.stream_encoding}")
+        if self.fonts not in FONT_MODES:
+            raise ValueError(f"Unknown font mode: {self.fonts}")
+        if len(self.embedded_fonts) != len(FONT_ROLES):
+            raise ValueError("Embedded fonts must list regular, bold, italic and bold-italic files")
+
+    @classmethod
+    def from_settings(cls) -> "OutputProfile":
+        """Builds the profile configured for this deployment."""
+        return cls(
+            page_compression=settings.PDF_PAGE_COMPRESSION,
+            stream_encoding=settings.PDF_STREAM_ENCODING,
+            fonts=settings.PDF_FONTS,
+            embedded_fonts=tuple(file.strip() for file in settings.PDF_EMBEDDED_FONTS.split(","))
+        )
+
+    @property
+    def key(self) -> str:
+        """Short label for metrics, e.g. 'compressed-binary-standard'."""
+        compression = "compressed" if self.page_compression else "uncompressed"
+        return f"{compression}-{self.stream_encoding}-{self.fonts}"
+
+    def apply(self) -> None:
+        """
+        Applies the process-wide part of the profile. ReportLab reads the stream
+        encoding from global configuration, so one process renders with one encoding.
+        """
+        from reportlab import rl_config
+
+        rl_config.useA85 = int(self.stream_encoding == "ascii85")
+
+    def font_map(self) -> Dict[str, str]:
+        """Standard font names to replace in template styles (empty for standard fonts)."""
+        if self.fonts == "standard":
+            return {}
+        return register_font_family(self.embedded_fonts)
+
+
+output_profile = OutputProfile.from_settings()
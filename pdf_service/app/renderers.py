@@ -0,0 +1,250 @@
+import logging
+import re
+import threading
+import weakref
+from dataclasses import dataclass
+from io import BytesIO
+from typing import TYPE_CHECKING, Dict, List, Mapping, Protocol, Tuple
+
+from .core.config import settings
+from .output import OutputProfile, output_profile
+from .templating import DocumentTemplate, TEMPLATE_FIELDS
+
+if TYPE_CHECKING:
+    from reportlab.pdfgen.canvas import Canvas
+    from reportlab.platypus import SimpleDocTemplate
+
+logger = logging.getLogger(__name__)
+
+# Stand-ins for field values while a layout is recorded. '¤' is in WinAnsi, so it survives
+# ReportLab's text encoding unchanged and never appears in the bundled templates.
+SENTINELS = {field: f"¤{index}¤" for index, field in enumerate(sorted(TEMPLATE_FIELDS))}
+SENTINEL_FIELDS = {sentinel: field for field, sentinel in SENTINELS.items()}
+# Values may contain '¤' themselves, so all sentinels are substituted in a single pass.
+SENTINEL_PATTERN = re.compile("|".join(map(re.escape, SENTINEL_FIELDS)))
+
+# Keeps a safety margin to ReportLab's own line breaking, which sums word widths slightly differently.
+LINE_WIDTH_MARGIN = 0.98
+
+
+class Renderer(Protocol):
+    """
+    Turns a document template and field values into PDF bytes.
+    """
+    name: str
+    profile: OutputProfile
+
+    def render(self, template: DocumentTemplate, fields: Mapping[str, str], buffer: BytesIO) -> None: ...
+
+
+def new_document(
+        template: DocumentTemplate,
+        fields: Mapping[str, str],
+        buffer: BytesIO,
+        profile: OutputProfile
+) -> "SimpleDocTemplate":
+    """Document setup shared by all renderers, so page size, metadata and encoding stay identical."""
+    from reportlab.platypus import SimpleDocTemplate
+
+    profile.apply()
+    return SimpleDocTemplate(
+        buffer,
+        title=template.title(fields),
+        author="PDF Service",
+        pageCompression=int(profile.page_compression)
+    )
+
+
+class PlatypusRenderer:
+    """
+    Lays the template out with Platypus flow layout on every render. Handles any template and value.
+    """
+    name = "platypus"
+
+    def __init__(self, profile: OutputProfile = output_profile):
+        self.profile = profile
+
+    def render(self, template: DocumentTemplate, fields: Mapping[str, str], buffer: BytesIO) -> None:
+        new_document(template, fields, buffer, self.profile).build(template.build_story(fields))
+
+
+@dataclass(frozen=True)
+class _TextRun:
+    """A text run of the recorded page that contains field values."""
+    text: str
+    font_name: str
+    font_size: float
+    leading: float
+
+
+@dataclass(frozen=True)
+class _Line:
+    """A single-line paragraph with field values that must keep fitting on its line."""
+    static_width: float
+    runs: Tuple[_TextRun, ...]
+    max_width: float
+
+
+@dataclass(frozen=True)
+class _PageLayout:
+    """Recorded content stream of a one-page template, split around its text runs."""
+    fonts: Tuple[str, ...]
+    pdf_version: Tuple[int, int]
+    pieces: Tuple[str | _TextRun, ...]
+    lines: Tuple[_Line, ...]
+
+
+class CanvasRenderer:
+    """
+    Fast path for fixed one-page layouts.
+
+    The first render of a template lays it out once with Platypus on a recording canvas,
+    using sentinel field values. Later renders replay the recorded page operators straight
+    onto a canvas and only encode the text runs that carry values, skipping flow layout,
+    paragraph wrapping and frame handling. The output is identical to PlatypusRenderer.
+
+    Renders fall back to Platypus when a value would not fit on its line (which would
+    change line breaks) or is not whitespace-normalized. Templates with multi-page,
+    centered, linked or otherwise width-dependent dynamic content, and templates using
+    embedded (subset) fonts, whose glyph codes are assigned per document, always use Platypus.
+    """
+    name = "canvas"
+
+    def __init__(self, profile: OutputProfile = output_profile, fallback: Renderer | None = None):
+        self.profile = profile
+        self.fallback = fallback or PlatypusRenderer(profile)
+        self.fallbacks = 0
+        self._layouts: weakref.WeakKeyDictionary[DocumentTemplate, _PageLayout | None] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def render(self, template: DocumentTemplate, fields: Mapping[str, str], buffer: BytesIO) -> None:
+        layout = self._get_layout(template)
+        if layout is None or not self._fits(layout, fields):
+            self.fallbacks += 1
+            self.fallback.render(template, fields, buffer)
+            return
+
+        canvas = new_document(template, fields, buffer, self.profile)._makeCanvas()
+        canvas._doc._pdfVersion = layout.pdf_version
+        for font_name in layout.fonts:
+            canvas._doc.getInternalFontName(font_name)
+
+        text = canvas.beginText()
+        code = []
+        for piece in layout.pieces:
+            if isinstance(piece, str):
+                code.append(piece)
+            else:
+                text.setFont(piece.font_name, piece.font_size, piece.leading)
+                code.append(text._formatText(self._fill(piece.text, fields)))
+        canvas._code.append("".join(code))
+        canvas.showPage()
+        canvas.save()
+
+    def _get_layout(self, template: DocumentTemplate) -> _PageLayout | None:
+        if template not in self._layouts:
+            with self._lock:
+                if template not in self._layouts:
+                    self._layouts[template] = self._record(template)
+        return self._layouts[template]
+
+    @staticmethod
+    def _fill(text: str, fields: Mapping[str, str]) -> str:
+        return SENTINEL_PATTERN.sub(lambda match: fields[SENTINEL_FIELDS[match.group()]], text)
+
+    def _fits(self, layout: _PageLayout, fields: Mapping[str, str]) -> bool:
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+
+        if any(not value or " ".join(value.split()) != value for value in fields.values()):
+            return False
+        for line in layout.lines:
+            width = line.static_width + sum(
+                stringWidth(self._fill(run.text, fields), run.font_name, run.font_size) for run in line.runs
+            )
+            if width > line.max_width * LINE_WIDTH_MARGIN:
+                return False
+        return True
+
+    def _record(self, template: DocumentTemplate) -> _PageLayout | None:
+        """Lays the template out once and returns its replayable page, or None if it is not fixed."""
+        from reportlab.lib.enums import TA_LEFT
+        from reportlab.pdfbase.pdfmetrics import getFont, stringWidth
+        from reportlab.pdfgen.canvas import Canvas
+        from reportlab.platypus import Paragraph
+
+        pages: List[List[str]] = []
+        fonts: List[str] = []
+        pdf_version = []
+
+        class RecordingCanvas(Canvas):
+            def showPage(self):
+                pages.append(list(self._code))
+                fonts[:] = self._doc.fontMapping
+                pdf_version[:] = [self._doc._pdfVersion]
+                super().showPage()
+
+        story = template.build_story(SENTINELS)
+        # Wrapping replaces Paragraph.frags with line data, so keep the fragments as built.
+        story_frags = [list(flowable.frags) if isinstance(flowable, Paragraph) else [] for flowable in story]
+        new_document(template, SENTINELS, BytesIO(), self.profile).build(list(story), canvasmaker=RecordingCanvas)
+        if len(pages) != 1:
+            return self._unsupported(template, "it does not fit on one page")
+        if any(getFont(font_name)._dynamicFont for font_name in fonts):
+            return self._unsupported(template, "it uses embedded fonts")
+
+        scratch = Canvas(BytesIO()).beginText()
+        page = "\n".join(pages[0])
+        runs: Dict[str, _TextRun] = {}
+        lines = []
+        for flowable, frags in zip(story, story_frags):
+            dynamic = [frag for frag in frags if any(s in frag.text for s in SENTINELS.values())]
+            static = [frag for frag in frags if not any(frag is d for d in dynamic)]
+            if not dynamic:
+                continue
+
+            style = flowable.style
+            if style.alignment != TA_LEFT or len(flowable.blPara.lines) != 1:
+                return self._unsupported(template, "a paragraph with fields is not a single left-aligned line")
+            if any(getattr(frag, "link", None) or getattr(frag, "us_lines", None) for frag in frags):
+                return self._unsupported(template, "a paragraph with fields has links or decorations")
+
+            line_runs = []
+            for frag in dynamic:
+                run = _TextRun(frag.text, frag.fontName, frag.fontSize, style.leading)
+                scratch.setFont(run.font_name, run.font_size, run.leading)
+                encoded = scratch._formatText(run.text)
+                if runs.setdefault(encoded, run) != run or page.count(encoded) != 1:
+                    return self._unsupported(template, "its text runs cannot be told apart")
+                line_runs.append(run)
+
+            lines.append(_Line(
+                static_width=sum(stringWidth(frag.text, frag.fontName, frag.fontSize) for frag in static),
+                runs=tuple(line_runs),
+                max_width=flowable.width - style.leftIndent - style.rightIndent - style.firstLineIndent
+            ))
+
+        pieces: List[str | _TextRun] = []
+        start = 0
+        for index, encoded in sorted((page.index(encoded), encoded) for encoded in runs):
+            pieces += [page[start:index], runs[encoded]]
+            start = index + len(encoded)
+        pieces.append(page[start:])
+        return _PageLayout(fonts=tuple(fonts), pdf_version=pdf_version[0], pieces=tuple(pieces), lines=tuple(lines))
+
+    @staticmethod
+    def _unsupported(template: DocumentTemplate, reason: str) -> None:
+        logger.info("Template %s is rendered with Platypus: %s", template.key, reason)
+        return None
+
+
+def get_renderer(name: str, profile: OutputProfile = output_profile) -> Renderer:
+    """Returns the renderer selected by PDF_RENDERER."""
+    if name == "platypus":
+        return PlatypusRenderer(profile)
+    if name == "canvas":
+        return CanvasRenderer(profile)
+    raise ValueError(f"Unknown PDF renderer: {name}")
+
+
+# Shared so that recorded layouts are reused across requests.
+pdf_renderer = get_renderer(settings.PDF_RENDERER)
@@ -1,30 +1,53 @@
-from fastapi import APIRouter, Response, HTTPException, status
-from .dependencies import CurrentUserDepends, PDFServiceDepends, QueueServiceDepends
+import time
+import uuid
+from contextlib import suppress
+from io import SEEK_END
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from .dependencies import (
+    CurrentUserDepends,
+    PDFServiceDepends,
+    QueueServiceDepends,
+    JobServiceDepends,
+    TemplateDepends,
+    require_admin
+)
+from .core.metrics import metrics
+from .schemas import JobResponse, JobStatus, Priority
 
 pdf_router = APIRouter(prefix="/api/pdf", tags=["PDF"])
+ops_router = APIRouter(tags=["Ops"], dependencies=[Depends(require_admin)])
 
 
 @pdf_router.get(
     "/download",
-    response_class=Response,
+    response_class=StreamingResponse,
     status_code=status.HTTP_200_OK,
 )
 async def download_pdf(
         current_user: CurrentUserDepends,
-        pdf_service: PDFServiceDepends
+        pdf_service: PDFServiceDepends,
+        template: TemplateDepends
 ):
     """
-    Generates and returns the current user's profile as a PDF file.
+    Generates the current user's profile as a PDF file and streams it back in chunks.
+    Rendering is CPU-bound and runs in the threadpool to keep the event loop responsive.
     """
     try:
-        pdf_buffer = pdf_service.generate_pdf(user=current_user)
+        started = time.perf_counter()
+        pdf_buffer = await run_in_threadpool(pdf_service.generate_pdf, user=current_user, template=template)
+        render_ms = (time.perf_counter() - started) * 1000
 
-        return Response(
-            content=pdf_buffer.getvalue(),
+        return StreamingResponse(
+            content=pdf_service.iter_chunks(pdf_buffer),
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename=profile_{current_user.id}.pdf",
-                "Access-Control-Expose-Headers": "Content-Disposition"
+                "Content-Length": str(pdf_buffer.seek(0, SEEK_END)),
+                "Server-Timing": f"render;dur={render_ms:.1f}",
+                "Access-Control-Expose-Headers": "Content-Disposition, Server-Timing"
             }
         )
     except Exception:
@@ -44,19 +67,35 @@ async def download_pdf(
 )
 async def s3_upload_pdf(
         current_user: CurrentUserDepends,
-        queue_service: QueueServiceDepends
+        queue_service: QueueServiceDepends,
+        job_service: JobServiceDepends,
+        template: TemplateDepends,
+        priority: Priority = Query(
+            Priority.INTERACTIVE,
+            description="'bulk' for batch exports; the worker renders interactive jobs first."
+        )
 ):
     """
     Triggers an asynchronous task to generate and upload the user's PDF to S3.
+    Progress can be followed at the returned status URL.
     """
+    job = None
     try:
-        await queue_service.send_generate_task(current_user)
+        job = await job_service.create_job(user_id=current_user.id)
+        await queue_service.send_generate_task(current_user, job_id=job.id, template=template, priority=priority)
         return {
             "status": "accepted",
             "user_id": current_user.id,
+            "job_id": job.id,
+            "template": template.key,
+            "priority": priority.value,
+            "status_url": f"{pdf_router.prefix}/jobs/{job.id}",
             "message": "Task queued successfully"
         }
     except Exception as e:
+        if job is not None:
+            with suppress(Exception):
+                await job_service.update_job(job.id, JobStatus.FAILED, error="Could not be queued")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail={
@@ -64,4 +103,52 @@ async def s3_upload_pdf(
                 "message": "We are unable to process your request at the moment. Please try again later.",
                 "code": "QUEUE_UNAVAILABLE"
             }
-        )
\ No newline at end of file
+        )
+
+
+@pdf_router.get(
+    "/jobs/{job_id}",
+    response_model=JobResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_job(
+        job_id: uuid.UUID,
+        current_user: CurrentUserDepends,
+        job_service: JobServiceDepends
+):
+    """
+    Reports the state of a PDF generation job; completed jobs include a presigned download URL.
+    """
+    try:
+        job = await job_service.get_job_status(job_id=job_id, user_id=current_user.id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "error": "Job Store Error",
+                "message": "Job status is temporarily unavailable. Please try again later.",
+                "code": "JOB_STORE_UNAVAILABLE"
+            }
+        )
+
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "Not Found",
+                "message": "Job not found",
+                "code": "JOB_NOT_FOUND"
+            }
+        )
+    return job
+
+
+@ops_router.get(
+    "/metrics",
+    status_code=status.HTTP_200_OK,
+)
+async def get_metrics():
+    """
+    Reports this process's render time and output size metrics (per template and output profile).
+    """
+    return {"metrics": metrics.snapshot()}
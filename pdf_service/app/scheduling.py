@@ -0,0 +1,114 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Generic, List, Tuple, TypeVar
+
+from .core.metrics import metrics
+from .schemas import Priority
+
+T = TypeVar("T")
+
+
+class RenderScheduler(Generic[T]):
+    """
+    Bounded local buffer between receiving messages and rendering them.
+
+    Interactive jobs are dispatched before bulk ones, but after `interactive_burst`
+    interactive jobs in a row a waiting bulk job gets its turn, so bulk work never
+    starves; with no interactive jobs waiting, bulk jobs use every render slot.
+    Within a priority class, users are served round-robin, so one user's bulk
+    export cannot hold back other users' jobs of the same class.
+
+    Items taken out for work that outlives their render (a pending upload) can keep holding
+    a slot, so the buffer only accepts new items once that work is done.
+
+    Not thread-safe: used from the worker's event loop only.
+    """
+
+    def __init__(self, capacity: int, interactive_burst: int):
+        if capacity < 1 or interactive_burst < 1:
+            raise ValueError("Scheduler capacity and interactive burst must be positive")
+        self.capacity = capacity
+        self.interactive_burst = interactive_burst
+        self._queues: Dict[Priority, OrderedDict[str, Deque[Tuple[T, float]]]] = {
+            priority: OrderedDict() for priority in Priority
+        }
+        self._size = 0
+        self._held = 0
+        self._streak = 0
+        self._changed = asyncio.Condition()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def free_slots(self) -> int:
+        return self.capacity - self._size - self._held
+
+    def hold(self) -> None:
+        """Keeps a slot occupied for an item already taken out, until release_hold() is called."""
+        self._held += 1
+
+    async def release_hold(self) -> None:
+        """Frees a slot taken by hold()."""
+        async with self._changed:
+            self._held -= 1
+            self._changed.notify_all()
+
+    async def wait_for_space(self) -> None:
+        """Waits until at least one item can be buffered."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.free_slots > 0)
+
+    async def put(self, item: T, priority: Priority, user_key: str) -> None:
+        """Buffers an item, waiting while the buffer is full."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.free_slots > 0)
+            self._append(item, priority, user_key)
+            self._changed.notify_all()
+
+    async def get(self) -> T:
+        """Returns the next item to render, waiting while the buffer is empty."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._size > 0)
+            item = self._pop()
+            self._changed.notify_all()
+            return item
+
+    def items(self) -> List[T]:
+        """Returns every buffered item without removing it."""
+        return [item for users in self._queues.values() for queue in users.values() for item, _ in queue]
+
+    def drain(self) -> List[T]:
+        """Removes and returns every buffered item, e.g. to release them on shutdown."""
+        items = self.items()
+        for users in self._queues.values():
+            users.clear()
+        self._size = 0
+        return items
+
+    def _append(self, item: T, priority: Priority, user_key: str) -> None:
+        self._queues[priority].setdefault(user_key, deque()).append((item, time.monotonic()))
+        self._size += 1
+
+    def _pop(self) -> T:
+        priority = self._next_priority()
+        users = self._queues[priority]
+        user_key, items = next(iter(users.items()))
+        item, queued_at = items.popleft()
+        if items:
+            users.move_to_end(user_key)
+        else:
+            del users[user_key]
+        self._size -= 1
+
+        metrics.observe("pdf_schedule_wait_seconds", time.monotonic() - queued_at, priority=priority.value)
+        return item
+
+    def _next_priority(self) -> Priority:
+        interactive, bulk = self._queues[Priority.INTERACTIVE], self._queues[Priority.BULK]
+        if interactive and (not bulk or self._streak < self.interactive_burst):
+            self._streak += 1
+            return Priority.INTERACTIVE
+        self._streak = 0
+        return Priority.BULK
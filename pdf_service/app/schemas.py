@@ -1,6 +1,7 @@
 import uuid
+from enum import Enum
 from pydantic import BaseModel, EmailStr, Field
-from datetime import date
+from datetime import date, datetime, timezone
 
 
 class UserFromToken(BaseModel):
@@ -14,3 +15,46 @@ class UserFromToken(BaseModel):
     email: EmailStr = Field(..., title="Email")
     date_of_birth: date = Field(..., title="Date of birth")
 
+
+
+class JobStatus(str, Enum):
+    """
+    Lifecycle states of an asynchronous PDF generation job.
+    """
+    QUEUED = "queued"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class Priority(str, Enum):
+    """
+    Scheduling class of an asynchronous PDF job in the worker.
+    """
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+
+
+class Job(BaseModel):
+    """
+    Stored state of an asynchronous PDF generation job.
+    """
+    id: uuid.UUID = Field(..., title="Job ID")
+    user_id: uuid.UUID = Field(..., title="User ID")
+    status: JobStatus = Field(JobStatus.QUEUED, title="Status")
+    s3_key: str | None = Field(None, title="S3 object key of the generated PDF")
+    error: str | None = Field(None, title="Last error message")
+    attempts: int = Field(0, title="Number of processing attempts")
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), title="Created at")
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), title="Updated at")
+
+
+class JobResponse(BaseModel):
+    """
+    Job status returned to clients; includes a presigned download URL once completed.
+    """
+    id: uuid.UUID = Field(..., title="Job ID")
+    status: JobStatus = Field(..., title="Status")
+    download_url: str | None = Field(None, title="Presigned S3 URL of the generated PDF")
+    error: str | None = Field(None, title="Error message if the job failed")
+    updated_at: datetime = Field(..., title="Updated at")
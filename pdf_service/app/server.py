@@ -0,0 +1,108 @@
+"""
+Production launcher: gunicorn managing uvicorn workers with uvloop and httptools.
+
+    python -m app.server
+
+The application is imported and the PDF renderer warmed up once in the master
+process; workers are forked from it and share that memory copy-on-write. Worker
+count, recycling and timeouts come from the SERVER_* settings.
+
+The master writes its log records synchronously; each worker starts its own background
+log writer right after it is forked (post_fork), so boot records are not lost.
+"""
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+from gunicorn.app.base import BaseApplication
+from uvicorn_worker import UvicornWorker as BaseUvicornWorker
+
+from .core.config import settings
+
+# Extra seconds the master waits after the workers' own graceful timeout,
+# so application shutdown (closing AWS clients) can complete before workers are killed.
+SHUTDOWN_MARGIN_SECONDS = 5
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on: its affinity mask, capped by a cgroup v2 CPU quota (containers)."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+class UvicornWorker(BaseUvicornWorker):
+    """
+    Uvicorn worker pinned to uvloop and httptools (fails at boot if they are missing,
+    instead of silently falling back to asyncio and h11).
+    """
+    CONFIG_KWARGS = {
+        "loop": "uvloop",
+        "http": "httptools",
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT,
+    }
+
+
+def post_fork(server, worker) -> None:
+    """Starts the worker's log writer thread as soon as it is forked, before it boots the application."""
+    from .core.logs import configure_logging
+
+    configure_logging("pdf_service")
+
+
+def server_options() -> Dict[str, Any]:
+    """Gunicorn configuration derived from application settings."""
+    return {
+        "bind": f"{settings.SERVER_HOST}:{settings.SERVER_PORT}",
+        "workers": settings.SERVER_WORKERS or available_cpus(),
+        "worker_class": UvicornWorker,
+        "preload_app": True,
+        "max_requests": settings.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVER_MAX_REQUESTS_JITTER,
+        "timeout": settings.SERVER_TIMEOUT,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT + SHUTDOWN_MARGIN_SECONDS,
+        "keepalive": settings.SERVER_KEEPALIVE,
+        "post_fork": post_fork,
+    }
+
+
+class Server(BaseApplication):
+    """
+    Embedded gunicorn application serving app.main:app.
+    """
+
+    def __init__(self, options: Dict[str, Any]):
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from .core.logs import configure_logging
+
+        # Synchronous in the master (set up before the import, which may warm the renderer up):
+        # a writer thread would not survive the fork, so workers start their own in post_fork
+        configure_logging("pdf_service", background=False)
+
+        from .main import app
+        from .services import PDFService
+
+        if settings.PDF_WARMUP != "off":
+            # Idempotent: workers inherit the warm state and skip their lifespan warm-up
+            PDFService.warm_up(freeze_gc=True)
+        return app
+
+
+if __name__ == "__main__":
+    Server(server_options()).run()
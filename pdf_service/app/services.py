@@ -1,73 +1,118 @@
+import gc
 import logging
-import aioboto3
+import time
+import uuid
+from datetime import date, datetime, timezone
 from io import BytesIO
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Flowable
-from reportlab.lib.styles import getSampleStyleSheet, StyleSheet1
+from typing import AsyncIterator, BinaryIO, Dict
+from .core.aws import AWSClients
 from .core.config import settings
-from .schemas import UserFromToken
+from .core.metrics import metrics
+from .core.tracing import TRACEPARENT, tracer
+from .jobs import JobStore
+from .renderers import Renderer, pdf_renderer
+from .templating import DocumentTemplate, TemplateRegistry, template_registry
+from .schemas import UserFromToken, Job, JobStatus, JobResponse, Priority
 
 logger = logging.getLogger(__name__)
 
+JOB_ID_ATTRIBUTE = "JobId"
+TEMPLATE_ATTRIBUTE = "Template"
+PRIORITY_ATTRIBUTE = "Priority"
+TRACE_ATTRIBUTE = TRACEPARENT
+
+WARMUP_USER = UserFromToken(
+    id=uuid.UUID(int=0),
+    name="Warm",
+    surname="Up",
+    email="warmup@example.com",
+    date_of_birth=date(2000, 1, 1)
+)
+
+
 class PDFService:
     """
     Service responsible for generating PDF documents using ReportLab.
-    Encapsulates the document structure and styling logic.
+    Document structure and styling come from the template registry.
     """
 
-    def generate_pdf(self, user: UserFromToken) -> BytesIO:
-        """Return a PDF stream containing the user profile."""
-        try:
-            buffer = BytesIO()
-            doc = SimpleDocTemplate(
-                buffer,
-                title=f"Profile_{user.surname}",
-                author="PDF Service"
-            )
+    _warmed_up = False
 
-            styles = self._get_styles()
-            story = self._build_story(user, styles)
+    def __init__(self, templates: TemplateRegistry = template_registry, renderer: Renderer = pdf_renderer):
+        self.templates = templates
+        self.renderer = renderer
 
-            doc.build(story)
+    def generate_pdf(self, user: UserFromToken, template: DocumentTemplate | None = None) -> BytesIO:
+        """Return a PDF stream containing the user profile, laid out by the given (or default) template."""
+        template = template or self.templates.get()
+        try:
+            buffer = BytesIO()
+            started = time.perf_counter()
+            with tracer.span("pdf.render", template=template.key, renderer=self.renderer.name) as span:
+                self.renderer.render(template, template.fields(user), buffer)
+                span.set_attribute("size", buffer.tell())
+            self._record_output(template, time.perf_counter() - started, size=buffer.tell())
             buffer.seek(0)
 
-            logger.info(f"PDF generated for user: {user.id}")
+            logger.info("PDF generated for user: %s with template %s", user.id, template.key)
             return buffer
 
         except Exception as e:
-            logger.error(f"PDF generation error for user {user.id}: {str(e)}", exc_info=True)
+            logger.error("PDF generation error for user %s: %s", user.id, e, exc_info=True)
             raise RuntimeError(f"Could not build PDF: {e}")
 
-    @staticmethod
-    def _get_styles() -> StyleSheet1:
-        """Provide stylesheet (can be extended with custom styles)."""
-        try:
-            return getSampleStyleSheet()
-        except Exception as e:
-            logger.error(f"Styles loading error: {e}")
-            raise
+    def _record_output(self, template: DocumentTemplate, elapsed: float, size: int) -> None:
+        """Reports render time and output size per template and output profile."""
+        labels = {"template": template.key, "renderer": self.renderer.name, "profile": self.renderer.profile.key}
+        metrics.observe("pdf_render_seconds", elapsed, **labels)
+        metrics.observe("pdf_output_bytes", size, **labels)
+        logger.debug("Rendered %s in %.1f ms, %s bytes (%s)", template.key, elapsed * 1000, size, labels['profile'])
 
     @staticmethod
-    def _build_story(user: UserFromToken, styles: StyleSheet1) -> list[Flowable]:
-        """Construct document flowables."""
+    async def iter_chunks(
+            buffer: BinaryIO,
+            chunk_size: int = settings.PDF_STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """
+        Streams a rendered document in fixed-size chunks and closes the buffer afterwards.
+        Avoids materializing a second full copy of the document (as getvalue() would).
+        """
         try:
-            dob = (
-                user.date_of_birth.strftime("%Y-%m-%d")
-                if user.date_of_birth
-                else "—"
-            )
-
-            return [
-                Paragraph("User Profile Information", styles["Title"]),
-                Spacer(1, 24),
-                Paragraph(f"<b>Name:</b> {user.name}", styles["BodyText"]),
-                Paragraph(f"<b>Surname:</b> {user.surname}", styles["BodyText"]),
-                Paragraph(f"<b>Email:</b> {user.email}", styles["BodyText"]),
-                Paragraph(f"<b>Date of Birth:</b> {dob}", styles["BodyText"]),
-            ]
-        except Exception as e:
-            logger.error(f"Story building error for user {user.id}: {e}")
-            raise
-
+            buffer.seek(0)
+            while chunk := buffer.read(chunk_size):
+                yield chunk
+        finally:
+            buffer.close()
+
+    @classmethod
+    def warm_up(cls, freeze_gc: bool = False) -> float:
+        """
+        Pays ReportLab's one-time costs (module imports, lazily loaded font metrics,
+        stylesheet creation, first-use code paths) by rendering a throwaway document. Idempotent.
+        Every registered template is rendered once, so its compiled form (and recorded layout) is ready.
+
+        When called in a parent process before forking workers, pass freeze_gc=True:
+        the warm objects are moved out of GC tracking so children keep sharing
+        their memory pages copy-on-write instead of dirtying them on collection.
+
+        Returns the time spent in seconds (0 if already warm).
+        """
+        if cls._warmed_up:
+            return 0.0
+
+        started = time.perf_counter()
+        service = cls()
+        for template in service.templates:
+            service.generate_pdf(WARMUP_USER, template).close()
+        cls._warmed_up = True
+
+        if freeze_gc:
+            gc.collect()
+            gc.freeze()
+
+        elapsed = time.perf_counter() - started
+        logger.info("PDF renderer warmed up in %.1f ms", elapsed * 1000)
+        return elapsed
 
 
 class QueueService:
@@ -75,31 +120,116 @@ class QueueService:
     Service for interacting with AWS SQS.
     """
 
-    def __init__(self, session: aioboto3.Session):
-        self.session = session
-        self.endpoint_url = settings.AWS_ENDPOINT_URL
-        self.region_name = settings.AWS_DEFAULT_REGION
+    # Queue URLs never change for a queue name, so they are resolved once per process.
+    _queue_urls: Dict[str, str] = {}
+
+    def __init__(self, clients: AWSClients):
+        self.clients = clients
         self.queue_name = settings.SQS_QUEUE_NAME
 
     async def _get_queue_url(self, sqs_client) -> str:
         """Retrieves the SQS Queue URL by its name."""
-        response = await sqs_client.get_queue_url(QueueName=self.queue_name)
-        return response["QueueUrl"]
-
-    async def send_generate_task(self, user: UserFromToken):
-        """Sends user data to the SQS queue for background processing."""
+        if self.queue_name not in self._queue_urls:
+            response = await sqs_client.get_queue_url(QueueName=self.queue_name)
+            self._queue_urls[self.queue_name] = response["QueueUrl"]
+        return self._queue_urls[self.queue_name]
+
+    async def send_generate_task(
+            self,
+            user: UserFromToken,
+            job_id: uuid.UUID | None = None,
+            template: DocumentTemplate | None = None,
+            priority: Priority = Priority.INTERACTIVE
+    ):
+        """
+        Sends user data to the SQS queue for background processing.
+        The job id, template key, priority and trace context travel as message attributes
+        so the body stays a plain user profile.
+        """
         try:
-            async with self.session.client(
-                    "sqs",
-                    endpoint_url=self.endpoint_url,
-                    region_name=self.region_name
-            ) as sqs:
-                queue_url = await self._get_queue_url(sqs)
+            sqs = await self.clients.client("sqs")
+            queue_url = await self._get_queue_url(sqs)
+            with tracer.span("sqs.send", queue=self.queue_name, priority=priority.value) as span:
+                attributes = {PRIORITY_ATTRIBUTE: {"DataType": "String", "StringValue": priority.value}}
+                if job_id is not None:
+                    attributes[JOB_ID_ATTRIBUTE] = {"DataType": "String", "StringValue": str(job_id)}
+                if template is not None:
+                    attributes[TEMPLATE_ATTRIBUTE] = {"DataType": "String", "StringValue": template.key}
+                if span.traceparent:
+                    attributes[TRACE_ATTRIBUTE] = {"DataType": "String", "StringValue": span.traceparent}
                 await sqs.send_message(
                     QueueUrl=queue_url,
-                    MessageBody=user.model_dump_json()
+                    MessageBody=user.model_dump_json(),
+                    MessageAttributes=attributes
                 )
-                logger.info(f"Task for user {user.id} sent to SQS")
+            logger.info("Task for user %s sent to SQS (%s)", user.id, priority.value)
         except Exception as e:
-            logger.error(f"Failed to send SQS message: {e}")
-            raise e
\ No newline at end of file
+            logger.error("Failed to send SQS message: %s", e)
+            raise e
+
+
+class JobService:
+    """
+    Tracks asynchronous PDF jobs and hands out presigned S3 links for finished documents,
+    so clients download straight from S3 instead of through the API.
+    """
+
+    def __init__(self, store: JobStore, clients: AWSClients):
+        self.store = store
+        self.clients = clients
+        self.bucket_name = settings.S3_BUCKET_NAME
+        self.public_endpoint_url = settings.S3_PUBLIC_ENDPOINT_URL or settings.AWS_ENDPOINT_URL
+
+    async def create_job(self, user_id: uuid.UUID) -> Job:
+        """Registers a new queued job."""
+        job = Job(id=uuid.uuid4(), user_id=user_id)
+        await self.store.put(job)
+        return job
+
+    async def update_job(self, job_id: uuid.UUID, status: JobStatus, **changes) -> Job | None:
+        """
+        Records a state transition; every move to PROCESSING counts as an attempt.
+        Returns None for unknown jobs.
+        """
+        job = await self.store.get(job_id)
+        if job is None:
+            logger.warning("Job %s not found, status %s not recorded", job_id, status.value)
+            return None
+
+        if status == JobStatus.PROCESSING:
+            changes["attempts"] = job.attempts + 1
+
+        job = job.model_copy(update={**changes, "status": status, "updated_at": datetime.now(timezone.utc)})
+        await self.store.put(job)
+        logger.info("Job %s is %s", job_id, status.value)
+        return job
+
+    async def get_job_status(self, job_id: uuid.UUID, user_id: uuid.UUID) -> JobResponse | None:
+        """
+        Returns the job status for its owner, with a presigned URL once the PDF is ready.
+        Jobs of other users are reported as missing.
+        """
+        job = await self.store.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+
+        download_url = None
+        if job.status == JobStatus.COMPLETED and job.s3_key:
+            download_url = await self.presigned_url(job.s3_key)
+
+        return JobResponse(
+            id=job.id,
+            status=job.status,
+            download_url=download_url,
+            error=job.error,
+            updated_at=job.updated_at
+        )
+
+    async def presigned_url(self, key: str) -> str:
+        """Creates a time-limited GET link for an object in the PDF bucket."""
+        s3 = await self.clients.client("s3", endpoint_url=self.public_endpoint_url)
+        return await s3.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket_name, "Key": key},
+            ExpiresIn=settings.PRESIGNED_URL_EXPIRE_SECONDS
+        )
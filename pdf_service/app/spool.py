@@ -0,0 +1,189 @@
+import hashlib
+import io
+import logging
+import mmap
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+from .core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SUFFIX = ".pdf"
+
+
+class MappedFile(io.RawIOBase):
+    """
+    Read-only file object over a memory-mapped spool entry. The HTTP client and botocore
+    accept file objects but not bare mmap or memoryview bodies; reads come from the page cache.
+    """
+
+    def __init__(self, mapping: mmap.mmap):
+        self._mapping = mapping
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._mapping.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._mapping.seek(offset, whence)
+        return self._mapping.tell()
+
+    def tell(self) -> int:
+        return self._mapping.tell()
+
+    def __len__(self) -> int:
+        return len(self._mapping)
+
+
+class RenderSpool:
+    """
+    Bounded directory of rendered documents keyed by a content fingerprint, so each
+    document is rendered once even when its upload fails or its message is delivered again.
+
+    Entries are written atomically and evicted least recently used first, once unused for
+    max_age seconds or while the spool exceeds max_bytes. Pinned entries (documents still being
+    uploaded) are never evicted; pins are counted, so each pin() needs its own unpin().
+    Pass pin=True to contains() or put() to pin an entry under the lock that finds or adds it,
+    before a concurrent eviction can remove it. The index is rebuilt from the directory on start, so a
+    persistent volume keeps the spool across restarts. Thread-safe.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_age: float):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._entries: OrderedDict[str, Tuple[float, int]] = OrderedDict()
+        self._pinned: Dict[str, int] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def from_settings(cls) -> "RenderSpool | None":
+        """Builds the spool configured by SPOOL_* settings, or None when SPOOL_DIR is unset."""
+        if not settings.SPOOL_DIR:
+            return None
+        return cls(settings.SPOOL_DIR, settings.SPOOL_MAX_BYTES, settings.SPOOL_MAX_AGE_SECONDS)
+
+    @staticmethod
+    def fingerprint(*parts: str) -> str:
+        """Key of the document rendered from the given inputs (template, output profile, message body)."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}{SUFFIX}"
+
+    def _load(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for path in self.directory.iterdir():
+            if path.suffix == ".tmp":
+                # Left behind by a write that never completed
+                path.unlink(missing_ok=True)
+            elif path.suffix == SUFFIX:
+                stat = path.stat()
+                entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for used_at, key, size in sorted(entries):
+            self._entries[key] = (used_at, size)
+            self._size += size
+        self.evict()
+
+    def contains(self, key: str, pin: bool = False) -> bool:
+        """True if the document is spooled and fresh (and then pinned if `pin`); counts as a use for eviction."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry[0] > self.max_age:
+                return False
+            try:
+                # Keeps the recency order across restarts
+                os.utime(self.path(key))
+            except FileNotFoundError:
+                del self._entries[key]
+                self._size -= entry[1]
+                return False
+            self._entries[key] = (time.time(), entry[1])
+            self._entries.move_to_end(key)
+            if pin:
+                self._pin(key)
+            return True
+
+    def put(self, key: str, data, pin: bool = False) -> None:
+        """Stores a rendered document (bytes-like), pinned if `pin`, then evicts entries over the limits. Blocking."""
+        fd, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                size = file.write(data)
+            os.replace(temporary, self.path(key))
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            _, previous = self._entries.pop(key, (0.0, 0))
+            self._entries[key] = (time.time(), size)
+            self._size += size - previous
+            if pin:
+                self._pin(key)
+        self.evict()
+
+    @contextmanager
+    def open(self, key: str) -> Iterator[MappedFile]:
+        """Maps a spooled document for reading; evicting it meanwhile does not affect the reader."""
+        with open(self.path(key), "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            yield MappedFile(mapping)
+
+    def pin(self, key: str) -> None:
+        with self._lock:
+            self._pin(key)
+
+    def unpin(self, key: str) -> None:
+        """Releases one pin; the entry can be evicted again once every pin is released."""
+        with self._lock:
+            count = self._pinned.get(key, 0) - 1
+            if count > 0:
+                self._pinned[key] = count
+            else:
+                self._pinned.pop(key, None)
+
+    def _pin(self, key: str) -> None:
+        self._pinned[key] = self._pinned.get(key, 0) + 1
+
+    def evict(self) -> int:
+        """Removes expired entries, then the least recently used ones until the spool fits max_bytes."""
+        now = time.time()
+        removed = []
+        with self._lock:
+            for key, (used_at, size) in list(self._entries.items()):
+                if now - used_at <= self.max_age and self._size <= self.max_bytes:
+                    break
+                if key in self._pinned:
+                    continue
+                del self._entries[key]
+                self._size -= size
+                self.path(key).unlink(missing_ok=True)
+                removed.append(key)
+        if removed:
+            logger.debug("Evicted %s spooled documents, %s bytes left", len(removed), self._size)
+        return len(removed)
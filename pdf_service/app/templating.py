@@ -0,0 +1,278 @@
+import logging
+import string
+import threading
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Literal, Mapping
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from .core.config import settings
+from .output import OutputProfile, output_profile
+
+if TYPE_CHECKING:
+    from reportlab.lib.styles import ParagraphStyle, StyleSheet1
+    from reportlab.platypus import Flowable
+
+logger = logging.getLogger(__name__)
+
+BUNDLED_TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+# Values a template may reference as {placeholders}; see profile_fields().
+TEMPLATE_FIELDS = frozenset({"id", "name", "surname", "email", "date_of_birth"})
+
+FlowableFactory = Callable[[Mapping[str, str]], "Flowable"]
+
+
+class TemplateError(Exception):
+    """
+    Raised when a template definition is invalid.
+    """
+
+
+class TemplateNotFoundError(Exception):
+    """
+    Raised when no template matches the requested name and version.
+    """
+
+
+class StyleSpec(BaseModel):
+    """
+    Paragraph style derived from one of ReportLab's sample styles.
+    Any other key is passed to ParagraphStyle (fontSize, leading, textColor, ...).
+    """
+    model_config = ConfigDict(extra="allow")
+
+    parent: str = "BodyText"
+
+
+class ElementSpec(BaseModel):
+    """
+    One block of the document. Paragraph text is ReportLab markup with {field} placeholders.
+    """
+    type: Literal["paragraph", "spacer"]
+    text: str = ""
+    style: str = "BodyText"
+    height: float = 0
+
+
+class TemplateSpec(BaseModel):
+    """
+    Declarative document template, loaded from a JSON file.
+    """
+    name: str = Field(..., pattern=r"^[a-z0-9][a-z0-9_-]*$")
+    version: int = Field(..., ge=1)
+    description: str = ""
+    title: str = "Profile_{surname}"
+    date_format: str = "%Y-%m-%d"
+    styles: Dict[str, StyleSpec] = {}
+    elements: List[ElementSpec]
+
+
+@cache
+def base_styles() -> "StyleSheet1":
+    """ReportLab's sample stylesheet, which template styles extend. Built once per process."""
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    return getSampleStyleSheet()
+
+
+def placeholders(text: str) -> set[str]:
+    """Returns the {field} names used in a format string."""
+    return {field for _, field, _, _ in string.Formatter().parse(text) if field}
+
+
+def profile_fields(user, date_format: str) -> Dict[str, str]:
+    """Values available to templates for a user profile."""
+    return {
+        "id": str(user.id),
+        "name": user.name,
+        "surname": user.surname,
+        "email": user.email,
+        "date_of_birth": user.date_of_birth.strftime(date_format) if user.date_of_birth else "—",
+    }
+
+
+class DocumentTemplate:
+    """
+    A template compiled into reusable flowable factories.
+
+    Markup is parsed once, on first use: static paragraphs reuse their parsed fragments
+    and dynamic ones only substitute field values into the fragments that hold placeholders,
+    so rendering never re-parses markup. Compiled state is read-only and shared across threads.
+    """
+
+    def __init__(self, spec: TemplateSpec, profile: OutputProfile = OutputProfile()):
+        self.spec = spec
+        self.profile = profile
+        self._factories: List[FlowableFactory] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.spec.name
+
+    @property
+    def version(self) -> int:
+        return self.spec.version
+
+    @property
+    def key(self) -> str:
+        """Identifies the exact template revision; part of every cache and storage key."""
+        return f"{self.spec.name}@{self.spec.version}"
+
+    def object_key(self, user_id) -> str:
+        """Storage key of a user's document rendered with this template revision."""
+        return f"{self.spec.name}/v{self.spec.version}/profile_{user_id}.pdf"
+
+    def fields(self, user) -> Dict[str, str]:
+        return profile_fields(user, self.spec.date_format)
+
+    def title(self, fields: Mapping[str, str]) -> str:
+        return self.spec.title.format_map(fields)
+
+    def build_story(self, fields: Mapping[str, str]) -> list["Flowable"]:
+        """Creates fresh flowables for one document."""
+        return [factory(fields) for factory in self.compile()]
+
+    def compile(self) -> List[FlowableFactory]:
+        """Compiles the template once; later calls return the cached factories."""
+        if self._factories is None:
+            with self._lock:
+                if self._factories is None:
+                    self._factories = self._compile()
+                    logger.info("Template %s compiled", self.key)
+        return self._factories
+
+    def _compile(self) -> List[FlowableFactory]:
+        styles = self._compile_styles()
+        factories = []
+        for element in self.spec.elements:
+            if element.type == "spacer":
+                factories.append(self._compile_spacer(element.height))
+            else:
+                if element.style not in styles:
+                    raise TemplateError(f"Template {self.key} uses unknown style '{element.style}'")
+                factories.append(self._compile_paragraph(element.text, styles[element.style]))
+        return factories
+
+    def _compile_styles(self) -> Dict[str, "ParagraphStyle"]:
+        from reportlab.lib.colors import toColor
+        from reportlab.lib.styles import ParagraphStyle
+
+        base = base_styles()
+        fonts = self.profile.font_map()
+        styles = {}
+        for name in base.byName:
+            style = base[name]
+            if getattr(style, "fontName", None) in fonts:
+                style = ParagraphStyle(name, parent=style, fontName=fonts[style.fontName])
+            styles[name] = style
+        for name, style in self.spec.styles.items():
+            if style.parent not in styles:
+                raise TemplateError(f"Style '{name}' of template {self.key} has unknown parent '{style.parent}'")
+            attributes: Dict[str, Any] = {
+                key: toColor(value) if key.lower().endswith("color") else value
+                for key, value in (style.model_extra or {}).items()
+            }
+            styles[name] = ParagraphStyle(f"{self.key}:{name}", parent=styles[style.parent], **attributes)
+        return styles
+
+    def _compile_paragraph(self, markup: str, style: "ParagraphStyle") -> FlowableFactory:
+        from reportlab.platypus import Paragraph
+
+        try:
+            frags = Paragraph(markup, style).frags
+        except ValueError as e:
+            raise TemplateError(f"Template {self.key} has invalid markup: {e}") from e
+        dynamic = [index for index, frag in enumerate(frags) if "{" in frag.text or "}" in frag.text]
+        if set().union(*(placeholders(frags[index].text) for index in dynamic)) != placeholders(markup):
+            raise TemplateError(f"Template {self.key}: placeholders are only allowed in text, not in tags")
+
+        if not dynamic:
+            return lambda fields: Paragraph(markup, style, frags=frags)
+
+        def build(fields: Mapping[str, str]) -> "Flowable":
+            rendered = list(frags)
+            for index in dynamic:
+                rendered[index] = frags[index].clone(text=frags[index].text.format_map(fields))
+            return Paragraph(markup, style, frags=rendered)
+
+        return build
+
+    @staticmethod
+    def _compile_spacer(height: float) -> FlowableFactory:
+        from reportlab.platypus import Spacer
+
+        return lambda fields: Spacer(1, height)
+
+
+class TemplateRegistry:
+    """
+    Holds every known template revision and selects one per request by name and version.
+    """
+
+    def __init__(self, specs: List[TemplateSpec], default_name: str, profile: OutputProfile = OutputProfile()):
+        self.default_name = default_name
+        self._templates: Dict[str, Dict[int, DocumentTemplate]] = {}
+        for spec in specs:
+            unknown = [field for element in spec.elements for field in placeholders(element.text) - TEMPLATE_FIELDS]
+            if unknown or placeholders(spec.title) - TEMPLATE_FIELDS:
+                raise TemplateError(f"Template {spec.name}@{spec.version} references unknown fields")
+            versions = self._templates.setdefault(spec.name, {})
+            if spec.version in versions:
+                raise TemplateError(f"Duplicate template {spec.name}@{spec.version}")
+            versions[spec.version] = DocumentTemplate(spec, profile)
+
+        if default_name not in self._templates:
+            raise TemplateError(f"Default template '{default_name}' is not defined")
+
+    @classmethod
+    def from_directory(
+        cls,
+        path: Path,
+        default_name: str,
+        profile: OutputProfile = OutputProfile()
+    ) -> "TemplateRegistry":
+        """Loads every *.json template definition in the directory."""
+        specs = []
+        for file in sorted(Path(path).glob("*.json")):
+            try:
+                specs.append(TemplateSpec.model_validate_json(file.read_bytes()))
+            except ValidationError as e:
+                raise TemplateError(f"Invalid template file {file.name}: {e}") from e
+        return cls(specs, default_name, profile)
+
+    @classmethod
+    def from_settings(cls) -> "TemplateRegistry":
+        """Builds a registry configured from application settings."""
+        return cls.from_directory(
+            Path(settings.PDF_TEMPLATES_DIR) if settings.PDF_TEMPLATES_DIR else BUNDLED_TEMPLATES_DIR,
+            default_name=settings.PDF_DEFAULT_TEMPLATE,
+            profile=output_profile
+        )
+
+    def get(self, name: str | None = None, version: int | None = None) -> DocumentTemplate:
+        """Returns the requested template revision; the latest version unless one is given."""
+        versions = self._templates.get(name or self.default_name)
+        if not versions:
+            raise TemplateNotFoundError(f"Unknown template '{name}'")
+        if version is None:
+            return versions[max(versions)]
+        if version not in versions:
+            raise TemplateNotFoundError(f"Template '{name}' has no version {version}")
+        return versions[version]
+
+    def get_by_key(self, key: str) -> DocumentTemplate:
+        """Resolves a key produced by DocumentTemplate.key, e.g. 'profile@1'."""
+        name, _, version = key.partition("@")
+        if not version.isdigit():
+            raise TemplateNotFoundError(f"Invalid template key '{key}'")
+        return self.get(name, int(version))
+
+    def __iter__(self):
+        for versions in self._templates.values():
+            yield from (versions[version] for version in sorted(versions))
+
+
+template_registry = TemplateRegistry.from_settings()
@@ -1,104 +1,566 @@
 import asyncio
-import json
+import io
 import logging
-import aioboto3
-from .services import PDFService
-from .schemas import UserFromToken
+import signal
+import time
+import uuid
+from contextlib import suppress
+from typing import Any, BinaryIO, Dict, List, Tuple
+import orjson
+from pydantic import ValidationError
+from .core.aws import AWSClients, aws_clients
+from .core.logs import configure_logging
+from .core.metrics import metrics
+from .core.tracing import tracer
+from .jobs import get_job_store
+from .scheduling import RenderScheduler
+from .spool import RenderSpool
+from .services import PDFService, JobService, JOB_ID_ATTRIBUTE, PRIORITY_ATTRIBUTE, TEMPLATE_ATTRIBUTE, TRACE_ATTRIBUTE
+from .templating import DocumentTemplate, TemplateNotFoundError
+from .schemas import UserFromToken, JobStatus, Priority
 from .core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of entries in one SQS batch call.
+SQS_BATCH_SIZE = 10
+
+# Part of WORKER_SHUTDOWN_TIMEOUT (at most half of it) kept for releasing messages and
+# flushing acks after unfinished renders are cancelled.
+SHUTDOWN_FLUSH_SECONDS = 3.0
+
+# Share of the visibility timeout background upload retries may use; the rest leaves room
+# for acking the message before SQS hands it to another consumer.
+UPLOAD_RETRY_WINDOW = 0.8
+
 
 class PDFWorker:
     """
     Background worker that consumes messages from SQS, generates PDF documents,
     and uploads them to an S3 bucket.
+
+    Received messages are buffered in a RenderScheduler, which hands them to a fixed
+    number of render loops by priority class and round-robin across users.
+
+    With a RenderSpool configured, rendered documents are kept on disk until uploaded:
+    a failed upload is retried in the background from the spooled file while the render
+    slot moves on, and a redelivered message reuses the spooled document. A pending upload
+    keeps its message's slot in the scheduler, so retries hold back receiving new messages.
     """
 
-    def __init__(self):
-        self.session = aioboto3.Session()
+    def __init__(self, clients: AWSClients = aws_clients):
+        self.clients = clients
         self.pdf_service = PDFService()
+        self.job_service = JobService(store=get_job_store(clients), clients=clients)
 
-        self.endpoint_url = settings.AWS_ENDPOINT_URL
-        self.region_name = settings.AWS_DEFAULT_REGION
         self.queue_name = settings.SQS_QUEUE_NAME
         self.bucket_name = settings.S3_BUCKET_NAME
+        self.scheduler: RenderScheduler[dict] = RenderScheduler(
+            capacity=settings.WORKER_BUFFER_SIZE,
+            interactive_burst=settings.WORKER_INTERACTIVE_BURST
+        )
+        self._stopping = asyncio.Event()
+        self.spool = RenderSpool.from_settings()
+        self._in_flight: Dict[str, dict] = {}
+        self._acks: List[str] = []
+        self._uploads: Dict[str, asyncio.Task] = {}
+        # SQS client and queue URL while serving, used to extend the visibility of deferred uploads
+        self._queue: Tuple[Any, str] | None = None
 
     async def _init_resources(self, sqs, s3):
         """
         Ensures that the required SQS queue and S3 bucket exist.
         Commonly used for local development with Localstack.
         """
-        logger.info(f"Checking resources: Queue='{self.queue_name}', Bucket='{self.bucket_name}'")
+        logger.info("Checking resources: Queue='%s', Bucket='%s'", self.queue_name, self.bucket_name)
         await sqs.create_queue(QueueName=self.queue_name)
         try:
             await s3.create_bucket(Bucket=self.bucket_name)
         except Exception:
             pass
 
+    async def _record_job(self, job_id: uuid.UUID | None, status: JobStatus, **changes) -> None:
+        """
+        Stores a job state transition. Tracking problems never fail the render itself.
+        """
+        if job_id is None:
+            return
+        try:
+            await self.job_service.update_job(job_id, status, **changes)
+        except Exception as e:
+            logger.warning("Could not record status %s for job %s: %s", status.value, job_id, e)
+
+    @staticmethod
+    def _get_job_id(msg) -> uuid.UUID | None:
+        """Reads the job id attribute set by QueueService (absent for older messages)."""
+        attribute = msg.get("MessageAttributes", {}).get(JOB_ID_ATTRIBUTE)
+        return uuid.UUID(attribute["StringValue"]) if attribute else None
+
+    def _get_template(self, msg) -> DocumentTemplate:
+        """Resolves the template chosen at request time (the default one for older messages)."""
+        attribute = msg.get("MessageAttributes", {}).get(TEMPLATE_ATTRIBUTE)
+        if attribute is None:
+            return self.pdf_service.templates.get()
+        return self.pdf_service.templates.get_by_key(attribute["StringValue"])
+
+    @staticmethod
+    def _get_priority(msg) -> Priority:
+        """Reads the priority set by QueueService; older or unknown values count as interactive."""
+        attribute = msg.get("MessageAttributes", {}).get(PRIORITY_ATTRIBUTE)
+        try:
+            return Priority(attribute["StringValue"]) if attribute else Priority.INTERACTIVE
+        except ValueError:
+            logger.warning("Unknown priority %r, scheduling as interactive", attribute['StringValue'])
+            return Priority.INTERACTIVE
+
+    @staticmethod
+    def _get_user_key(msg) -> str:
+        """Fairness key of a message: the user it renders for (malformed bodies fail later, in processing)."""
+        try:
+            return str(orjson.loads(msg["Body"])["id"])
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            return msg.get("MessageId", "")
+
+    @staticmethod
+    def _get_traceparent(msg) -> str | None:
+        """Reads the trace context of the request that queued the message, if it was traced."""
+        attribute = msg.get("MessageAttributes", {}).get(TRACE_ATTRIBUTE)
+        return attribute["StringValue"] if attribute else None
+
+    @staticmethod
+    def _get_receive_count(msg) -> int:
+        """How many times SQS has delivered the message, this delivery included (1 if unknown)."""
+        return int(msg.get("Attributes", {}).get("ApproximateReceiveCount", 1))
+
+    @staticmethod
+    def _get_queue_wait(msg) -> float | None:
+        """Seconds since SQS accepted the message: time spent in the queue and the local buffer."""
+        sent_at = msg.get("Attributes", {}).get("SentTimestamp")
+        return max(time.time() - int(sent_at) / 1000, 0.0) if sent_at else None
+
     async def process_message(self, msg, s3) -> None:
         """
         Parses the SQS message, triggers PDF generation, and stores the result in S3.
+        Job state transitions are recorded along the way.
+
+        The work is traced as a continuation of the request that queued the message,
+        and the message's queue wait is reported as pdf_queue_wait_seconds. With the spool
+        enabled, a failed upload is handed to a background retry instead of raising.
+
+        A malformed body or an unknown template (e.g. removed by a newer deploy) cannot succeed
+        on redelivery: the job is marked failed and the method returns, so the message is acked.
+        Any other failure re-raises, leaving the message for redelivery, and keeps the job queued with
+        the error. On the WORKER_MAX_RECEIVES-th delivery the job is marked failed instead and
+        the method returns, so the message is acked rather than redelivered forever.
         """
-        try:
-            body = json.loads(msg["Body"])
-            user = UserFromToken(**body)
+        job_id = self._get_job_id(msg)
+        priority = self._get_priority(msg)
+        queue_wait = self._get_queue_wait(msg)
+        if queue_wait is not None:
+            metrics.observe("pdf_queue_wait_seconds", queue_wait, priority=priority.value)
+
+        with tracer.span("job.process", parent=self._get_traceparent(msg), job_id=str(job_id), priority=priority.value,
+                         queue_wait_seconds=queue_wait):
+            try:
+                await self._record_job(job_id, JobStatus.PROCESSING)
+
+                user = UserFromToken.model_validate_json(msg["Body"])
+                template = self._get_template(msg)
+                file_name = template.object_key(user.id)
+
+                if self.spool is None:
+                    logger.info("Generating PDF for user: %s", user.email)
+                    pdf_buffer = await asyncio.to_thread(self.pdf_service.generate_pdf, user, template)
+                    await self._upload(s3, file_name, pdf_buffer)
+                else:
+                    key = await self._spool_pdf(msg, user, template)
+                    try:
+                        with self.spool.open(key) as body:
+                            await self._upload(s3, file_name, body)
+                    except Exception as e:
+                        logger.warning("Upload of %s failed, retrying in the background: %s", file_name, e)
+                        self._defer_upload(msg, s3, key, file_name, job_id, e)
+                        return
+                    finally:
+                        self.spool.unpin(key)
+                await self._record_job(job_id, JobStatus.COMPLETED, s3_key=file_name, error=None)
 
-            logger.info(f"Generating PDF for user: {user.email}")
-            pdf_buffer = self.pdf_service.generate_pdf(user)
+            except (ValidationError, TemplateNotFoundError) as e:
+                logger.error("Dropping message that cannot be processed: %s", e)
+                await self._record_job(job_id, JobStatus.FAILED, error=str(e))
+
+            except Exception as e:
+                receive_count = self._get_receive_count(msg)
+                if receive_count < settings.WORKER_MAX_RECEIVES:
+                    logger.warning("Failed to process message, it will be redelivered: %s", e, exc_info=True)
+                    await self._record_job(job_id, JobStatus.QUEUED, error=str(e))
+                    raise
+                logger.error("Giving up on message after %s deliveries: %s", receive_count, e, exc_info=True)
+                await self._record_job(job_id, JobStatus.FAILED, error=str(e))
+
+    def _fingerprint(self, msg, template: DocumentTemplate) -> str:
+        """Spool key of a message's document: the same profile, template and output profile give the same PDF."""
+        renderer = self.pdf_service.renderer
+        return self.spool.fingerprint(template.key, renderer.name, renderer.profile.key, msg["Body"])
+
+    async def _spool_pdf(self, msg, user: UserFromToken, template: DocumentTemplate) -> str:
+        """
+        Renders the message's document into the spool unless it is already there; returns its key.
+        The entry is pinned, so it cannot be evicted before it is read; the caller unpins it.
+        """
+        key = self._fingerprint(msg, template)
+        spooled = self.spool.contains(key, pin=True)
+        metrics.observe("pdf_spool_hit", int(spooled), template=template.key)
+        if not spooled:
+            logger.info("Generating PDF for user: %s", user.email)
+            pdf_buffer = await asyncio.to_thread(self.pdf_service.generate_pdf, user, template)
+            await asyncio.to_thread(self.spool.put, key, pdf_buffer.getbuffer(), pin=True)
+        return key
 
-            file_name = f"profile_{user.id}.pdf"
+    async def _upload(self, s3, file_name: str, body: BinaryIO) -> None:
+        """Stores a rendered document in the bucket."""
+        size = body.seek(0, io.SEEK_END)
+        body.seek(0)
+        with tracer.span("s3.put", bucket=self.bucket_name, key=file_name, size=size):
             await s3.put_object(
                 Bucket=self.bucket_name,
                 Key=file_name,
-                Body=pdf_buffer.getvalue(),
+                Body=body,
                 ContentType="application/pdf"
             )
-            logger.info(f"Successfully uploaded {file_name} to S3")
+        logger.info("Successfully uploaded %s to S3 (%s bytes)", file_name, size)
 
+    def _defer_upload(self, msg, s3, key: str, file_name: str, job_id: uuid.UUID | None, error: Exception) -> None:
+        """
+        Hands a failed upload to a background task, so the render slot moves on to the next message.
+        The message keeps a scheduler slot until the task ends.
+        """
+        handle = msg["ReceiptHandle"]
+        self.spool.pin(key)
+        self.scheduler.hold()
+        task = asyncio.create_task(self._retry_upload(msg, s3, key, file_name, job_id, error))
+        self._uploads[handle] = task
+        task.add_done_callback(lambda _: self._uploads.pop(handle, None))
+
+    async def _retry_upload(self, msg, s3, key: str, file_name: str, job_id: uuid.UUID | None,
+                            error: Exception) -> None:
+        """
+        Retries the upload of a spooled document with exponential backoff and acks the message
+        once it succeeds. The message's visibility timeout is first extended to a full
+        WORKER_VISIBILITY_TIMEOUT, and retries stop before they would outlast it, so the message
+        is never redelivered while this worker still uploads it.
+
+        When the retries run out, the outcome follows process_message(): the job is kept queued
+        with the error and the message left for redelivery, which uploads from the spool again,
+        or, on the WORKER_MAX_RECEIVES-th delivery, the job is marked failed and the message acked.
+        Until then the message stays in flight, so a shutdown releases it. If the visibility
+        timeout cannot be extended, the message is left for redelivery at once and the job
+        kept queued with the error.
+        """
+        handle = msg["ReceiptHandle"]
+        delay = settings.SPOOL_RETRY_BACKOFF_SECONDS
+        deadline = time.monotonic() + settings.WORKER_VISIBILITY_TIMEOUT * UPLOAD_RETRY_WINDOW
+        try:
+            if not await self._extend_visibility(msg):
+                # Another consumer may already hold the message; its delivery uploads from the spool
+                await self._record_job(job_id, JobStatus.QUEUED, error=str(error))
+                self._in_flight.pop(handle, None)
+                return
+            uploaded = False
+            for attempt in range(1, settings.SPOOL_UPLOAD_ATTEMPTS + 1):
+                if time.monotonic() + delay >= deadline:
+                    break
+                await self._pause(delay)
+                if self._stopping.is_set():
+                    return
+                try:
+                    await asyncio.wait_for(self._upload_spooled(s3, key, file_name), deadline - time.monotonic())
+                except asyncio.TimeoutError:
+                    error = TimeoutError(f"Upload of {file_name} did not finish within the visibility timeout")
+                    logger.warning("Upload retry %s of %s failed: %s", attempt, file_name, error)
+                    break
+                except Exception as e:
+                    logger.warning("Upload retry %s of %s failed: %s", attempt, file_name, e)
+                    error = e
+                    delay = min(delay * 2, settings.SPOOL_RETRY_BACKOFF_MAX_SECONDS)
+                    continue
+                uploaded = True
+                break
+
+            if uploaded:
+                await self._record_job(job_id, JobStatus.COMPLETED, s3_key=file_name, error=None)
+                self._acks.append(handle)
+            else:
+                await self._give_up_upload(msg, file_name, job_id, error)
+            self._in_flight.pop(handle, None)
+        finally:
+            self.spool.unpin(key)
+            await self.scheduler.release_hold()
+
+    async def _upload_spooled(self, s3, key: str, file_name: str) -> None:
+        """Stores a spooled document in the bucket."""
+        with self.spool.open(key) as body:
+            await self._upload(s3, file_name, body)
+
+    async def _give_up_upload(self, msg, file_name: str, job_id: uuid.UUID | None, error: Exception) -> None:
+        """Leaves the message for redelivery with the job queued, or fails and acks it on its last delivery."""
+        receive_count = self._get_receive_count(msg)
+        if receive_count < settings.WORKER_MAX_RECEIVES:
+            logger.warning("Giving up on uploading %s, the message will be redelivered: %s", file_name, error)
+            await self._record_job(job_id, JobStatus.QUEUED, error=str(error))
+            return
+        logger.error("Giving up on uploading %s after %s deliveries: %s", file_name, receive_count, error)
+        await self._record_job(job_id, JobStatus.FAILED, error=str(error))
+        self._acks.append(msg["ReceiptHandle"])
+
+    async def _extend_visibility(self, msg) -> bool:
+        """
+        Restarts the message's visibility timeout. Returns False if SQS rejects the receipt
+        handle, e.g. because the message already became visible to other consumers.
+        """
+        if self._queue is None:
+            return True
+        sqs, queue_url = self._queue
+        try:
+            await sqs.change_message_visibility(
+                QueueUrl=queue_url,
+                ReceiptHandle=msg["ReceiptHandle"],
+                VisibilityTimeout=settings.WORKER_VISIBILITY_TIMEOUT
+            )
         except Exception as e:
-            logger.error(f"Failed to process message: {e}", exc_info=True)
-            raise
+            logger.warning("Could not extend the visibility of a message with a pending upload: %s", e)
+            return False
+        return True
 
     async def run(self):
         """
         Starts the worker's main loop to poll messages from the SQS queue.
+        SIGTERM and SIGINT start a graceful shutdown (see serve()).
         """
-        async with self.session.client("sqs", endpoint_url=self.endpoint_url, region_name=self.region_name) as sqs, \
-                self.session.client("s3", endpoint_url=self.endpoint_url, region_name=self.region_name) as s3:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stop)
 
+        try:
+            sqs = await self.clients.client("sqs")
+            s3 = await self.clients.client("s3")
             await self._init_resources(sqs, s3)
 
+            if settings.PDF_WARMUP != "off":
+                self.pdf_service.warm_up()
+
             queue_data = await sqs.get_queue_url(QueueName=self.queue_name)
             queue_url = queue_data['QueueUrl']
 
-            logger.info(f"PDF Worker is running. Polling: {queue_url}")
+            logger.info(
+                "PDF Worker is running. Polling: %s (%s render slots, buffer of %s)",
+                queue_url, settings.WORKER_RENDER_CONCURRENCY, self.scheduler.capacity
+            )
+            await self.serve(sqs, s3, queue_url)
+        finally:
+            await self.clients.close()
 
-            while True:
-                try:
-                    response = await sqs.receive_message(
-                        QueueUrl=queue_url,
-                        WaitTimeSeconds=10,
-                        MaxNumberOfMessages=1
-                    )
+    def stop(self) -> None:
+        """Starts a graceful shutdown: no new messages are received."""
+        if not self._stopping.is_set():
+            logger.info("Shutdown requested, draining in-flight messages")
+            self._stopping.set()
+
+    async def serve(self, sqs, s3, queue_url: str) -> None:
+        """
+        Receives and renders messages until stop() is called, keeping the visibility of held
+        messages extended, then drains within WORKER_SHUTDOWN_TIMEOUT seconds:
+        buffered messages that were never started are released right away, in-flight
+        ones get the deadline minus SHUTDOWN_FLUSH_SECONDS to finish and are released if
+        they do not (as are messages whose upload is still being retried), and pending acks
+        are flushed. Released messages get their visibility reset to 0, so another worker
+        picks them up immediately instead of after the visibility timeout. SQS calls still
+        pending at the deadline are abandoned: those messages reappear after their
+        visibility timeout.
+        """
+        self._queue = (sqs, queue_url)
+        render_loops = [
+            asyncio.create_task(self._render_loop(s3))
+            for _ in range(settings.WORKER_RENDER_CONCURRENCY)
+        ]
+        ack_loop = asyncio.create_task(self._ack_loop(sqs, queue_url))
+        visibility_loop = asyncio.create_task(self._visibility_loop(sqs, queue_url))
+        try:
+            await self._receive_loop(sqs, queue_url)
+        finally:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + settings.WORKER_SHUTDOWN_TIMEOUT
+            flush_reserve = min(SHUTDOWN_FLUSH_SECONDS, settings.WORKER_SHUTDOWN_TIMEOUT / 2)
+            visibility_loop.cancel()
+            await self._before(deadline, self._release(sqs, queue_url, self.scheduler.drain()), "releasing buffered messages")
+
+            _, unfinished = await asyncio.wait(render_loops, timeout=max(deadline - flush_reserve - loop.time(), 0))
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+            uploads = list(self._uploads.values())
+            for task in uploads:
+                task.cancel()
+            await asyncio.gather(*uploads, return_exceptions=True)
+            await self._before(deadline, self._release(sqs, queue_url, list(self._in_flight.values())),
+                               "releasing in-flight messages")
 
-                    if "Messages" not in response:
-                        continue
+            ack_loop.cancel()
+            await self._before(deadline, self._flush_acks(sqs, queue_url), "flushing acks")
+            logger.info("PDF Worker stopped")
 
-                    for msg in response["Messages"]:
-                        await self.process_message(msg, s3)
+    @staticmethod
+    async def _before(deadline: float, awaitable, action: str) -> None:
+        """Awaits a shutdown step, abandoning it once the event loop clock passes the deadline."""
+        try:
+            await asyncio.wait_for(awaitable, max(deadline - asyncio.get_running_loop().time(), 0))
+        except asyncio.TimeoutError:
+            logger.error("Shutdown deadline passed while %s", action)
+
+    async def _unless_stopping(self, awaitable):
+        """Awaits the awaitable unless shutdown starts first, in which case it is cancelled and None returned."""
+        task = asyncio.ensure_future(awaitable)
+        stopping = asyncio.ensure_future(self._stopping.wait())
+        await asyncio.wait({task, stopping}, return_when=asyncio.FIRST_COMPLETED)
+        stopping.cancel()
+        if task.done():
+            return task.result()
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+        return None
+
+    async def _pause(self, seconds: float) -> None:
+        """Backs off after an error; returns early on shutdown."""
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+
+    async def _receive_loop(self, sqs, queue_url: str) -> None:
+        """
+        Polls SQS while the scheduler has room, so messages are only taken off the
+        queue (and their visibility timeout started) when they can be buffered.
+        Messages whose upload is still being retried count against that room.
+        Returns once shutdown starts; a long poll in progress is abandoned.
+        """
+        while not self._stopping.is_set():
+            try:
+                await self._unless_stopping(self.scheduler.wait_for_space())
+                if self._stopping.is_set():
+                    break
+                response = await self._unless_stopping(sqs.receive_message(
+                    QueueUrl=queue_url,
+                    WaitTimeSeconds=10,
+                    MaxNumberOfMessages=max(1, min(self.scheduler.free_slots, 10)),
+                    VisibilityTimeout=settings.WORKER_VISIBILITY_TIMEOUT,
+                    MessageSystemAttributeNames=["SentTimestamp", "ApproximateReceiveCount"],
+                    MessageAttributeNames=[JOB_ID_ATTRIBUTE, TEMPLATE_ATTRIBUTE, PRIORITY_ATTRIBUTE, TRACE_ATTRIBUTE]
+                ))
+
+                for msg in (response or {}).get("Messages", []):
+                    await self.scheduler.put(msg, self._get_priority(msg), self._get_user_key(msg))
+
+            except Exception as e:
+                logger.error("Error in receive loop: %s", e)
+                await self._pause(5)
 
-                        await sqs.delete_message(
-                            QueueUrl=queue_url,
-                            ReceiptHandle=msg["ReceiptHandle"]
-                        )
+    async def _render_loop(self, s3) -> None:
+        """
+        Processes scheduled messages one at a time until shutdown. Failed messages are
+        not acked, so SQS redelivers them after the visibility timeout.
+        """
+        while not self._stopping.is_set():
+            msg = await self._unless_stopping(self.scheduler.get())
+            if msg is None:
+                return
 
+            self._in_flight[msg["ReceiptHandle"]] = msg
+            try:
+                await self.process_message(msg, s3)
+                if msg["ReceiptHandle"] in self._uploads:
+                    # Still in flight: the background upload acks the message when it succeeds
+                    continue
+                self._acks.append(msg["ReceiptHandle"])
+            except Exception as e:
+                logger.error("Error in render loop: %s", e)
+                await self._pause(5)
+            # Cancelled renders stay in flight, so shutdown can release them.
+            self._in_flight.pop(msg["ReceiptHandle"], None)
+
+    async def _ack_loop(self, sqs, queue_url: str) -> None:
+        """Deletes processed messages in batches of up to 10, every WORKER_ACK_INTERVAL seconds."""
+        while True:
+            await asyncio.sleep(settings.WORKER_ACK_INTERVAL)
+            await self._flush_acks(sqs, queue_url)
+
+    async def _visibility_loop(self, sqs, queue_url: str) -> None:
+        """
+        Keeps buffered and in-flight messages hidden from other consumers: every third of
+        WORKER_VISIBILITY_TIMEOUT their visibility timeout is restarted, so messages waiting
+        behind others in the buffer, or in a long render, are not redelivered meanwhile.
+        """
+        while True:
+            await asyncio.sleep(settings.WORKER_VISIBILITY_TIMEOUT / 3)
+            messages = self.scheduler.items() + list(self._in_flight.values())
+            for start in range(0, len(messages), SQS_BATCH_SIZE):
+                batch = messages[start:start + SQS_BATCH_SIZE]
+                try:
+                    response = await sqs.change_message_visibility_batch(
+                        QueueUrl=queue_url,
+                        Entries=[
+                            {
+                                "Id": str(index),
+                                "ReceiptHandle": msg["ReceiptHandle"],
+                                "VisibilityTimeout": settings.WORKER_VISIBILITY_TIMEOUT
+                            }
+                            for index, msg in enumerate(batch)
+                        ]
+                    )
                 except Exception as e:
-                    logger.error(f"Error in main loop: {e}")
-                    await asyncio.sleep(5)
+                    logger.error("Could not extend the visibility of %s messages: %s", len(batch), e)
+                    continue
+                for failure in response.get("Failed", []):
+                    logger.warning("Visibility of a held message was not extended, it may be redelivered: %s",
+                                   failure.get('Message'))
+
+    async def _flush_acks(self, sqs, queue_url: str) -> None:
+        """Deletes every pending ack; a failed batch is kept for the next flush."""
+        while self._acks:
+            batch = self._acks[:SQS_BATCH_SIZE]
+            try:
+                response = await sqs.delete_message_batch(
+                    QueueUrl=queue_url,
+                    Entries=[{"Id": str(index), "ReceiptHandle": handle} for index, handle in enumerate(batch)]
+                )
+            except Exception as e:
+                logger.error("Could not delete %s processed messages: %s", len(batch), e)
+                return
+            del self._acks[:len(batch)]
+            for failure in response.get("Failed", []):
+                logger.warning("Processed message was not deleted and may be redelivered: %s", failure.get('Message'))
+
+    async def _release(self, sqs, queue_url: str, messages: list) -> None:
+        """Makes messages this worker will not finish visible to other consumers again."""
+        for start in range(0, len(messages), SQS_BATCH_SIZE):
+            batch = messages[start:start + SQS_BATCH_SIZE]
+            try:
+                await sqs.change_message_visibility_batch(
+                    QueueUrl=queue_url,
+                    Entries=[
+                        {"Id": str(index), "ReceiptHandle": msg["ReceiptHandle"], "VisibilityTimeout": 0}
+                        for index, msg in enumerate(batch)
+                    ]
+                )
+            except Exception as e:
+                logger.error("Could not release %s messages, they reappear after the visibility timeout: %s", len(batch), e)
+                continue
+            for msg in batch:
+                await self._record_job(self._get_job_id(msg), JobStatus.QUEUED)
+        if messages:
+            logger.info("Released %s unfinished messages back to the queue", len(messages))
 
 
 if __name__ == "__main__":
+    configure_logging("pdf_worker")
     worker = PDFWorker()
     try:
         asyncio.run(worker.run())
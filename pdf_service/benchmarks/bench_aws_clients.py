@@ -0,0 +1,105 @@
+"""
+AWS client benchmark.
+
+Uploads documents concurrently to a local fake S3 endpoint (with simulated latency)
+and compares a new client per call (the previous per-request pattern), a shared
+client with botocore's default pool of 10 connections, and the tuned shared client:
+
+    python -m benchmarks.bench_aws_clients --uploads 200 --concurrency 50 --latency-ms 20
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from aiohttp import web
+
+from app.core.aws import AWSClients
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+async def start_fake_s3(latency: float) -> tuple[web.AppRunner, str]:
+    async def put_object(request):
+        await request.read()
+        await asyncio.sleep(latency)
+        return web.Response(headers={"ETag": '"0"'})
+
+    app = web.Application()
+    app.router.add_put("/{bucket}/{key:.*}", put_object)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+
+async def upload_all(get_client, args, body: bytes) -> float:
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def upload(index: int):
+        async with semaphore, get_client() as s3:
+            await s3.put_object(Bucket="user-pdfs", Key=f"bench/{index}.pdf", Body=body)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(upload(index) for index in range(args.uploads)))
+    return time.perf_counter() - started
+
+
+class Shared:
+    """Async context manager handing out one shared client."""
+
+    def __init__(self, clients: AWSClients, endpoint_url: str):
+        self.clients, self.endpoint_url = clients, endpoint_url
+
+    async def __aenter__(self):
+        return await self.clients.client("s3", endpoint_url=self.endpoint_url)
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+def pool_report() -> str:
+    values = {m["name"]: m for m in metrics.snapshot() if m["labels"] == {"service": "s3"}}
+    reused = values.get("aws_connection_reused", {})
+    waits = values.get("aws_pool_wait_seconds", {"count": 0})
+    mean_wait = waits.get("mean", 0) * 1000
+    return f"reuse {reused.get('mean', 0):.0%}, {waits['count']} pool waits (mean {mean_wait:.1f} ms)"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare AWS client setups for concurrent uploads.")
+    parser.add_argument("--uploads", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--size-kb", type=int, default=2)
+    args = parser.parse_args()
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+    runner, endpoint_url = await start_fake_s3(args.latency_ms / 1000)
+    body = os.urandom(args.size_kb * 1024)
+    tuned_pool = settings.AWS_MAX_POOL_CONNECTIONS
+
+    print(f"{'setup':<22}{'uploads/s':>11}   connections")
+    for name, pool_size, shared in [("client per upload", 10, False), ("shared, pool 10", 10, True),
+                                    (f"shared, pool {tuned_pool}", tuned_pool, True)]:
+        settings.AWS_MAX_POOL_CONNECTIONS = pool_size
+        metrics.reset()
+        clients = AWSClients()
+        if shared:
+            get_client = lambda: Shared(clients, endpoint_url)
+        else:
+            get_client = lambda: clients.session.client(
+                "s3", endpoint_url=endpoint_url, region_name=settings.AWS_DEFAULT_REGION, config=clients.config("s3")
+            )
+        elapsed = await upload_all(get_client, args, body)
+        await clients.close()
+        print(f"{name:<22}{args.uploads / elapsed:>11,.0f}   {pool_report()}")
+
+    settings.AWS_MAX_POOL_CONNECTIONS = tuned_pool
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+"""
+Logging pipeline benchmark.
+
+Logs the worker's per-job messages from an asyncio task and compares how long each
+call holds the event loop: the previous style (f-strings formatted by the caller,
+written synchronously by a StreamHandler) against the pipeline set up by
+configure_logging (lazy %-style arguments, records queued and formatted as JSON
+by the listener thread), without and with sampling of INFO records:
+
+    python -m benchmarks.bench_logging --events 100000 --sample-rate 0.1
+
+Caller numbers are what the event loop pays; "drain" is the time the listener
+still needs after the last call to write the queued records out.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+from app.core.logs import JSONFormatter, TEXT_FORMAT, queue_pipeline
+
+LOGGER_NAME = "app.worker"
+
+
+async def log_eager(logger: logging.Logger, job_id: str, user_id: str) -> None:
+    logger.info(f"Task for user {user_id} sent to SQS (interactive)")
+    logger.info(f"Job {job_id} is done")
+
+
+async def log_lazy(logger: logging.Logger, job_id: str, user_id: str) -> None:
+    logger.info("Task for user %s sent to SQS (%s)", user_id, "interactive")
+    logger.info("Job %s is %s", job_id, "done")
+
+
+async def run_case(log, handler: logging.Handler, listener, events: int) -> tuple[list[float], float, float]:
+    """Returns per-event call durations, the caller's wall time and the drain time (seconds)."""
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if listener is not None:
+        listener.start()
+
+    ids = [(str(uuid.uuid4()), str(uuid.uuid4())) for _ in range(1000)]
+    durations: list[float] = []
+    started = time.perf_counter()
+    for index in range(events):
+        job_id, user_id = ids[index % len(ids)]
+        call_started = time.perf_counter()
+        await log(logger, job_id, user_id)
+        durations.append(time.perf_counter() - call_started)
+        if index % 100 == 0:
+            await asyncio.sleep(0)
+    wall = time.perf_counter() - started
+
+    drain_started = time.perf_counter()
+    if listener is not None:
+        listener.stop()
+    handler.flush()
+    return durations, wall, time.perf_counter() - drain_started
+
+
+def file_handler(path: str, formatter: logging.Formatter) -> logging.Handler:
+    handler = logging.FileHandler(path, mode="w", encoding="utf-8")
+    handler.setFormatter(formatter)
+    return handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare synchronous and queued logging on the event loop.")
+    parser.add_argument("--events", type=int, default=100_000, help="log calls per case (two records each)")
+    parser.add_argument("--sample-rate", type=float, default=0.1, help="INFO share kept by the sampled case")
+    parser.add_argument("--output", help="file receiving the records (a temporary file by default)")
+    args = parser.parse_args()
+
+    output = args.output or os.path.join(tempfile.mkdtemp(), "bench.log")
+    cases = []
+
+    sync_text = file_handler(output, logging.Formatter(TEXT_FORMAT))
+    cases.append(("sync, f-string, text", log_eager, sync_text, None))
+
+    sync_json = file_handler(output, JSONFormatter("pdf_worker"))
+    cases.append(("sync, lazy, json", log_lazy, sync_json, None))
+
+    queued = queue_pipeline(file_handler(output, JSONFormatter("pdf_worker")), {})
+    cases.append(("queue, lazy, json", log_lazy, *queued))
+
+    sampled = queue_pipeline(file_handler(output, JSONFormatter("pdf_worker")), {LOGGER_NAME: args.sample_rate})
+    cases.append((f"queue, json, {args.sample_rate:.0%} sampled", log_lazy, *sampled))
+
+    print(f"{'pipeline':<28}{'events/s':>12}{'mean us':>10}{'p99 us':>10}{'max us':>10}{'drain ms':>10}")
+    for name, log, handler, listener in cases:
+        durations, wall, drain = asyncio.run(run_case(log, handler, listener, args.events))
+        durations.sort()
+        print(
+            f"{name:<28}{args.events / wall:>12.0f}"
+            f"{statistics.fmean(durations) * 1e6:>10.1f}"
+            f"{durations[int(len(durations) * 0.99)] * 1e6:>10.1f}"
+            f"{durations[-1] * 1e6:>10.0f}"
+            f"{drain * 1000:>10.1f}"
+        )
+        handler.close()
+        if listener is not None:
+            for output_handler in listener.handlers:
+                output_handler.close()
+
+
+if __name__ == "__main__":
+    main()
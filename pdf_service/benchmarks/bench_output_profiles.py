@@ -0,0 +1,46 @@
+"""
+Output profile benchmark.
+
+Renders the default template under every combination of page compression,
+stream encoding and fonts, and reports document size and render time, to pick
+PDF_PAGE_COMPRESSION / PDF_STREAM_ENCODING / PDF_FONTS for a deployment:
+
+    python -m benchmarks.bench_output_profiles --iterations 200
+"""
+import argparse
+import itertools
+import timeit
+from io import BytesIO
+
+from app.output import FONT_MODES, STREAM_ENCODINGS, OutputProfile
+from app.renderers import get_renderer
+from app.services import WARMUP_USER
+from app.templating import TemplateRegistry, template_registry
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare PDF output profiles.")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--renderer", default="canvas")
+    args = parser.parse_args()
+
+    specs = [template.spec for template in template_registry]
+    print(f"{'profile':<32}{'bytes':>9}{'ms/render':>11}")
+    for compression, encoding, fonts in itertools.product((True, False), STREAM_ENCODINGS, FONT_MODES):
+        profile = OutputProfile(page_compression=compression, stream_encoding=encoding, fonts=fonts)
+        template = TemplateRegistry(specs, template_registry.default_name, profile).get()
+        renderer = get_renderer(args.renderer, profile)
+        fields = template.fields(WARMUP_USER)
+
+        def render() -> BytesIO:
+            buffer = BytesIO()
+            renderer.render(template, fields, buffer)
+            return buffer
+
+        size = render().tell()
+        elapsed = timeit.timeit(render, number=args.iterations) / args.iterations
+        print(f"{profile.key:<32}{size:>9,}{elapsed * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
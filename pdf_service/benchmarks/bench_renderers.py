@@ -0,0 +1,73 @@
+"""
+Renderer benchmark.
+
+Checks that the canvas renderer produces the same bytes as Platypus for every
+template, then reports renders/sec and memory allocated per render for both:
+
+    python -m benchmarks.bench_renderers --iterations 500
+"""
+import argparse
+import timeit
+import tracemalloc
+from io import BytesIO
+
+from reportlab import rl_config
+
+from app.renderers import CanvasRenderer, PlatypusRenderer
+from app.services import WARMUP_USER
+from app.templating import template_registry
+
+
+def render(renderer, template, fields) -> bytes:
+    buffer = BytesIO()
+    renderer.render(template, fields, buffer)
+    return buffer.getvalue()
+
+
+def check_equivalence(renderers) -> None:
+    """Fails loudly if the renderers disagree on any template (with fixed timestamps and ids)."""
+    invariant, rl_config.invariant = rl_config.invariant, 1
+    try:
+        for template in template_registry:
+            fields = template.fields(WARMUP_USER)
+            if len({render(renderer, template, fields) for renderer in renderers}) != 1:
+                raise SystemExit(f"Renderers produced different documents for {template.key}")
+    finally:
+        rl_config.invariant = invariant
+
+
+def peak_memory(renderer, template, fields, iterations: int) -> float:
+    """Average peak of memory allocated while rendering one document, in KiB."""
+    peaks = []
+    tracemalloc.start()
+    for _ in range(iterations):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        render(renderer, template, fields)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+    return sum(peaks) / len(peaks) / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare Platypus and canvas rendering.")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    renderers = [PlatypusRenderer(), CanvasRenderer()]
+    check_equivalence(renderers)
+    print("Equivalence: OK (identical documents)\n")
+
+    print(f"{'template':<16}{'renderer':<10}{'renders/s':>12}{'peak KiB/render':>17}")
+    for template in template_registry:
+        fields = template.fields(WARMUP_USER)
+        baseline = None
+        for renderer in renderers:
+            rate = args.iterations / timeit.timeit(lambda: render(renderer, template, fields), number=args.iterations)
+            peak = peak_memory(renderer, template, fields, max(args.iterations // 10, 1))
+            baseline = baseline or rate
+            print(f"{template.key:<16}{renderer.name:<10}{rate:>12,.0f}{peak:>17.1f}   (x{rate / baseline:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Worker scheduling benchmark.
+
+Simulates one tenant's bulk export flooding the worker while interactive requests
+keep arriving, with a fixed render time per job, and compares plain FIFO order with
+the RenderScheduler: interactive queue wait and total time to finish the bulk export.
+
+    python -m benchmarks.bench_scheduling --bulk 200 --interactive 40 --render-ms 5
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.schemas import Priority
+from app.scheduling import RenderScheduler
+
+
+class FifoScheduler:
+    """Receive order, as the worker processed messages before scheduling."""
+
+    def __init__(self, capacity: int):
+        self._queue = asyncio.Queue(capacity)
+
+    async def put(self, item, priority, user_key):
+        await self._queue.put(item)
+
+    async def get(self):
+        return await self._queue.get()
+
+
+async def simulate(scheduler, args) -> tuple[list[float], float]:
+    """Returns interactive waits (seconds) and the time until the last bulk job finished."""
+    waits: list[float] = []
+    bulk_done = []
+    started = time.perf_counter()
+
+    async def produce():
+        jobs = [(Priority.BULK, "exporter")] * args.bulk
+        every = max(args.bulk // args.interactive, 1)
+        for index in range(args.interactive):
+            jobs.insert(index * (every + 1), (Priority.INTERACTIVE, f"user-{index}"))
+        for priority, user in jobs:
+            await scheduler.put((priority, time.perf_counter()), priority, user)
+        for _ in range(args.slots):
+            await scheduler.put(None, Priority.BULK, "stop")
+
+    async def render():
+        while (job := await scheduler.get()) is not None:
+            priority, queued_at = job
+            if priority == Priority.INTERACTIVE:
+                waits.append(time.perf_counter() - queued_at)
+            await asyncio.sleep(args.render_ms / 1000)
+            if priority == Priority.BULK:
+                bulk_done.append(time.perf_counter() - started)
+
+    await asyncio.gather(produce(), *(render() for _ in range(args.slots)))
+    return waits, max(bulk_done)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare FIFO and priority scheduling in the worker.")
+    parser.add_argument("--bulk", type=int, default=200)
+    parser.add_argument("--interactive", type=int, default=40)
+    parser.add_argument("--render-ms", type=float, default=5)
+    parser.add_argument("--slots", type=int, default=2)
+    parser.add_argument("--buffer", type=int, default=20)
+    parser.add_argument("--burst", type=int, default=4)
+    args = parser.parse_args()
+
+    schedulers = {
+        "fifo": lambda: FifoScheduler(args.buffer),
+        "priority": lambda: RenderScheduler(args.buffer, args.burst),
+    }
+    print(f"{'scheduler':<12}{'interactive p50 ms':>20}{'p95 ms':>10}{'bulk done s':>13}")
+    for name, make in schedulers.items():
+        waits, bulk_done = asyncio.run(simulate(make(), args))
+        p95 = statistics.quantiles(waits, n=20)[-1]
+        print(f"{name:<12}{statistics.median(waits) * 1000:>20.1f}{p95 * 1000:>10.1f}{bulk_done:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
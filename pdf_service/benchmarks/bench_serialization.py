@@ -0,0 +1,74 @@
+"""
+Serialization microbenchmark.
+
+Measures the per-request/per-message CPU spent on JSON and validation with the
+previous paths and the current ones:
+
+- worker: SQS body via json.loads + UserFromToken(**body) vs UserFromToken.model_validate_json;
+- current user: validating the cached profile dict per request vs the cached, validated model;
+- job status: FastAPI response serialization with stdlib JSONResponse vs ORJSONResponse.
+
+    python -m benchmarks.bench_serialization --iterations 20000
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+
+from app.main import app
+from app.schemas import JobResponse, JobStatus, UserFromToken
+from app.services import WARMUP_USER
+
+BODY = WARMUP_USER.model_dump_json()
+PROFILE = json.loads(BODY)
+CACHED = UserFromToken.model_validate(PROFILE)
+JOB = JobResponse(
+    id=uuid.uuid4(),
+    status=JobStatus.COMPLETED,
+    download_url="http://localhost:4566/user-pdfs/profile/v1/profile.pdf?X-Amz-Signature=" + "0" * 64,
+    updated_at=datetime.now(timezone.utc),
+)
+JOB_FIELD = next(route.response_field for route in app.routes if getattr(route, "path", "").endswith("/jobs/{job_id}"))
+
+
+def per_call_us(call, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def job_response_us(response_class, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        response_class(await serialize_response(field=JOB_FIELD, response_content=JOB)).body
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare serialization paths.")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    results = [
+        ("sqs body", "json.loads + validate", per_call_us(lambda: UserFromToken(**json.loads(BODY)), args.iterations)),
+        ("sqs body", "model_validate_json", per_call_us(lambda: UserFromToken.model_validate_json(BODY), args.iterations)),
+        ("user", "validate per request", per_call_us(lambda: UserFromToken(**PROFILE), args.iterations)),
+        ("user", "cached model", per_call_us(lambda: CACHED, args.iterations)),
+        ("job", "json", asyncio.run(job_response_us(JSONResponse, args.iterations))),
+        ("job", "orjson", asyncio.run(job_response_us(ORJSONResponse, args.iterations))),
+    ]
+    print(f"{'case':<10}{'path':<24}{'us/call':>10}")
+    baseline = {}
+    for case, name, us in results:
+        baseline.setdefault(case, us)
+        print(f"{case:<10}{name:<24}{us:>10.2f}   (x{baseline[case] / us:.1f})")
+
+
+if __name__ == "__main__":
+    main()
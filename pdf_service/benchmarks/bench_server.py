@@ -0,0 +1,125 @@
+"""
+Server launch throughput comparison.
+
+Starts the service the way the previous Dockerfile did (a single uvicorn process
+with the asyncio loop and the h11 parser) and with the production launcher
+(python -m app.server: preloaded gunicorn master, uvicorn workers on uvloop and
+httptools), once with one worker and once with one worker per CPU. Each server
+is then loaded with concurrent keep-alive clients downloading profile PDFs
+(JWT check, render, streamed response) for a fixed time:
+
+    python -m benchmarks.bench_server --seconds 10 --concurrency 16
+
+The load generator runs on the same host, so leave CPUs free for the server
+(e.g. pin it with taskset) when comparing worker counts.
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from app.core.codecs import get_codec
+from app.core.config import settings
+from app.server import available_cpus
+from app.services import WARMUP_USER
+
+
+def make_token() -> str:
+    """A token carrying the whole profile, so requests need no auth service."""
+    claims = {**WARMUP_USER.model_dump(mode="json"), "exp": datetime.now(timezone.utc) + timedelta(hours=1)}
+    return get_codec(settings.JWT_CODEC, settings.ALGORITHM).encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start(command: list[str], env: dict) -> subprocess.Popen:
+    return subprocess.Popen(command, env={**os.environ, **env}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_ready(client: httpx.AsyncClient, url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get(url)).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+async def load(base_url: str, token: str, seconds: float, concurrency: int) -> list[float]:
+    """Runs `concurrency` clients in closed loops; returns per-request latencies in seconds."""
+    latencies: list[float] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        await wait_ready(client, "/openapi.json")
+        deadline = time.monotonic() + seconds
+
+        async def user() -> None:
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                response = await client.get("/api/pdf/download", headers=headers)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+    return latencies
+
+
+def run_case(command: list[str], env: dict, args) -> tuple[float, float, float]:
+    port = free_port()
+    process = start([arg.replace("{port}", str(port)) for arg in command], {**env, "SERVER_PORT": str(port)})
+    try:
+        latencies = asyncio.run(load(f"http://127.0.0.1:{port}", make_token(), args.seconds, args.concurrency))
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=60)
+    latencies.sort()
+    return (
+        len(latencies) / args.seconds,
+        statistics.median(latencies) * 1000,
+        latencies[int(len(latencies) * 0.99)] * 1000,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the single-process and production launches.")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=available_cpus(), help="worker count of the last case")
+    args = parser.parse_args()
+
+    env = {"PDF_WARMUP": "lifespan", "TRACING_EXPORTER": "off"}
+    uvicorn = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", "{port}", "--loop", "asyncio", "--http", "h11"]
+    server = [sys.executable, "-m", "app.server"]
+    cases = [
+        ("uvicorn, asyncio/h11", uvicorn, env),
+        ("app.server, 1 worker", server, {**env, "SERVER_WORKERS": "1"}),
+    ]
+    if args.workers > 1:
+        cases.append((f"app.server, {args.workers} workers", server, {**env, "SERVER_WORKERS": str(args.workers)}))
+
+    print(f"{'launch':<28}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    baseline = None
+    for name, command, case_env in cases:
+        throughput, p50, p99 = run_case(command, case_env, args)
+        baseline = baseline or throughput
+        print(f"{name:<28}{throughput:>10.1f}{p50:>10.1f}{p99:>10.1f}   (x{throughput / baseline:.2f})")
+
+
+if __name__ == "__main__":
+    main()
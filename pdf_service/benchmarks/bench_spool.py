@@ -0,0 +1,102 @@
+"""
+Render spool benchmark.
+
+Processes jobs against an S3 stub that fails a share of uploads and compares the
+worker without a spool (every failed upload means a redelivery and a new render)
+with the worker spooling rendered PDFs (retries upload the spooled file):
+
+    python -m benchmarks.bench_spool --jobs 200 --failure-rate 0.3
+
+Reports renders performed, upload attempts and the worker's CPU time.
+"""
+import argparse
+import asyncio
+import logging
+import random
+import tempfile
+import time
+import uuid
+from datetime import date
+from unittest.mock import MagicMock
+
+from app.core.config import settings
+from app.schemas import UserFromToken
+from app.worker import PDFWorker
+
+
+class FlakyS3:
+    """Accepts uploads, failing each attempt with the given probability."""
+
+    def __init__(self, failure_rate: float, seed: int):
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.attempts = 0
+
+    async def put_object(self, **kwargs):
+        self.attempts += 1
+        kwargs["Body"].read()
+        if self.random.random() < self.failure_rate:
+            raise ConnectionError("S3 is unavailable")
+
+
+def make_messages(count: int) -> list[dict]:
+    return [
+        {
+            "MessageId": str(index),
+            "ReceiptHandle": str(index),
+            "Body": UserFromToken(
+                id=uuid.uuid4(), name="Ivan", surname=f"Ivanov{index}",
+                email=f"ivan{index}@example.com", date_of_birth=date(2000, 1, 1)
+            ).model_dump_json(),
+        }
+        for index in range(count)
+    ]
+
+
+async def run_case(spool_dir: str | None, args) -> tuple[int, int, float]:
+    settings.SPOOL_DIR = spool_dir
+    settings.SPOOL_RETRY_BACKOFF_SECONDS = 0.0
+    settings.SPOOL_UPLOAD_ATTEMPTS = 1_000
+    worker = PDFWorker(clients=MagicMock())
+    worker.pdf_service.warm_up()
+    render = worker.pdf_service.generate_pdf
+    renders = 0
+
+    def counted_render(*render_args):
+        nonlocal renders
+        renders += 1
+        return render(*render_args)
+
+    worker.pdf_service.generate_pdf = counted_render
+    s3 = FlakyS3(args.failure_rate, args.seed)
+
+    started = time.process_time()
+    for msg in make_messages(args.jobs):
+        while True:
+            try:
+                # A failure without the spool stands for SQS redelivering the message
+                await worker.process_message(msg, s3)
+                break
+            except Exception:
+                continue
+    await asyncio.gather(*worker._uploads.values())
+    return renders, s3.attempts, time.process_time() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare re-rendering and spooled upload retries.")
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--failure-rate", type=float, default=0.3, help="share of failing upload attempts")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    # Every failed attempt is logged, with a traceback without the spool
+    logging.disable(logging.ERROR)
+
+    print(f"{'worker':<16}{'renders':>10}{'uploads':>10}{'cpu s':>10}")
+    for name, spool_dir in (("no spool", None), ("spool", tempfile.mkdtemp())):
+        renders, uploads, cpu = asyncio.run(run_case(spool_dir, args))
+        print(f"{name:<16}{renders:>10}{uploads:>10}{cpu:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Template render benchmark.
+
+For every registered template, reports the one-time compile cost, the cost of
+building the story from compiled factories versus re-parsing the markup, and
+the full render time of one document:
+
+    python -m benchmarks.bench_templates --iterations 200
+"""
+import argparse
+import timeit
+from xml.sax.saxutils import escape
+
+from reportlab.platypus import Paragraph, Spacer
+
+from app.services import PDFService, WARMUP_USER
+from app.templating import DocumentTemplate, template_registry
+
+
+def parse_story(template: DocumentTemplate, styles: dict, fields: dict) -> list:
+    """Builds the story the uncompiled way: format the markup and let ReportLab parse it."""
+    escaped = {key: escape(value) for key, value in fields.items()}
+    return [
+        Spacer(1, element.height) if element.type == "spacer"
+        else Paragraph(element.text.format_map(escaped), styles[element.style])
+        for element in template.spec.elements
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure render cost per document template.")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    service = PDFService()
+    service.generate_pdf(WARMUP_USER).close()
+
+    print(f"{'template':<16}{'compile ms':>12}{'parse us':>12}{'compiled us':>14}{'render ms':>12}")
+    for template in template_registry:
+        fields = template.fields(WARMUP_USER)
+        styles = template._compile_styles()
+        compile_ms = timeit.timeit(template._compile, number=1) * 1000
+        parsed = timeit.timeit(lambda: parse_story(template, styles, fields), number=args.iterations)
+        compiled = timeit.timeit(lambda: template.build_story(fields), number=args.iterations)
+        render = timeit.timeit(lambda: service.generate_pdf(WARMUP_USER, template).close(), number=args.iterations)
+        print(
+            f"{template.key:<16}{compile_ms:>12.2f}"
+            f"{parsed / args.iterations * 1e6:>12.0f}{compiled / args.iterations * 1e6:>14.0f}"
+            f"{render / args.iterations * 1000:>12.2f}   (story x{parsed / compiled:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
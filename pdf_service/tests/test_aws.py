@@ -0,0 +1,60 @@
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from pdf_service.app.core.aws import AWSClients
+from pdf_service.app.core.config import settings
+from pdf_service.app.core.metrics import metrics
+
+
+@pytest_asyncio.fixture
+async def fake_sqs():
+    """Minimal SQS endpoint answering GetQueueUrl, for exercising the real client stack."""
+    async def get_queue_url(request):
+        return web.json_response({"QueueUrl": "http://sqs.test/queue"}, content_type="application/x-amz-json-1.0")
+
+    app = web.Application()
+    app.router.add_post("/", get_queue_url)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    yield f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    await runner.cleanup()
+
+
+def reuse_observations() -> list:
+    return [m for m in metrics.snapshot() if m["name"] == "aws_connection_reused" and m["labels"] == {"service": "sqs"}]
+
+
+@pytest.mark.asyncio
+async def test_clients_are_shared_and_tuned():
+    clients = AWSClients()
+
+    s3 = await clients.client("s3")
+    assert await clients.client("s3") is s3
+    assert await clients.client("s3", endpoint_url="http://public.example") is not s3
+    assert s3.meta.config.max_pool_connections == settings.AWS_MAX_POOL_CONNECTIONS
+    assert s3.meta.config.retries["mode"] == "adaptive"
+
+    await clients.close()
+    assert await clients.client("s3") is not s3
+    await clients.close()
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused_and_measured(fake_sqs, monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    clients = AWSClients()
+    before = reuse_observations()
+
+    sqs = await clients.client("sqs", endpoint_url=fake_sqs)
+    for _ in range(3):
+        await sqs.get_queue_url(QueueName="pdf-tasks")
+    await clients.close()
+
+    after = reuse_observations()[0]
+    count, reused = after["count"], after["sum"]
+    if before:
+        count, reused = count - before[0]["count"], reused - before[0]["sum"]
+    assert (count, reused) == (3, 2)
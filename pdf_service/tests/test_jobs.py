@@ -0,0 +1,140 @@
+import uuid
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import AsyncMock, MagicMock
+from pdf_service.app.main import app
+from pdf_service.app.core.config import settings
+from pdf_service.app.dependencies import get_current_user, get_job_service, get_queue_service
+from pdf_service.app.jobs import InMemoryJobStore
+from pdf_service.app.schemas import JobStatus, UserFromToken
+from pdf_service.app.services import JobService, JOB_ID_ATTRIBUTE, TEMPLATE_ATTRIBUTE
+from pdf_service.app.worker import PDFWorker
+
+USER = UserFromToken(
+    id=uuid.uuid4(),
+    name="Ivan",
+    surname="Ivanov",
+    email="ivan@example.com",
+    date_of_birth="2000-01-01"
+)
+
+
+def make_job_service() -> JobService:
+    service = JobService(store=InMemoryJobStore(), clients=MagicMock())
+    service.presigned_url = AsyncMock(side_effect=lambda key: f"https://s3.test/{key}?signature=x")
+    return service
+
+
+@pytest.mark.asyncio
+async def test_job_lifecycle_through_api():
+    job_service = make_job_service()
+    queue_service = MagicMock()
+    queue_service.send_generate_task = AsyncMock()
+    app.dependency_overrides[get_current_user] = lambda: USER
+    app.dependency_overrides[get_job_service] = lambda: job_service
+    app.dependency_overrides[get_queue_service] = lambda: queue_service
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        accepted = await ac.post("api/pdf/upload-to-s3")
+        job_id = accepted.json()["job_id"]
+        queued = await ac.get(accepted.json()["status_url"])
+
+        await job_service.update_job(uuid.UUID(job_id), JobStatus.PROCESSING)
+        await job_service.update_job(uuid.UUID(job_id), JobStatus.COMPLETED, s3_key="profile.pdf")
+        completed = await ac.get(f"api/pdf/jobs/{job_id}")
+
+    app.dependency_overrides = {}
+
+    assert accepted.status_code == 202
+    assert queue_service.send_generate_task.await_args.kwargs["job_id"] == uuid.UUID(job_id)
+    assert queued.json()["status"] == "queued"
+    assert queued.json()["download_url"] is None
+    assert completed.json()["status"] == "completed"
+    assert completed.json()["download_url"] == "https://s3.test/profile.pdf?signature=x"
+
+
+@pytest.mark.asyncio
+async def test_jobs_of_other_users_are_hidden():
+    job_service = make_job_service()
+    job = await job_service.create_job(user_id=uuid.uuid4())
+    app.dependency_overrides[get_current_user] = lambda: USER
+    app.dependency_overrides[get_job_service] = lambda: job_service
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(f"api/pdf/jobs/{job.id}")
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 404
+    assert response.json()["detail"]["code"] == "JOB_NOT_FOUND"
+
+
+@pytest.mark.asyncio
+async def test_worker_records_job_transitions():
+    job_service = make_job_service()
+    job = await job_service.create_job(user_id=USER.id)
+    worker = PDFWorker(clients=MagicMock())
+    worker.job_service = job_service
+    message = {
+        "Body": USER.model_dump_json(),
+        "MessageAttributes": {JOB_ID_ATTRIBUTE: {"DataType": "String", "StringValue": str(job.id)}}
+    }
+
+    s3 = MagicMock()
+    s3.put_object = AsyncMock(side_effect=ConnectionError("S3 is down"))
+    with pytest.raises(ConnectionError):
+        await worker.process_message(message, s3)
+    retrying = await job_service.store.get(job.id)
+
+    s3.put_object = AsyncMock()
+    await worker.process_message(message, s3)
+    completed = await job_service.store.get(job.id)
+
+    assert retrying.status == JobStatus.QUEUED
+    assert retrying.error == "S3 is down"
+    assert completed.status == JobStatus.COMPLETED
+    assert completed.s3_key == f"profile/v1/profile_{USER.id}.pdf"
+    assert completed.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_fails_the_job_on_the_last_delivery(monkeypatch):
+    monkeypatch.setattr(settings, "WORKER_MAX_RECEIVES", 3)
+    job_service = make_job_service()
+    job = await job_service.create_job(user_id=USER.id)
+    worker = PDFWorker(clients=MagicMock())
+    worker.job_service = job_service
+    message = {
+        "Body": USER.model_dump_json(),
+        "Attributes": {"ApproximateReceiveCount": "3"},
+        "MessageAttributes": {JOB_ID_ATTRIBUTE: {"DataType": "String", "StringValue": str(job.id)}}
+    }
+
+    await worker.process_message(message, MagicMock(put_object=AsyncMock(side_effect=ConnectionError("S3 is down"))))
+
+    failed = await job_service.store.get(job.id)
+    assert (failed.status, failed.error) == (JobStatus.FAILED, "S3 is down")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body, attributes", [
+    (USER.model_dump_json(), {TEMPLATE_ATTRIBUTE: {"DataType": "String", "StringValue": "removed@9"}}),
+    ('{"id": "not-a-user"}', {}),
+])
+async def test_worker_fails_unprocessable_messages_at_once(body, attributes):
+    job_service = make_job_service()
+    job = await job_service.create_job(user_id=USER.id)
+    worker = PDFWorker(clients=MagicMock())
+    worker.job_service = job_service
+    message = {
+        "Body": body,
+        "MessageAttributes": {JOB_ID_ATTRIBUTE: {"DataType": "String", "StringValue": str(job.id)}, **attributes}
+    }
+    s3 = MagicMock(put_object=AsyncMock())
+
+    await worker.process_message(message, s3)
+
+    assert (await job_service.store.get(job.id)).status == JobStatus.FAILED
+    s3.put_object.assert_not_awaited()
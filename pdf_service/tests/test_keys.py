@@ -0,0 +1,102 @@
+import pytest
+from fastapi import HTTPException
+from jose import jwk, jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from pdf_service.app.core.keys import JWKSKeyResolver
+from pdf_service.app.core.security import JWTManager
+
+
+def make_key(kid: str):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    )
+    signing_key = jwk.construct(pem, "RS256")
+    return signing_key, {**signing_key.public_key().to_dict(), "kid": kid}
+
+
+class FakeJWKS:
+    def __init__(self, *keys):
+        self.keys = list(keys)
+        self.calls = 0
+        self.fail = False
+
+    def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise OSError("connection refused")
+        return {"keys": self.keys}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_manager(fetcher, clock):
+    resolver = JWKSKeyResolver(
+        jwks_url="http://auth/jwks.json",
+        algorithm="RS256",
+        ttl_seconds=300,
+        min_refresh_interval=30,
+        timeout=1,
+        fetcher=fetcher,
+        clock=clock
+    )
+    return JWTManager(algorithm="RS256", key_resolver=resolver)
+
+
+def test_keys_are_cached_until_ttl():
+    signing_key, public_jwk = make_key("k1")
+    fetcher, clock = FakeJWKS(public_jwk), FakeClock()
+    manager = make_manager(fetcher, clock)
+    token = jwt.encode({"sub": "user"}, signing_key, algorithm="RS256", headers={"kid": "k1"})
+
+    for _ in range(3):
+        assert manager.decode_token(token)["sub"] == "user"
+    assert fetcher.calls == 1
+
+    clock.now = 301
+    manager.decode_token(token)
+    assert fetcher.calls == 2
+
+
+def test_unknown_kid_triggers_rate_limited_refresh():
+    old_key, old_jwk = make_key("old")
+    new_key, new_jwk = make_key("new")
+    fetcher, clock = FakeJWKS(old_jwk), FakeClock()
+    manager = make_manager(fetcher, clock)
+    manager.decode_token(jwt.encode({"sub": "a"}, old_key, algorithm="RS256", headers={"kid": "old"}))
+
+    new_token = jwt.encode({"sub": "b"}, new_key, algorithm="RS256", headers={"kid": "new"})
+    with pytest.raises(HTTPException) as exc_info:
+        manager.decode_token(new_token)
+    assert exc_info.value.status_code == 401
+
+    fetcher.keys.append(new_jwk)
+    clock.now = 10
+    with pytest.raises(HTTPException):
+        manager.decode_token(new_token)
+    assert fetcher.calls == 1
+
+    clock.now = 31
+    assert manager.decode_token(new_token)["sub"] == "b"
+
+
+def test_unreachable_jwks_returns_503():
+    signing_key, _ = make_key("k1")
+    fetcher = FakeJWKS()
+    fetcher.fail = True
+    manager = make_manager(fetcher, FakeClock())
+    token = jwt.encode({"sub": "user"}, signing_key, algorithm="RS256", headers={"kid": "k1"})
+
+    with pytest.raises(HTTPException) as exc_info:
+        manager.decode_token(token)
+
+    assert exc_info.value.status_code == 503
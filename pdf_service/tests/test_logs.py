@@ -0,0 +1,157 @@
+import io
+import json
+import logging
+import pytest
+from pdf_service.app.core import logs
+from pdf_service.app.core.config import settings
+from pdf_service.app.core.logs import JSONFormatter, SamplingFilter, configure_logging, queue_pipeline, shutdown_logging
+from pdf_service.app.core.tracing import tracer
+
+
+class MemoryExporter:
+    def export(self, record):
+        pass
+
+
+@pytest.fixture
+def pipeline():
+    stream = io.StringIO()
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JSONFormatter("pdf_service"))
+    handler, listener = queue_pipeline(output, {"pdf_service.app.worker": 0.0})
+    logger = logging.getLogger("pdf_service.tests.logs")
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    listener.start()
+
+    def read():
+        listener.stop()
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    yield logger, handler, read
+    logger.removeHandler(handler)
+    logger.propagate = True
+    if listener._thread is not None:
+        listener.stop()
+
+
+def test_records_are_written_as_json_lines(pipeline):
+    logger, _, read = pipeline
+
+    logger.info("Job %s is %s", "42", "done")
+    try:
+        raise ValueError("broken template")
+    except ValueError:
+        logger.error("Render failed", exc_info=True)
+
+    info, error = read()
+    assert info["message"] == "Job 42 is done"
+    assert (info["level"], info["logger"], info["service"]) == ("INFO", "pdf_service.tests.logs", "pdf_service")
+    assert "trace_id" not in info
+    assert "ValueError: broken template" in error["exception"]
+
+
+def test_arguments_are_interpolated_when_logging_and_skipped_for_dropped_records(pipeline):
+    logger, handler, read = pipeline
+    worker_logger = logging.getLogger("pdf_service.app.worker")
+    worker_logger.addHandler(handler)
+    worker_logger.setLevel(logging.INFO)
+    worker_logger.propagate = False
+
+    class Lazy:
+        calls = 0
+
+        def __str__(self):
+            Lazy.calls += 1
+            return "rendered"
+
+    pending = ["job-1"]
+    try:
+        worker_logger.info("Value: %s", Lazy())
+        logger.info("Value: %s, pending: %s", Lazy(), pending)
+        pending.append("job-2")
+    finally:
+        worker_logger.removeHandler(handler)
+        worker_logger.setLevel(logging.NOTSET)
+        worker_logger.propagate = True
+    assert Lazy.calls == 1
+
+    [record] = read()
+    assert record["message"] == "Value: rendered, pending: ['job-1']"
+    assert Lazy.calls == 1
+
+
+def test_records_carry_the_current_trace(pipeline, monkeypatch):
+    logger, _, read = pipeline
+    monkeypatch.setattr(tracer, "exporter", MemoryExporter())
+
+    with tracer.span("job.process") as span:
+        logger.info("Generating PDF")
+
+    [record] = read()
+    assert (record["trace_id"], record["span_id"]) == (span.trace_id, span.span_id)
+
+
+def test_sampling_drops_info_but_keeps_warnings(pipeline):
+    logger, handler, read = pipeline
+    worker_logger = logging.getLogger("pdf_service.app.worker")
+    worker_logger.addHandler(handler)
+    worker_logger.setLevel(logging.INFO)
+    worker_logger.propagate = False
+    try:
+        for _ in range(100):
+            worker_logger.info("Job is done")
+        worker_logger.warning("Job not found")
+        logger.info("Not sampled")
+    finally:
+        worker_logger.removeHandler(handler)
+        worker_logger.setLevel(logging.NOTSET)
+        worker_logger.propagate = True
+
+    assert [record["message"] for record in read()] == ["Job not found", "Not sampled"]
+
+
+def test_sampling_rate_is_inherited_from_the_nearest_parent():
+    sampling = SamplingFilter({"app": 0.5, "app.worker": 0.1})
+
+    assert sampling.rate("app.worker") == 0.1
+    assert sampling.rate("app.services") == 0.5
+    assert sampling.rate("app.worker.child") == 0.1
+    assert sampling.rate("uvicorn.error") == 1.0
+
+
+def test_configure_logging_is_idempotent_and_flushes_on_shutdown(monkeypatch, capsys, request):
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", list(root.handlers))
+    request.addfinalizer(lambda level=root.level: root.setLevel(level))
+    monkeypatch.setattr(settings, "LOG_FORMAT", "text")
+
+    configure_logging("pdf_service")
+    listener = logs._listener
+    configure_logging("pdf_service")
+    assert logs._listener is listener
+
+    logging.getLogger("pdf_service.tests.logs").info("Queued before shutdown")
+    shutdown_logging()
+
+    assert "INFO [pdf_service.tests.logs] Queued before shutdown" in capsys.readouterr().out
+    assert logs._listener is None
+
+
+def test_forking_processes_log_synchronously_until_a_child_configures_its_writer(monkeypatch, capsys, request):
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", list(root.handlers))
+    request.addfinalizer(lambda level=root.level: root.setLevel(level))
+    monkeypatch.setattr(settings, "LOG_FORMAT", "text")
+
+    configure_logging("pdf_service", background=False)
+    logging.getLogger("pdf_service.tests.logs").info("Written by the master")
+    assert logs._listener is None
+    assert "INFO [pdf_service.tests.logs] Written by the master" in capsys.readouterr().out
+
+    configure_logging("pdf_service")
+    logging.getLogger("pdf_service.tests.logs").info("Written by the worker")
+    shutdown_logging()
+
+    assert "INFO [pdf_service.tests.logs] Written by the worker" in capsys.readouterr().out
@@ -0,0 +1,86 @@
+import uuid
+from io import BytesIO
+import pytest
+from httpx import AsyncClient, ASGITransport
+from reportlab import rl_config
+from pdf_service.app.core.metrics import metrics
+from pdf_service.app.dependencies import get_current_user, require_admin
+from pdf_service.app.main import app
+from pdf_service.app.output import OutputProfile
+from pdf_service.app.renderers import CanvasRenderer, PlatypusRenderer
+from pdf_service.app.schemas import UserFromToken
+from pdf_service.app.templating import TemplateRegistry, template_registry
+
+USER = UserFromToken(
+    id=uuid.UUID(int=7),
+    name="Ivan",
+    surname="Ivanov",
+    email="ivan@example.com",
+    date_of_birth="1999-12-31"
+)
+
+
+def render(profile: OutputProfile, renderer_class=PlatypusRenderer, name: str = "Ivan") -> bytes:
+    registry = TemplateRegistry(
+        [template.spec for template in template_registry], template_registry.default_name, profile
+    )
+    template = registry.get()
+    buffer = BytesIO()
+    renderer_class(profile).render(template, template.fields(USER.model_copy(update={"name": name})), buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def restore_stream_encoding():
+    use_a85 = rl_config.useA85
+    yield
+    rl_config.useA85 = use_a85
+
+
+def test_page_compression_reduces_size():
+    compressed = render(OutputProfile(page_compression=True))
+    uncompressed = render(OutputProfile(page_compression=False))
+
+    assert len(compressed) < len(uncompressed)
+    assert b"/FlateDecode" in compressed and b"/FlateDecode" not in uncompressed
+
+
+def test_ascii85_encoding_is_opt_in():
+    binary = render(OutputProfile())
+    ascii85 = render(OutputProfile(stream_encoding="ascii85"))
+
+    assert b"/ASCII85Decode" not in binary
+    assert b"/ASCII85Decode" in ascii85
+    assert len(binary) < len(ascii85)
+
+
+def test_embedded_fonts_render_text_outside_latin1():
+    document = render(OutputProfile(fonts="embedded"), CanvasRenderer, name="Іван")
+
+    assert b"/FontFile2" in document
+    assert len(document) > len(render(OutputProfile()))
+
+
+def test_invalid_profile_is_rejected():
+    with pytest.raises(ValueError):
+        OutputProfile(stream_encoding="base64")
+
+
+@pytest.mark.asyncio
+async def test_download_reports_size_and_render_time():
+    app.dependency_overrides[get_current_user] = lambda: USER
+    app.dependency_overrides[require_admin] = lambda: None
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("api/pdf/download")
+        metrics_response = await ac.get("metrics")
+
+    app.dependency_overrides = {}
+    assert response.status_code == 200
+    assert response.headers["content-length"] == str(len(response.content))
+    assert "render;dur=" in response.headers["server-timing"]
+
+    sizes = [m for m in metrics_response.json()["metrics"] if m["name"] == "pdf_output_bytes"]
+    assert sizes and sizes[0]["labels"]["profile"] == "compressed-binary-standard"
+    assert sizes[0]["max"] >= len(response.content)
@@ -0,0 +1,103 @@
+import json
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import patch
+from io import BytesIO
+from pdf_service.app.main import app
+from pdf_service.app.core.profiles import ProfileClient, ProfileRejectedError, ProfileUnavailableError
+from pdf_service.app.dependencies import get_jwt_manager, get_profile_client
+
+PROFILE = {
+    "id": "550e8400-e29b-41d4-a716-446655440000",
+    "name": "Ivan",
+    "surname": "Ivanov",
+    "email": "ivan@example.com",
+    "date_of_birth": "2000-01-01"
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeJWTManager:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def decode_token(self, token):
+        return self.payload
+
+
+class FakeFetcher:
+    def __init__(self):
+        self.tokens = []
+
+    def __call__(self, token):
+        self.tokens.append(token)
+        if token == "revoked":
+            raise ProfileRejectedError("rejected")
+        return json.dumps(PROFILE).encode()
+
+
+def make_client(fetcher, clock=None) -> ProfileClient:
+    return ProfileClient("http://auth:8001/", ttl_seconds=60, max_size=2, timeout=1,
+                         fetcher=fetcher, clock=clock or FakeClock())
+
+
+def test_profiles_are_cached_per_user_until_ttl():
+    fetcher, clock = FakeFetcher(), FakeClock()
+    client = make_client(fetcher, clock)
+
+    profile = client.get("u1", "t1")
+    assert profile.model_dump(mode="json") == PROFILE
+    assert client.get("u1", "t2") is profile
+    assert fetcher.tokens == ["t1"]
+
+    clock.now = 61
+    client.get("u1", "t3")
+    assert fetcher.tokens == ["t1", "t3"]
+    assert client.profile_url == "http://auth:8001/api/auth/me"
+
+
+def test_invalid_profile_is_reported_as_unavailable():
+    client = make_client(lambda token: b'{"id": "not-a-uuid"}')
+
+    with pytest.raises(ProfileUnavailableError):
+        client.get("u1", "t1")
+
+
+@pytest.mark.asyncio
+async def test_compact_token_resolves_profile():
+    fetcher = FakeFetcher()
+    app.dependency_overrides[get_jwt_manager] = lambda: FakeJWTManager({"sub": PROFILE["id"], "type": "access"})
+    app.dependency_overrides[get_profile_client] = lambda: make_client(fetcher)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        with patch("pdf_service.app.services.PDFService.generate_pdf") as mocked_pdf:
+            mocked_pdf.return_value = BytesIO(b"pdf")
+            response = await ac.get("api/pdf/download", headers={"Authorization": "Bearer compact"})
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert mocked_pdf.call_args.kwargs["user"].email == PROFILE["email"]
+    assert fetcher.tokens == ["compact"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_is_not_accepted():
+    app.dependency_overrides[get_jwt_manager] = lambda: FakeJWTManager({"sub": PROFILE["id"], "type": "refresh"})
+    app.dependency_overrides[get_profile_client] = lambda: make_client(FakeFetcher())
+
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("api/pdf/download", headers={"Authorization": "Bearer refresh"})
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 401
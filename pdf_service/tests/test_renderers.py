@@ -0,0 +1,80 @@
+import uuid
+from io import BytesIO
+import pytest
+from reportlab import rl_config
+from pdf_service.app.renderers import SENTINELS, CanvasRenderer, PlatypusRenderer, get_renderer
+from pdf_service.app.schemas import UserFromToken
+from pdf_service.app.templating import TemplateRegistry, TemplateSpec, template_registry
+
+USERS = [
+    ("Ivan", "Ivanov"),
+    ("Jürgen (Jay) \\ Co", "Müller-Lüdenscheidt"),
+    ("Anna Maria von und zu", "Habsburg-Lothringen"),
+]
+
+
+def make_user(name: str, surname: str) -> UserFromToken:
+    return UserFromToken(
+        id=uuid.UUID(int=7),
+        name=name,
+        surname=surname,
+        email="user@example.com",
+        date_of_birth="1999-12-31"
+    )
+
+
+def render(renderer, template, user) -> bytes:
+    buffer = BytesIO()
+    renderer.render(template, template.fields(user), buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def invariant_output(monkeypatch):
+    # Fixed timestamps and document ids, so both renderers can be compared byte by byte.
+    monkeypatch.setattr(rl_config, "invariant", 1)
+
+
+@pytest.mark.parametrize("template", list(template_registry), ids=lambda template: template.key)
+def test_canvas_output_matches_platypus(template):
+    canvas = CanvasRenderer()
+
+    for user in USERS:
+        assert render(canvas, template, make_user(*user)) == render(PlatypusRenderer(), template, make_user(*user))
+    assert canvas.fallbacks == 0
+
+
+def test_values_that_change_the_layout_fall_back_to_platypus():
+    template = template_registry.get("profile")
+    canvas = CanvasRenderer()
+
+    for user in [make_user("A" * 120, "Ivanov"), make_user("Anna  Maria", "Ivanova")]:
+        assert render(canvas, template, user) == render(PlatypusRenderer(), template, user)
+    assert canvas.fallbacks == 2
+
+
+def test_values_that_look_like_sentinels_are_not_substituted_again():
+    fields = {field: f"{field}¤0¤" for field in SENTINELS}
+
+    filled = CanvasRenderer._fill(" ".join(SENTINELS.values()), fields)
+
+    assert filled == " ".join(fields[field] for field in SENTINELS)
+
+
+def test_width_dependent_templates_always_use_platypus():
+    spec = TemplateSpec(
+        name="centered",
+        version=1,
+        elements=[{"type": "paragraph", "style": "Title", "text": "{name} {surname}"}]
+    )
+    template = TemplateRegistry([spec], default_name="centered").get()
+    user = make_user("Ivan", "Ivanov")
+    canvas = CanvasRenderer()
+
+    assert render(canvas, template, user) == render(PlatypusRenderer(), template, user)
+    assert canvas.fallbacks == 1
+
+
+def test_unknown_renderer_is_rejected():
+    with pytest.raises(ValueError):
+        get_renderer("latex")
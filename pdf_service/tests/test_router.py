@@ -3,7 +3,9 @@ from httpx import AsyncClient, ASGITransport
 from unittest.mock import patch
 from io import BytesIO
 from pdf_service.app.main import app
+from pdf_service.app.core.config import settings
 from pdf_service.app.dependencies import get_current_user
+from pdf_service.app.services import PDFService
 
 class FakeUser:
     id = "12345"
@@ -53,4 +55,43 @@ async def test_download_pdf_invalid_token():
         response = await ac.get("api/pdf/download", headers=headers)
 
         assert response.status_code == 401
-        assert "detail" in response.json()
\ No newline at end of file
+        assert "detail" in response.json()
+
+@pytest.mark.asyncio
+async def test_download_pdf_is_streamed_in_chunks():
+    app.dependency_overrides[get_current_user] = lambda: FakeUser()
+    document = b"%PDF-" + bytes(200_000)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        with patch("pdf_service.app.services.PDFService.generate_pdf") as mocked_pdf:
+            mocked_pdf.return_value = BytesIO(document)
+
+            response = await ac.get("api/pdf/download", headers={"Authorization": "Bearer valid-token"})
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.headers["content-length"] == str(len(document))
+    assert response.headers["server-timing"].startswith("render;dur=")
+    assert response.content == document
+    assert mocked_pdf.return_value.closed
+
+    chunks = [chunk async for chunk in PDFService.iter_chunks(BytesIO(document), chunk_size=65536)]
+    assert [len(chunk) for chunk in chunks] == [65536, 65536, 65536, 3397]
+
+
+@pytest.mark.asyncio
+async def test_metrics_require_the_admin_key(monkeypatch):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        monkeypatch.setattr(settings, "ADMIN_API_KEY", None)
+        assert (await ac.get("/metrics", headers={"X-Admin-Key": ""})).status_code == 403
+
+        monkeypatch.setattr(settings, "ADMIN_API_KEY", "admin-secret")
+        assert (await ac.get("/metrics")).status_code == 401
+        assert (await ac.get("/metrics", headers={"X-Admin-Key": "wrong"})).status_code == 401
+        response = await ac.get("/metrics", headers={"X-Admin-Key": "admin-secret"})
+
+    assert response.status_code == 200
+    assert "metrics" in response.json()
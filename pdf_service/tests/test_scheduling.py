@@ -0,0 +1,100 @@
+import asyncio
+import uuid
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from pdf_service.app.schemas import Priority, UserFromToken
+from pdf_service.app.scheduling import RenderScheduler
+from pdf_service.app.services import PRIORITY_ATTRIBUTE, QueueService
+from pdf_service.app.worker import PDFWorker
+
+INTERACTIVE, BULK = Priority.INTERACTIVE, Priority.BULK
+
+
+async def drain(scheduler: RenderScheduler) -> list:
+    return [await scheduler.get() for _ in range(len(scheduler))]
+
+
+@pytest.mark.asyncio
+async def test_interactive_jobs_overtake_buffered_bulk_jobs():
+    scheduler = RenderScheduler(capacity=10, interactive_burst=4)
+    for index in range(3):
+        await scheduler.put(f"bulk-{index}", BULK, "exporter")
+    await scheduler.put("interactive", INTERACTIVE, "alice")
+
+    assert await drain(scheduler) == ["interactive", "bulk-0", "bulk-1", "bulk-2"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_jobs_get_a_turn_after_an_interactive_burst():
+    scheduler = RenderScheduler(capacity=10, interactive_burst=2)
+    await scheduler.put("bulk", BULK, "exporter")
+    for index in range(4):
+        await scheduler.put(f"interactive-{index}", INTERACTIVE, f"user-{index}")
+
+    assert await drain(scheduler) == ["interactive-0", "interactive-1", "bulk", "interactive-2", "interactive-3"]
+
+
+@pytest.mark.asyncio
+async def test_users_are_served_round_robin_within_a_class():
+    scheduler = RenderScheduler(capacity=10, interactive_burst=4)
+    for index in range(3):
+        await scheduler.put(f"a-{index}", BULK, "a")
+    await scheduler.put("b-0", BULK, "b")
+    await scheduler.put("c-0", BULK, "c")
+
+    assert await drain(scheduler) == ["a-0", "b-0", "c-0", "a-1", "a-2"]
+
+
+@pytest.mark.asyncio
+async def test_buffer_is_bounded():
+    scheduler = RenderScheduler(capacity=2, interactive_burst=4)
+    await scheduler.put("first", BULK, "a")
+    await scheduler.put("second", BULK, "a")
+
+    blocked = asyncio.create_task(scheduler.put("third", BULK, "a"))
+    await asyncio.sleep(0.01)
+    assert not blocked.done() and scheduler.free_slots == 0
+
+    assert await scheduler.get() == "first"
+    await asyncio.wait_for(blocked, timeout=1)
+    assert len(scheduler) == 2
+
+
+@pytest.mark.asyncio
+async def test_held_slots_count_against_the_capacity():
+    scheduler = RenderScheduler(capacity=2, interactive_burst=4)
+    await scheduler.put("first", BULK, "a")
+    assert await scheduler.get() == "first"
+    scheduler.hold()
+    await scheduler.put("second", BULK, "a")
+
+    waiting = asyncio.create_task(scheduler.wait_for_space())
+    await asyncio.sleep(0.01)
+    assert not waiting.done() and scheduler.free_slots == 0
+
+    await scheduler.release_hold()
+    await asyncio.wait_for(waiting, timeout=1)
+    assert scheduler.free_slots == 1
+
+
+@pytest.mark.asyncio
+async def test_priority_travels_as_message_attribute():
+    user = UserFromToken(
+        id=uuid.uuid4(), name="Ivan", surname="Ivanov", email="ivan@example.com", date_of_birth="2000-01-01"
+    )
+    sqs = MagicMock()
+    sqs.get_queue_url = AsyncMock(return_value={"QueueUrl": "queue"})
+    sqs.send_message = AsyncMock()
+    clients = MagicMock()
+    clients.client = AsyncMock(return_value=sqs)
+
+    await QueueService(clients).send_generate_task(user, priority=BULK)
+    message = {
+        "Body": sqs.send_message.await_args.kwargs["MessageBody"],
+        "MessageAttributes": sqs.send_message.await_args.kwargs["MessageAttributes"]
+    }
+
+    assert message["MessageAttributes"][PRIORITY_ATTRIBUTE]["StringValue"] == "bulk"
+    assert PDFWorker._get_priority(message) == BULK
+    assert PDFWorker._get_priority({"Body": "{}"}) == INTERACTIVE
+    assert PDFWorker._get_user_key(message) == str(user.id)
@@ -0,0 +1,59 @@
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from pdf_service.app.core.config import settings
+from pdf_service.app.server import UvicornWorker, available_cpus, post_fork, server_options
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_options_size_workers_from_cpus_and_preload(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 0)
+
+    options = server_options()
+
+    assert options["workers"] == available_cpus() >= 1
+    assert options["preload_app"] is True
+    assert options["worker_class"] is UvicornWorker
+    assert options["graceful_timeout"] > settings.SERVER_GRACEFUL_TIMEOUT
+    assert options["post_fork"] is post_fork
+    assert UvicornWorker.CONFIG_KWARGS["loop"] == "uvloop"
+    assert UvicornWorker.CONFIG_KWARGS["http"] == "httptools"
+
+
+def test_launcher_serves_with_several_workers_and_stops_on_sigterm():
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.server"],
+        cwd=SERVICE_ROOT,
+        env={"SERVER_PORT": str(port), "SERVER_HOST": "127.0.0.1", "SERVER_WORKERS": "2", "PDF_WARMUP": "off", "PATH": ""},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/openapi.json", timeout=1) as response:
+                    assert response.status == 200
+                    break
+            except OSError:
+                assert process.poll() is None and time.monotonic() < deadline, "server did not start"
+                time.sleep(0.2)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        _, log = process.communicate(timeout=60)
+
+    assert process.returncode == 0
+    assert log.count("Booting worker") == 2
@@ -0,0 +1,13 @@
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+SHARED_MODULES = ["codecs.py", "logs.py", "metrics.py", "tracing.py"]
+
+
+@pytest.mark.parametrize("module", SHARED_MODULES)
+def test_shared_core_modules_are_identical_in_both_services(module):
+    pdf_copy = ROOT / "pdf_service" / "app" / "core" / module
+    auth_copy = ROOT / "auth_service" / "app" / "core" / module
+
+    assert pdf_copy.read_text() == auth_copy.read_text(), f"{module} differs between the services"
@@ -0,0 +1,131 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from pdf_service.app.core.config import settings
+from pdf_service.app.scheduling import RenderScheduler
+from pdf_service.app.worker import PDFWorker
+
+
+def make_message(name: str) -> dict:
+    return {"MessageId": name, "ReceiptHandle": f"receipt-{name}", "Body": "{}"}
+
+
+def make_sqs(messages: list) -> MagicMock:
+    async def receive_message(**kwargs):
+        if messages:
+            batch = messages[:kwargs["MaxNumberOfMessages"]]
+            del messages[:len(batch)]
+            return {"Messages": batch}
+        await asyncio.Event().wait()
+
+    sqs = MagicMock()
+    sqs.receive_message = receive_message
+    sqs.delete_message_batch = AsyncMock(return_value={"Successful": [], "Failed": []})
+    sqs.change_message_visibility_batch = AsyncMock()
+    return sqs
+
+
+def make_worker(render_seconds: float) -> PDFWorker:
+    worker = PDFWorker(clients=MagicMock())
+    worker.scheduler = RenderScheduler(capacity=10, interactive_burst=4)
+    worker.job_service = MagicMock()
+    worker.job_service.update_job = AsyncMock()
+
+    async def render(msg, s3):
+        await asyncio.sleep(render_seconds)
+
+    worker.process_message = render
+    return worker
+
+
+def handles(mock: AsyncMock) -> list:
+    return [entry["ReceiptHandle"] for call in mock.await_args_list for entry in call.kwargs["Entries"]]
+
+
+@pytest.fixture(autouse=True)
+def one_render_slot(monkeypatch):
+    monkeypatch.setattr(settings, "WORKER_RENDER_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "WORKER_ACK_INTERVAL", 60)
+
+
+@pytest.mark.asyncio
+async def test_shutdown_finishes_in_flight_and_releases_buffered_messages():
+    worker = make_worker(render_seconds=0.1)
+    sqs = make_sqs([make_message("a"), make_message("b"), make_message("c")])
+
+    serving = asyncio.create_task(worker.serve(sqs, MagicMock(), "queue"))
+    await asyncio.sleep(0.02)
+    worker.stop()
+    await asyncio.wait_for(serving, timeout=2)
+
+    assert handles(sqs.delete_message_batch) == ["receipt-a"]
+    assert handles(sqs.change_message_visibility_batch) == ["receipt-b", "receipt-c"]
+    released = sqs.change_message_visibility_batch.await_args.kwargs["Entries"]
+    assert {entry["VisibilityTimeout"] for entry in released} == {0}
+
+
+@pytest.mark.asyncio
+async def test_renders_past_the_deadline_are_released(monkeypatch):
+    monkeypatch.setattr(settings, "WORKER_SHUTDOWN_TIMEOUT", 0.05)
+    worker = make_worker(render_seconds=10)
+    sqs = make_sqs([make_message("a")])
+
+    serving = asyncio.create_task(worker.serve(sqs, MagicMock(), "queue"))
+    await asyncio.sleep(0.02)
+    worker.stop()
+    await asyncio.wait_for(serving, timeout=2)
+
+    assert handles(sqs.delete_message_batch) == []
+    assert handles(sqs.change_message_visibility_batch) == ["receipt-a"]
+
+
+@pytest.mark.asyncio
+async def test_idle_worker_stops_without_waiting_for_the_long_poll():
+    worker = make_worker(render_seconds=0)
+    sqs = make_sqs([])
+
+    serving = asyncio.create_task(worker.serve(sqs, MagicMock(), "queue"))
+    await asyncio.sleep(0.01)
+    worker.stop()
+    await asyncio.wait_for(serving, timeout=1)
+
+    sqs.change_message_visibility_batch.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_slow_sqs_calls_do_not_outlast_the_shutdown_deadline(monkeypatch):
+    monkeypatch.setattr(settings, "WORKER_SHUTDOWN_TIMEOUT", 0.2)
+    worker = make_worker(render_seconds=0.01)
+    sqs = make_sqs([make_message("a"), make_message("b")])
+
+    async def hang(**kwargs):
+        await asyncio.Event().wait()
+
+    sqs.change_message_visibility_batch = AsyncMock(side_effect=hang)
+    sqs.delete_message_batch = AsyncMock(side_effect=hang)
+
+    serving = asyncio.create_task(worker.serve(sqs, MagicMock(), "queue"))
+    await asyncio.sleep(0.02)
+    worker.stop()
+
+    # Deleting the acked messages hangs; serve() still returns shortly after the 0.2 s deadline
+    await asyncio.wait_for(serving, timeout=1)
+    sqs.delete_message_batch.assert_awaited()
+
+@pytest.mark.asyncio
+async def test_buffered_and_in_flight_messages_keep_their_visibility_extended(monkeypatch):
+    monkeypatch.setattr(settings, "WORKER_VISIBILITY_TIMEOUT", 1)
+    worker = make_worker(render_seconds=10)
+    sqs = make_sqs([make_message("a"), make_message("b")])
+    sqs.change_message_visibility_batch = AsyncMock(return_value={"Successful": [], "Failed": []})
+
+    serving = asyncio.create_task(worker.serve(sqs, MagicMock(), "queue"))
+    await asyncio.sleep(0.4)
+    extended = sqs.change_message_visibility_batch.await_args_list[:]
+    monkeypatch.setattr(settings, "WORKER_SHUTDOWN_TIMEOUT", 0.05)
+    worker.stop()
+    await asyncio.wait_for(serving, timeout=2)
+
+    [call] = extended
+    assert sorted(entry["ReceiptHandle"] for entry in call.kwargs["Entries"]) == ["receipt-a", "receipt-b"]
+    assert {entry["VisibilityTimeout"] for entry in call.kwargs["Entries"]} == {1}
@@ -0,0 +1,244 @@
+import os
+import time
+import uuid
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from pdf_service.app.core.config import settings
+from pdf_service.app.jobs import InMemoryJobStore
+from pdf_service.app.schemas import JobStatus, UserFromToken
+from pdf_service.app.services import JobService, JOB_ID_ATTRIBUTE
+from pdf_service.app.spool import RenderSpool
+from pdf_service.app.worker import PDFWorker
+
+USER = UserFromToken(
+    id=uuid.uuid4(),
+    name="Ivan",
+    surname="Ivanov",
+    email="ivan@example.com",
+    date_of_birth="2000-01-01"
+)
+
+
+def test_spooled_document_is_read_back_through_the_mapping(tmp_path):
+    spool = RenderSpool(str(tmp_path), max_bytes=1024, max_age=60)
+    key = spool.fingerprint("profile", "canvas", '{"id": 1}')
+
+    assert not spool.contains(key)
+    spool.put(key, b"%PDF-1.4 document")
+
+    assert spool.contains(key)
+    with spool.open(key) as body:
+        assert len(body) == 17
+        assert body.read(4) == b"%PDF"
+        body.seek(0)
+        assert body.read() == b"%PDF-1.4 document"
+
+
+def test_least_recently_used_documents_are_evicted_over_the_size_limit(tmp_path):
+    spool = RenderSpool(str(tmp_path), max_bytes=25, max_age=60)
+    spool.put("a", b"x" * 10)
+    spool.put("b", b"x" * 10)
+    spool.pin("a")
+    spool.put("c", b"x" * 10)
+
+    assert not spool.contains("b")
+    assert spool.contains("a") and spool.contains("c")
+    assert spool.size == 20
+    assert sorted(os.listdir(tmp_path)) == ["a.pdf", "c.pdf"]
+
+
+def test_pins_are_counted_per_holder(tmp_path):
+    spool = RenderSpool(str(tmp_path), max_bytes=15, max_age=60)
+    spool.put("a", b"x" * 10, pin=True)
+    assert spool.contains("a", pin=True)
+    spool.unpin("a")
+    spool.put("b", b"x" * 10)
+
+    assert spool.contains("a") and not spool.contains("b")
+
+    spool.unpin("a")
+    spool.put("c", b"x" * 10)
+
+    assert not spool.contains("a") and spool.contains("c")
+
+
+def test_unused_documents_expire(tmp_path):
+    spool = RenderSpool(str(tmp_path), max_bytes=1024, max_age=60)
+    spool.put("old", b"x")
+    os.utime(tmp_path / "old.pdf", (time.time() - 120, time.time() - 120))
+
+    reloaded = RenderSpool(str(tmp_path), max_bytes=1024, max_age=60)
+
+    assert not reloaded.contains("old")
+    assert not (tmp_path / "old.pdf").exists()
+
+
+def test_spool_is_rebuilt_from_the_directory(tmp_path):
+    RenderSpool(str(tmp_path), max_bytes=1024, max_age=60).put("kept", b"%PDF")
+    (tmp_path / "partial.tmp").write_bytes(b"%P")
+
+    spool = RenderSpool(str(tmp_path), max_bytes=1024, max_age=60)
+
+    assert spool.contains("kept")
+    assert spool.size == 4
+    assert not (tmp_path / "partial.tmp").exists()
+
+
+@pytest.fixture
+def worker(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "SPOOL_RETRY_BACKOFF_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "SPOOL_UPLOAD_ATTEMPTS", 2)
+    worker = PDFWorker(clients=MagicMock())
+    worker.job_service = JobService(store=InMemoryJobStore(), clients=MagicMock())
+    render = worker.pdf_service.generate_pdf
+    worker.pdf_service.generate_pdf = MagicMock(side_effect=render)
+    return worker
+
+
+async def make_message(worker: PDFWorker) -> dict:
+    job = await worker.job_service.create_job(user_id=USER.id)
+    return {
+        "MessageId": "m1",
+        "ReceiptHandle": "r1",
+        "Body": USER.model_dump_json(),
+        "MessageAttributes": {JOB_ID_ATTRIBUTE: {"DataType": "String", "StringValue": str(job.id)}}
+    }
+
+
+def make_s3(*failures: Exception) -> MagicMock:
+    outcomes = list(failures)
+    bodies = []
+
+    async def put_object(**kwargs):
+        bodies.append(kwargs["Body"].read())
+        if outcomes:
+            raise outcomes.pop(0)
+
+    return MagicMock(put_object=AsyncMock(side_effect=put_object), bodies=bodies)
+
+
+@pytest.mark.asyncio
+async def test_failed_upload_is_retried_in_the_background_without_rendering_again(worker):
+    message = await make_message(worker)
+    job_id = uuid.UUID(message["MessageAttributes"][JOB_ID_ATTRIBUTE]["StringValue"])
+    s3 = make_s3(ConnectionError("S3 is down"))
+    worker._in_flight["r1"] = message
+
+    await worker.process_message(message, s3)
+
+    assert (await worker.job_service.store.get(job_id)).status == JobStatus.PROCESSING
+    await worker._uploads["r1"]
+
+    assert worker._acks == ["r1"]
+    assert "r1" not in worker._in_flight
+    assert (await worker.job_service.store.get(job_id)).status == JobStatus.COMPLETED
+    assert worker.pdf_service.generate_pdf.call_count == 1
+    first, retried = s3.bodies
+    assert first == retried and first.startswith(b"%PDF")
+
+
+@pytest.mark.asyncio
+async def test_exhausted_retries_keep_the_job_queued_and_leave_the_message_for_redelivery(worker):
+    message = await make_message(worker)
+    job_id = uuid.UUID(message["MessageAttributes"][JOB_ID_ATTRIBUTE]["StringValue"])
+    s3 = make_s3(*[ConnectionError("S3 is down")] * 3)
+    worker._in_flight["r1"] = message
+
+    await worker.process_message(message, s3)
+    await worker._uploads["r1"]
+
+    job = await worker.job_service.store.get(job_id)
+    assert (job.status, job.error) == (JobStatus.QUEUED, "S3 is down")
+    assert worker._acks == []
+    assert s3.put_object.await_count == 3
+
+    await worker.process_message(message, make_s3())
+
+    assert worker.pdf_service.generate_pdf.call_count == 1
+    assert (await worker.job_service.store.get(job_id)).status == JobStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_exhausted_retries_on_the_last_delivery_fail_the_job_and_ack(worker):
+    message = await make_message(worker)
+    message["Attributes"] = {"ApproximateReceiveCount": str(settings.WORKER_MAX_RECEIVES)}
+    job_id = uuid.UUID(message["MessageAttributes"][JOB_ID_ATTRIBUTE]["StringValue"])
+    worker._in_flight["r1"] = message
+
+    await worker.process_message(message, make_s3(*[ConnectionError("S3 is down")] * 3))
+    await worker._uploads["r1"]
+
+    job = await worker.job_service.store.get(job_id)
+    assert (job.status, job.error) == (JobStatus.FAILED, "S3 is down")
+    assert worker._acks == ["r1"]
+
+
+@pytest.mark.asyncio
+async def test_pending_upload_holds_a_scheduler_slot_and_extends_the_visibility(worker):
+    message = await make_message(worker)
+    sqs = MagicMock(change_message_visibility=AsyncMock())
+    worker._queue = (sqs, "queue-url")
+    worker._in_flight["r1"] = message
+    free_slots = worker.scheduler.free_slots
+
+    await worker.process_message(message, make_s3(ConnectionError("S3 is down")))
+
+    assert worker.scheduler.free_slots == free_slots - 1
+    await worker._uploads["r1"]
+
+    assert worker.scheduler.free_slots == free_slots
+    sqs.change_message_visibility.assert_awaited_once_with(
+        QueueUrl="queue-url", ReceiptHandle="r1", VisibilityTimeout=settings.WORKER_VISIBILITY_TIMEOUT
+    )
+    assert worker._acks == ["r1"]
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_before_the_visibility_timeout_runs_out(worker, monkeypatch):
+    monkeypatch.setattr(settings, "WORKER_VISIBILITY_TIMEOUT", 1)
+    monkeypatch.setattr(settings, "SPOOL_RETRY_BACKOFF_SECONDS", 0.5)
+    monkeypatch.setattr(settings, "SPOOL_UPLOAD_ATTEMPTS", 10)
+    message = await make_message(worker)
+    job_id = uuid.UUID(message["MessageAttributes"][JOB_ID_ATTRIBUTE]["StringValue"])
+    s3 = make_s3(*[ConnectionError("S3 is down")] * 10)
+    worker._in_flight["r1"] = message
+
+    await worker.process_message(message, s3)
+    await worker._uploads["r1"]
+
+    # The second retry would start after 0.5 + 1.0 seconds, past 80% of the 1 second timeout
+    assert s3.put_object.await_count == 2
+    assert (await worker.job_service.store.get(job_id)).status == JobStatus.QUEUED
+    assert worker._acks == []
+
+
+@pytest.mark.asyncio
+async def test_upload_is_not_retried_when_the_visibility_cannot_be_extended(worker):
+    message = await make_message(worker)
+    job_id = uuid.UUID(message["MessageAttributes"][JOB_ID_ATTRIBUTE]["StringValue"])
+    sqs = MagicMock(change_message_visibility=AsyncMock(side_effect=Exception("ReceiptHandleIsInvalid")))
+    worker._queue = (sqs, "queue-url")
+    worker._in_flight["r1"] = message
+    s3 = make_s3(ConnectionError("S3 is down"))
+
+    await worker.process_message(message, s3)
+    await worker._uploads["r1"]
+
+    assert s3.put_object.await_count == 1
+    assert worker._acks == []
+    assert "r1" not in worker._in_flight
+    job = await worker.job_service.store.get(job_id)
+    assert (job.status, job.error) == (JobStatus.QUEUED, "S3 is down")
+
+
+@pytest.mark.asyncio
+async def test_spooled_documents_are_unpinned_once_uploaded_or_given_up(worker):
+    message = await make_message(worker)
+    worker._in_flight["r1"] = message
+
+    await worker.process_message(message, make_s3())
+    await worker.process_message(message, make_s3(*[ConnectionError("S3 is down")] * 3))
+    await worker._uploads["r1"]
+
+    assert worker.spool._pinned == {}
@@ -0,0 +1,98 @@
+import uuid
+from io import BytesIO
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import patch
+from pdf_service.app.main import app
+from pdf_service.app.dependencies import get_current_user, get_template_registry
+from pdf_service.app.schemas import UserFromToken
+from pdf_service.app.services import PDFService
+from pdf_service.app.templating import TemplateError, TemplateNotFoundError, TemplateRegistry, TemplateSpec
+
+USER = UserFromToken(
+    id=uuid.uuid4(),
+    name="Anna & <Co>",
+    surname="Ivanova",
+    email="anna@example.com",
+    date_of_birth="2000-01-31"
+)
+
+
+def make_spec(name: str = "profile", version: int = 1, text: str = "<b>Name:</b> {name}") -> TemplateSpec:
+    return TemplateSpec(
+        name=name,
+        version=version,
+        date_format="%d.%m.%Y",
+        elements=[
+            {"type": "paragraph", "style": "Title", "text": "Profile"},
+            {"type": "spacer", "height": 12},
+            {"type": "paragraph", "text": text},
+        ]
+    )
+
+
+def test_registry_selects_latest_version_unless_pinned():
+    registry = TemplateRegistry([make_spec(version=1), make_spec(version=2)], default_name="profile")
+
+    assert registry.get().key == "profile@2"
+    assert registry.get("profile", 1).key == "profile@1"
+    assert registry.get_by_key("profile@1") is registry.get("profile", 1)
+    with pytest.raises(TemplateNotFoundError):
+        registry.get("profile", 3)
+    with pytest.raises(TemplateNotFoundError):
+        registry.get("missing")
+
+
+def test_template_version_is_part_of_the_storage_key():
+    registry = TemplateRegistry([make_spec(version=1), make_spec(version=2)], default_name="profile")
+
+    assert registry.get("profile", 1).object_key(USER.id) != registry.get("profile", 2).object_key(USER.id)
+
+
+def test_compiled_template_substitutes_values_without_parsing_them():
+    template = TemplateRegistry([make_spec(text="<b>Name:</b> {name} ({date_of_birth})")], "profile").get()
+
+    first = template.build_story(template.fields(USER))
+    second = template.build_story(template.fields(USER))
+
+    assert [frag.text for frag in first[2].frags] == ["Name:", " Anna & <Co> (31.01.2000)"]
+    assert first[0].frags is second[0].frags
+    assert first[2] is not second[2]
+
+
+def test_invalid_templates_are_rejected():
+    with pytest.raises(TemplateError):
+        TemplateRegistry([make_spec(text="{password}")], "profile")
+    with pytest.raises(TemplateError):
+        TemplateRegistry([make_spec(), make_spec()], "profile")
+    with pytest.raises(TemplateError):
+        TemplateRegistry([make_spec(text='<a href="mailto:{email}">mail</a>')], "profile").get().compile()
+    with pytest.raises(TemplateError):
+        TemplateRegistry([make_spec(text="<b>{name}")], "profile").get().compile()
+
+
+def test_bundled_templates_render():
+    service = PDFService()
+
+    for template in service.templates:
+        assert service.generate_pdf(USER, template).read(5) == b"%PDF-"
+
+
+@pytest.mark.asyncio
+async def test_download_uses_requested_template():
+    registry = TemplateRegistry([make_spec(version=1), make_spec(version=2)], default_name="profile")
+    app.dependency_overrides[get_current_user] = lambda: USER
+    app.dependency_overrides[get_template_registry] = lambda: registry
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        with patch("pdf_service.app.services.PDFService.generate_pdf", return_value=BytesIO(b"%PDF-")) as mocked_pdf:
+            response = await ac.get("api/pdf/download", params={"template": "profile", "version": 1})
+        missing = await ac.get("api/pdf/download", params={"template": "profile", "version": 9})
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert mocked_pdf.call_args.kwargs["template"].key == "profile@1"
+    assert missing.status_code == 404
+    assert missing.json()["detail"]["code"] == "TEMPLATE_NOT_FOUND"
@@ -0,0 +1,144 @@
+import json
+import time
+import uuid
+import pytest
+from datetime import date
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import AsyncMock, MagicMock
+from pdf_service.app.main import app
+from pdf_service.app.core.config import settings
+from pdf_service.app.core.metrics import metrics
+from pdf_service.app.core.tracing import Tracer, parse_traceparent, tracer
+from pdf_service.app.schemas import Priority, UserFromToken
+from pdf_service.app.services import QueueService, TRACE_ATTRIBUTE
+from pdf_service.app.worker import PDFWorker
+
+USER = UserFromToken(
+    id=uuid.UUID("550e8400-e29b-41d4-a716-446655440000"),
+    name="Ivan",
+    surname="Ivanov",
+    email="ivan@example.com",
+    date_of_birth=date(2000, 1, 1)
+)
+
+
+class MemoryExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, record):
+        self.spans.append(record)
+
+    def named(self, name):
+        return next(span for span in self.spans if span["name"] == name)
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = MemoryExporter()
+    monkeypatch.setattr(tracer, "exporter", exporter)
+    return exporter
+
+
+def make_sqs() -> MagicMock:
+    sqs = MagicMock()
+    sqs.get_queue_url = AsyncMock(return_value={"QueueUrl": "queue"})
+    sqs.send_message = AsyncMock()
+    return sqs
+
+
+@pytest.mark.asyncio
+async def test_trace_continues_from_request_through_sqs_to_worker(exporter):
+    metrics.reset()
+    sqs = make_sqs()
+    clients = MagicMock()
+    clients.client = AsyncMock(return_value=sqs)
+
+    with tracer.span("POST /api/pdf/upload-to-s3") as request_span:
+        await QueueService(clients).send_generate_task(USER, job_id=uuid.uuid4(), priority=Priority.BULK)
+
+    sent = sqs.send_message.await_args.kwargs
+    message = {
+        "MessageId": "m1",
+        "ReceiptHandle": "r1",
+        "Body": sent["MessageBody"],
+        "MessageAttributes": sent["MessageAttributes"],
+        "Attributes": {"SentTimestamp": str(int(time.time() * 1000) - 1500)}
+    }
+    worker = PDFWorker(clients=MagicMock())
+    worker.job_service = MagicMock()
+    worker.job_service.update_job = AsyncMock()
+    await worker.process_message(message, MagicMock(put_object=AsyncMock()))
+
+    send, job = exporter.named("sqs.send"), exporter.named("job.process")
+    assert send["parent_span_id"] == request_span.span_id
+    assert job["trace_id"] == request_span.trace_id
+    assert job["parent_span_id"] == send["span_id"]
+    assert job["attributes"]["queue_wait_seconds"] >= 1.5
+    for name in ("pdf.render", "s3.put"):
+        assert exporter.named(name)["parent_span_id"] == job["span_id"]
+
+    waits = [m for m in metrics.snapshot() if m["name"] == "pdf_queue_wait_seconds"]
+    assert waits[0]["labels"] == {"priority": "bulk"}
+    assert waits[0]["min"] >= 1.5
+
+
+@pytest.mark.asyncio
+async def test_untraced_messages_carry_no_trace_context():
+    sqs = make_sqs()
+    clients = MagicMock()
+    clients.client = AsyncMock(return_value=sqs)
+
+    await QueueService(clients).send_generate_task(USER)
+
+    assert TRACE_ATTRIBUTE not in sqs.send_message.await_args.kwargs["MessageAttributes"]
+
+
+@pytest.mark.asyncio
+async def test_middleware_continues_incoming_trace(exporter, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "admin-secret")
+    parent = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/metrics", headers={"traceparent": parent, "X-Admin-Key": "admin-secret"})
+
+    assert response.status_code == 200
+    span = exporter.named("GET /metrics")
+    assert span["trace_id"] == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert span["parent_span_id"] == "00f067aa0ba902b7"
+    assert span["attributes"]["http.status_code"] == 200
+
+
+def test_failed_span_is_marked_as_error(exporter):
+    with pytest.raises(ValueError):
+        with tracer.span("pdf.render"):
+            raise ValueError("broken template")
+
+    assert exporter.named("pdf.render")["status"] == "error"
+
+
+@pytest.mark.parametrize("value", [
+    None,
+    "",
+    "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7",
+    "00-00000000000000000000000000000000-00f067aa0ba902b7-01",
+    "00-not-hex-01",
+])
+def test_malformed_traceparent_starts_a_new_trace(value):
+    assert parse_traceparent(value) is None
+
+
+def test_file_exporter_writes_json_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "TRACING_EXPORTER", "file")
+    monkeypatch.setattr(settings, "TRACING_FILE", str(tmp_path / "traces" / "spans.jsonl"))
+    file_tracer = Tracer.from_settings()
+
+    with file_tracer.span("outer"):
+        with file_tracer.span("inner", key="value"):
+            pass
+    file_tracer.exporter.stream.close()
+
+    inner, outer = [json.loads(line) for line in (tmp_path / "traces" / "spans.jsonl").read_text().splitlines()]
+    assert inner["parent_span_id"] == outer["span_id"]
+    assert inner["attributes"] == {"key": "value"}
+    assert outer["service"] == "pdf_service"
@@ -0,0 +1,54 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Reports what a fresh process has loaded and compiled before its first render, optionally after warm_up().
+PROBE = """
+import json, sys
+from pdf_service.app.services import PDFService, WARMUP_USER
+
+if sys.argv[1] == "warm":
+    PDFService.warm_up()
+
+service = PDFService()
+state = {
+    "reportlab_loaded": "reportlab" in sys.modules,
+    "compiled": [template.key for template in service.templates if template._factories is not None],
+    "templates": [template.key for template in service.templates],
+}
+modules_before = len(sys.modules)
+service.generate_pdf(WARMUP_USER)
+state["new_modules"] = len(sys.modules) - modules_before
+print(json.dumps(state))
+"""
+
+
+def first_render(mode: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, mode],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PDF_WARMUP": "off", "PATH": ""},
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_cold_process_loads_the_renderer_on_first_render():
+    cold = first_render("cold")
+
+    assert not cold["reportlab_loaded"]
+    assert cold["compiled"] == []
+    assert cold["new_modules"] > 0
+
+
+def test_warm_up_compiles_every_template_and_loads_the_renderer():
+    warm = first_render("warm")
+
+    assert warm["reportlab_loaded"]
+    assert warm["compiled"] == warm["templates"] != []
+    assert warm["new_modules"] == 0